@@ -0,0 +1,128 @@
+"""
+Application factory: builds the FastAPI app from the router modules, middleware and lifespan tasks.
+Heavy clients and SDKs are created on first use, or at startup when EAGER_CLIENTS is set.
+"""
+import asyncio
+import importlib
+import logging
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+
+from fastapi import FastAPI, Request
+from starlette.middleware.cors import CORSMiddleware
+
+import archive
+import attachments
+import config
+import idempotency
+import passwords
+import read_cache
+import readiness
+import replicas
+import resilience
+from query_trace import start_trace, end_trace, log_trace
+
+ROUTERS = (
+    "routers.health",
+    "routers.batch",
+    "routers.auth",
+    "routers.ideas",
+    "routers.attachments",
+    "routers.workflow",
+    "routers.dashboard",
+    "routers.admin",
+)
+
+
+async def prune_periodically(stores, interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for store in stores:
+            try:
+                await asyncio.to_thread(store.prune)
+            except Exception as e:
+                logging.error(f"Store prune failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from core import db, rate_limiter
+
+    if config.EAGER_CLIENTS:
+        await asyncio.to_thread(db.get)
+    readiness.monitor.start()
+    archiver = None
+    if config.ARCHIVE_INTERVAL_HOURS > 0:
+        archiver = asyncio.create_task(archive.run_periodically(db, config.ARCHIVE_INTERVAL_HOURS))
+    pruner = None
+    if config.STORE_PRUNE_SECONDS > 0:
+        stores = (rate_limiter, idempotency.store, replicas.pins)
+        pruner = asyncio.create_task(prune_periodically(stores, config.STORE_PRUNE_SECONDS))
+    yield
+    for task in (archiver, pruner):
+        if task is not None:
+            task.cancel()
+    await readiness.monitor.stop()
+    passwords.shutdown()
+    attachments.shutdown()
+
+
+def create_app(routers: Optional[Iterable[str]] = None) -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+    app.add_exception_handler(idempotency.Replay, idempotency.replay_handler)
+    app.add_exception_handler(resilience.UpstreamUnavailable, resilience.unavailable_handler)
+
+    for name in routers or ROUTERS:
+        app.include_router(importlib.import_module(name).router)
+
+    @app.middleware("http")
+    async def query_trace_middleware(request: Request, call_next):
+        trace, token = start_trace(f"{request.method} {request.url.path}")
+        try:
+            response = await call_next(request)
+        finally:
+            end_trace(token)
+        if config.QUERY_TRACE_HEADERS:
+            response.headers["X-Query-Count"] = str(trace.count)
+            response.headers["Server-Timing"] = trace.server_timing()
+        if config.QUERY_TRACE_LOG:
+            log_trace(trace)
+        return response
+
+    @app.middleware("http")
+    async def idempotency_middleware(request: Request, call_next):
+        try:
+            response = await call_next(request)
+        except Exception:
+            key = getattr(request.state, "idempotency_key", None)
+            if key is not None:
+                idempotency.store.release(key)
+            raise
+        return await idempotency.capture(request, response)
+
+    @app.middleware("http")
+    async def read_cache_middleware(request: Request, call_next):
+        response = await call_next(request)
+        if (request.method in read_cache.WRITE_METHODS and response.status_code < 400
+                and request.url.path.startswith(read_cache.INVALIDATING_PREFIXES)
+                and request.url.path not in read_cache.READ_ONLY_PATHS):
+            read_cache.cache.invalidate()
+        return response
+
+    @app.middleware("http")
+    async def replica_pin_middleware(request: Request, call_next):
+        response = await call_next(request)
+        if (request.method in read_cache.WRITE_METHODS and response.status_code < 400
+                and request.url.path not in read_cache.READ_ONLY_PATHS):
+            replicas.record_write(getattr(request.state, "user_id", None))
+        return response
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Total-Count"],
+    )
+    return app
@@ -0,0 +1,117 @@
+"""
+Moves closed ideas older than ARCHIVE_AFTER_DAYS, with their comments, to ideas_archive/comments_archive.
+Run `python archive.py [--days 180] [--batch-size 500] [--dry-run]` from cron, or set ARCHIVE_INTERVAL_HOURS.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Callable, List, Optional
+
+import config
+
+logger = logging.getLogger("archive")
+
+CLOSED_STATUSES = ["implemented", "declined"]
+
+
+def archive_cutoff(days: Optional[int] = None, now: Optional[datetime] = None) -> str:
+    days = config.ARCHIVE_AFTER_DAYS if days is None else days
+    return ((now or datetime.now(timezone.utc)) - timedelta(days=days)).isoformat()
+
+
+# Archived ideas predate the cutoff in force when they moved; holds while ARCHIVE_AFTER_DAYS is never raised.
+def may_contain(start_date: Optional[str]) -> bool:
+    return not start_date or start_date < archive_cutoff()
+
+
+def merge(hot: List[dict], archived: List[dict]) -> List[dict]:
+    seen = {row["id"] for row in hot}
+    return hot + [row for row in archived if row["id"] not in seen]
+
+
+def select_ideas(db, apply: Callable, include_archived: bool, columns: str = "*") -> List[dict]:
+    rows = apply(db.table("ideas").select(columns)).execute().data
+    if include_archived:
+        rows = merge(rows, apply(db.table("ideas_archive").select(columns)).execute().data)
+    return rows
+
+
+def archive_closed_ideas(db, days: Optional[int] = None, batch_size: Optional[int] = None,
+                         dry_run: bool = False, now: Optional[datetime] = None) -> dict:
+    batch_size = batch_size or config.ARCHIVE_BATCH_SIZE
+    cutoff = archive_cutoff(days, now)
+    archived_at = (now or datetime.now(timezone.utc)).isoformat()
+    totals = {"ideas": 0, "comments": 0, "cutoff": cutoff}
+
+    if dry_run:
+        result = db.table("ideas").select("id", count="exact").in_("status", CLOSED_STATUSES).lt("updated_at", cutoff).execute()
+        totals["ideas"] = result.count or 0
+        return totals
+
+    while True:
+        query = db.table("ideas").select("*").in_("status", CLOSED_STATUSES).lt("updated_at", cutoff)
+        ideas = query.order("updated_at").limit(batch_size).execute().data
+        if not ideas:
+            break
+        ids = [idea["id"] for idea in ideas]
+        comments = db.table("comments").select("*").in_("idea_id", ids).execute().data
+
+        db.table("ideas_archive").upsert([{**idea, "archived_at": archived_at} for idea in ideas]).execute()
+        if comments:
+            db.table("comments_archive").upsert([{**c, "archived_at": archived_at} for c in comments]).execute()
+        # Only rows still closed and stale are deleted; an idea reopened or edited since the select stays hot.
+        deleted = db.table("ideas").delete().in_("id", ids).in_("status", CLOSED_STATUSES) \
+            .lt("updated_at", cutoff).execute().data
+        moved = {idea["id"] for idea in deleted}
+        copied = {idea["id"]: idea for idea in ideas}
+        changed = [idea for idea in deleted if idea != copied[idea["id"]]]
+        if changed:
+            db.table("ideas_archive").upsert([{**idea, "archived_at": archived_at} for idea in changed]).execute()
+        kept = [idea_id for idea_id in ids if idea_id not in moved]
+        if kept:
+            stale = [c["id"] for c in comments if c["idea_id"] not in moved]
+            if stale:
+                db.table("comments_archive").delete().in_("id", stale).execute()
+            db.table("ideas_archive").delete().in_("id", kept).execute()
+        comments = [c for c in comments if c["idea_id"] in moved]
+        if comments:
+            db.table("comments").delete().in_("id", [c["id"] for c in comments]).execute()
+        totals["ideas"] += len(moved)
+        totals["comments"] += len(comments)
+        if len(ideas) < batch_size:
+            break
+
+    logger.info(f"Archived {totals['ideas']} ideas and {totals['comments']} comments updated before {cutoff}")
+    return totals
+
+
+async def run_periodically(db, interval_hours: float) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(archive_closed_ideas, db)
+        except Exception as e:
+            logger.error(f"Archive run failed: {str(e)}")
+        await asyncio.sleep(interval_hours * 3600)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive closed ideas and their comments")
+    parser.add_argument("--days", type=int, default=config.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=config.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    from core import db
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    totals = archive_closed_ideas(db, args.days, args.batch_size, args.dry_run)
+    if args.dry_run:
+        print(f"Would archive {totals['ideas']} ideas updated before {totals['cutoff']}")
+    else:
+        print(f"Archived {totals['ideas']} ideas and {totals['comments']} comments updated before {totals['cutoff']}")
+    return totals
+
+
+if __name__ == "__main__":
+    main()
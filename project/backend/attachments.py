@@ -0,0 +1,325 @@
+"""
+Idea attachments: streamed into the filesystem or S3 object store and described by idea_attachments rows.
+Image thumbnails render in a process pool after the upload response is sent.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi.responses import Response, StreamingResponse
+
+import config
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp", "image/bmp"}
+RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class TooLarge(Exception):
+    pass
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class FilesystemWriter:
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        self.temp = Path(temp)
+        self.handle = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes) -> None:
+        self.handle.write(data)
+
+    def commit(self) -> None:
+        self.handle.close()
+        os.replace(self.temp, self.path)
+
+    def abort(self) -> None:
+        self.handle.close()
+        self.temp.unlink(missing_ok=True)
+
+
+class FilesystemObjectStore:
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def open_writer(self, key: str) -> FilesystemWriter:
+        return FilesystemWriter(self.path(key))
+
+    def read_range(self, key: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        with open(self.path(key), "rb") as handle:
+            handle.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                data = handle.read(min(chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+    def read(self, key: str) -> bytes:
+        return self.path(key).read_bytes()
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        yield self.path(key)
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+
+class S3Writer:
+    def __init__(self, client, bucket: str, key: str, part_size: int):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.buffer = bytearray()
+        self.upload_id: Optional[str] = None
+        self.parts = []
+
+    def _upload_part(self, body: bytes) -> None:
+        if self.upload_id is None:
+            self.upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)["UploadId"]
+        number = len(self.parts) + 1
+        result = self.client.upload_part(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                                         PartNumber=number, Body=body)
+        self.parts.append({"ETag": result["ETag"], "PartNumber": number})
+
+    def write(self, data: bytes) -> None:
+        self.buffer += data
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+
+    def commit(self) -> None:
+        if self.upload_id is None:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer))
+            return
+        if self.buffer:
+            self._upload_part(bytes(self.buffer))
+        self.client.complete_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                                              MultipartUpload={"Parts": self.parts})
+
+    def abort(self) -> None:
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+
+class S3ObjectStore:
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None,
+                 part_size: int = 8 * 1024 * 1024):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url, region_name=self.region)
+        return self._client
+
+    def open_writer(self, key: str) -> S3Writer:
+        return S3Writer(self.client, self.bucket, key, self.part_size)
+
+    def read_range(self, key: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}")["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "object"
+            self.client.download_file(self.bucket, key, str(path))
+            yield path
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+def create_store(kind: str = "filesystem"):
+    if kind == "filesystem":
+        return FilesystemObjectStore(config.ATTACHMENT_ROOT)
+    if kind == "s3":
+        return S3ObjectStore(config.ATTACHMENT_S3_BUCKET, config.ATTACHMENT_S3_ENDPOINT, config.ATTACHMENT_S3_REGION,
+                             config.ATTACHMENT_S3_PART_BYTES)
+    raise ValueError(f"Unknown ATTACHMENT_STORE: {kind}")
+
+
+store = create_store(config.ATTACHMENT_STORE)
+
+
+async def save(key: str, chunks: AsyncIterator[bytes], max_bytes: int) -> Tuple[int, str]:
+    writer = await asyncio.to_thread(store.open_writer, key)
+    digest = hashlib.sha256()
+    size = 0
+    pending = bytearray()
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise TooLarge(f"Attachments are limited to {max_bytes} bytes")
+            digest.update(chunk)
+            pending += chunk
+            if len(pending) >= config.ATTACHMENT_CHUNK_BYTES:
+                await asyncio.to_thread(writer.write, bytes(pending))
+                pending.clear()
+        if pending:
+            await asyncio.to_thread(writer.write, bytes(pending))
+        await asyncio.to_thread(writer.commit)
+    except BaseException:
+        await asyncio.to_thread(writer.abort)
+        raise
+    return size, digest.hexdigest()
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    match = RANGE.fullmatch((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        if int(last) == 0:
+            raise RangeNotSatisfiable()
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def download_response(row: dict, range_header: Optional[str]) -> Response:
+    size = int(row["size_bytes"])
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{row["sha256"]}"',
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(row['filename'])}",
+        "Cache-Control": "private, max-age=3600",
+        "X-Content-Type-Options": "nosniff",
+    }
+    try:
+        requested = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"})
+
+    start, end = requested or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if requested:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        store.read_range(row["storage_key"], start, end, config.ATTACHMENT_CHUNK_BYTES),
+        status_code=206 if requested else 200,
+        media_type=row["content_type"],
+        headers=headers,
+    )
+
+
+def refresh_count(db, idea_id: str) -> int:
+    return db.rpc("refresh_attachment_count", {"target": idea_id}).execute().data
+
+
+def delete_objects(rows) -> None:
+    for row in rows:
+        for key in (row.get("storage_key"), row.get("thumbnail_key")):
+            if key:
+                try:
+                    store.delete(key)
+                except Exception as e:
+                    logger.warning(f"Failed to delete attachment object {key}: {e}")
+
+
+async def purge(db, idea_id: str) -> None:
+    rows = db.table("idea_attachments").delete().eq("idea_id", idea_id).execute().data
+    if rows:
+        await asyncio.to_thread(delete_objects, rows)
+
+
+def render_thumbnail(path: str, size: int) -> bytes:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.draft("RGB", (size, size))
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=config.ATTACHMENT_THUMBNAIL_WORKERS)
+    return _pool
+
+
+def _thumbnail_sync(source_key: str, thumbnail_key: str) -> None:
+    with store.local_copy(source_key) as path:
+        data = _get_pool().submit(render_thumbnail, str(path), config.ATTACHMENT_THUMBNAIL_SIZE).result()
+    writer = store.open_writer(thumbnail_key)
+    try:
+        writer.write(data)
+        writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def wants_thumbnail(row: dict) -> bool:
+    return row["content_type"] in THUMBNAIL_TYPES and row["size_bytes"] <= config.ATTACHMENT_THUMBNAIL_MAX_BYTES
+
+
+async def create_thumbnail(db, row: dict) -> None:
+    thumbnail_key = f"{row['storage_key']}.thumb.png"
+    try:
+        await asyncio.to_thread(_thumbnail_sync, row["storage_key"], thumbnail_key)
+    except Exception as e:
+        logger.warning(f"Thumbnail for attachment {row['id']} failed: {e}")
+        return
+    result = db.table("idea_attachments").update({"thumbnail_key": thumbnail_key}).eq("id", row["id"]).execute()
+    if not result.data:
+        await asyncio.to_thread(store.delete, thumbnail_key)
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
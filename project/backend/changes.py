@@ -0,0 +1,75 @@
+"""
+Change feed for incremental sync: ideas by (updated_at, id) and idea_tombstones by (deleted_at, id).
+The feed stops CHANGE_FEED_LAG_SECONDS short of now so late-committing writes are not skipped.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional, Tuple
+
+import config
+
+STREAMS = {"ideas": ("ideas", "updated_at"), "deleted": ("idea_tombstones", "deleted_at")}
+
+Position = Optional[Tuple[str, str]]
+
+
+def encode_cursor(positions: dict) -> str:
+    raw = json.dumps({name: list(pos) if pos else None for name, pos in positions.items()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> dict:
+    if not cursor:
+        return {name: None for name in STREAMS}
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return {name: tuple(data[name]) if data.get(name) else None for name in STREAMS}
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+
+def horizon(now: Optional[datetime] = None) -> str:
+    return ((now or datetime.now(timezone.utc)) - timedelta(seconds=config.CHANGE_FEED_LAG_SECONDS)).isoformat()
+
+
+def read_stream(db, stream: str, position: Position, limit: int, until: str) -> Tuple[List[dict], bool]:
+    table, column = STREAMS[stream]
+    rows = []
+    if position:
+        stamp, last_id = position
+        rows = (
+            db.table(table).select("*").eq(column, stamp).gt("id", last_id)
+            .order("id").limit(limit + 1).execute().data
+        )
+    if len(rows) <= limit:
+        query = db.table(table).select("*").lte(column, until)
+        if position:
+            query = query.gt(column, position[0])
+        rows += query.order(column).order("id").limit(limit + 1 - len(rows)).execute().data
+    return rows[:limit], len(rows) > limit
+
+
+def read_changes(db, cursor: Optional[str], limit: int, now: Optional[datetime] = None) -> dict:
+    positions = decode_cursor(cursor)
+    until = horizon(now)
+    result = {"has_more": False}
+    for stream, (_, column) in STREAMS.items():
+        rows, more = read_stream(db, stream, positions[stream], limit, until)
+        if rows:
+            positions[stream] = (rows[-1][column], rows[-1]["id"])
+        result[stream] = rows
+        result["has_more"] = result["has_more"] or more
+    result["next_cursor"] = encode_cursor(positions)
+    return result
+
+
+def tombstone(db, idea: dict, deleted_by: dict) -> None:
+    db.table("idea_tombstones").upsert({
+        "id": idea["id"],
+        "idea_number": idea.get("idea_number"),
+        "deleted_at": datetime.now(timezone.utc).isoformat(),
+        "deleted_by": deleted_by["id"],
+    }).execute()
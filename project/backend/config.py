@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+load_dotenv(ROOT_DIR.parent.parent / '.env')
+
+SUPABASE_URL = os.environ.get('VITE_SUPABASE_URL') or os.environ.get('SUPABASE_URL')
+SUPABASE_KEY = os.environ.get('VITE_SUPABASE_ANON_KEY') or os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_ANON_KEY')
+SUPABASE_REPLICA_URL = os.environ.get('SUPABASE_REPLICA_URL')
+SUPABASE_REPLICA_KEY = os.environ.get('SUPABASE_REPLICA_KEY') or SUPABASE_KEY
+REPLICA_PIN_SECONDS = float(os.environ.get('REPLICA_PIN_SECONDS', '10'))
+REPLICA_PIN_STORE = os.environ.get('REPLICA_PIN_STORE', 'memory')
+REPLICA_PIN_SQLITE_PATH = os.environ.get('REPLICA_PIN_SQLITE_PATH', str(ROOT_DIR / 'replica_pins.db'))
+
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'supabase')
+SQLITE_PATH = os.environ.get('SQLITE_PATH', str(ROOT_DIR / 'eyedea.db'))
+DATABASE_URL = os.environ.get('DATABASE_URL')
+EAGER_CLIENTS = os.environ.get('EAGER_CLIENTS', '').lower() in ('1', 'true', 'yes')
+
+AUTH_MODE = os.environ.get('AUTH_MODE', 'supabase')
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', str(PASSWORD_HASH_WORKERS * 8)))
+
+SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = float(os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES', '15'))
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.environ.get('REFRESH_TOKEN_EXPIRE_DAYS', '30'))
+REVOCATION_CAPACITY = int(os.environ.get('REVOCATION_CAPACITY', '10000'))
+REVOCATION_ERROR_RATE = float(os.environ.get('REVOCATION_ERROR_RATE', '0.001'))
+
+RESEND_API_KEY = os.environ.get('RESEND_API_KEY', '')
+SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'onboarding@resend.dev')
+FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
+
+UPSTREAM_TIMEOUTS = os.environ.get('UPSTREAM_TIMEOUTS', 'select=5,auth=10,mail=15')
+UPSTREAM_WORKERS = int(os.environ.get('UPSTREAM_WORKERS', '32'))
+POSTGREST_HTTP_TIMEOUT = float(os.environ.get('POSTGREST_HTTP_TIMEOUT', '30'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_SECONDS = float(os.environ.get('CIRCUIT_RESET_SECONDS', '30'))
+HEDGE_READS = os.environ.get('HEDGE_READS', '').lower() in ('1', 'true', 'yes')
+HEDGE_MIN_SAMPLES = int(os.environ.get('HEDGE_MIN_SAMPLES', '20'))
+HEDGE_MIN_DELAY_MS = float(os.environ.get('HEDGE_MIN_DELAY_MS', '50'))
+
+QUERY_TRACE_HEADERS = os.environ.get('QUERY_TRACE_HEADERS', '').lower() in ('1', 'true', 'yes')
+QUERY_TRACE_LOG = os.environ.get('QUERY_TRACE_LOG', '').lower() in ('1', 'true', 'yes')
+
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', 'memory')
+RATE_LIMIT_SQLITE_PATH = os.environ.get('RATE_LIMIT_SQLITE_PATH', str(ROOT_DIR / 'rate_limits.db'))
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+AUTH_MAX_INFLIGHT = int(os.environ.get('AUTH_MAX_INFLIGHT', '64'))
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '0'))
+
+HEALTH_PROBES_ENABLED = os.environ.get('HEALTH_PROBES_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL', '10'))
+HEALTH_PROBE_TIMEOUT = float(os.environ.get('HEALTH_PROBE_TIMEOUT', '2'))
+HEALTH_PROBE_WINDOW = int(os.environ.get('HEALTH_PROBE_WINDOW', '30'))
+READINESS_P95_MS = float(os.environ.get('READINESS_P95_MS', '1000'))
+READINESS_CRITICAL = [s.strip() for s in os.environ.get('READINESS_CRITICAL', 'storage,auth').split(',') if s.strip()]
+MAIL_HEALTH_URL = os.environ.get('MAIL_HEALTH_URL', 'https://api.resend.com/domains')
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '180'))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '500'))
+ARCHIVE_INTERVAL_HOURS = float(os.environ.get('ARCHIVE_INTERVAL_HOURS', '0'))
+
+EXPORT_PAGE_SIZE = int(os.environ.get('EXPORT_PAGE_SIZE', '1000'))
+
+IDEA_BATCH_MAX_IDS = int(os.environ.get('IDEA_BATCH_MAX_IDS', '500'))
+BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', '20'))
+CI_EVALUATE_BATCH_MAX = int(os.environ.get('CI_EVALUATE_BATCH_MAX', '500'))
+EMAIL_BATCH_SIZE = 100
+
+ATTACHMENT_STORE = os.environ.get('ATTACHMENT_STORE', 'filesystem')
+ATTACHMENT_ROOT = os.environ.get('ATTACHMENT_ROOT', str(ROOT_DIR / 'attachments'))
+ATTACHMENT_S3_BUCKET = os.environ.get('ATTACHMENT_S3_BUCKET', 'eyedea-attachments')
+ATTACHMENT_S3_ENDPOINT = os.environ.get('ATTACHMENT_S3_ENDPOINT')
+ATTACHMENT_S3_REGION = os.environ.get('ATTACHMENT_S3_REGION')
+ATTACHMENT_S3_PART_BYTES = int(os.environ.get('ATTACHMENT_S3_PART_BYTES', str(8 * 1024 * 1024)))
+ATTACHMENT_MAX_BYTES = int(os.environ.get('ATTACHMENT_MAX_BYTES', str(25 * 1024 * 1024)))
+ATTACHMENT_CHUNK_BYTES = int(os.environ.get('ATTACHMENT_CHUNK_BYTES', str(1024 * 1024)))
+ATTACHMENT_THUMBNAIL_SIZE = int(os.environ.get('ATTACHMENT_THUMBNAIL_SIZE', '256'))
+ATTACHMENT_THUMBNAIL_MAX_BYTES = int(os.environ.get('ATTACHMENT_THUMBNAIL_MAX_BYTES', str(20 * 1024 * 1024)))
+ATTACHMENT_THUMBNAIL_WORKERS = int(os.environ.get('ATTACHMENT_THUMBNAIL_WORKERS', '2'))
+
+CHANGE_FEED_LAG_SECONDS = float(os.environ.get('CHANGE_FEED_LAG_SECONDS', '5'))
+
+READ_CACHE_TTL_SECONDS = float(os.environ.get('READ_CACHE_TTL_SECONDS', '5'))
+READ_CACHE_MAX_ENTRIES = int(os.environ.get('READ_CACHE_MAX_ENTRIES', '256'))
+
+IDEMPOTENCY_STORE = os.environ.get('IDEMPOTENCY_STORE', 'memory')
+IDEMPOTENCY_SQLITE_PATH = os.environ.get('IDEMPOTENCY_SQLITE_PATH', str(ROOT_DIR / 'idempotency.db'))
+IDEMPOTENCY_TTL_SECONDS = float(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '86400'))
+IDEMPOTENCY_LOCK_SECONDS = float(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', '60'))
+
+STORE_PRUNE_SECONDS = float(os.environ.get('STORE_PRUNE_SECONDS', '300'))
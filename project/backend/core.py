@@ -0,0 +1,352 @@
+import asyncio
+import logging
+import math
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+
+from fastapi import HTTPException, Depends, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+import config
+import passwords
+import replicas
+import resilience
+import revocation
+from models import Idea
+from query_trace import TracedClient
+from rate_limit import create_rate_limiter, InflightLimiter
+from storage import LazyStorage, create_storage
+
+
+def build_storage():
+    storage = create_storage(config.STORAGE_BACKEND, config.SQLITE_PATH, config.SUPABASE_URL, config.SUPABASE_KEY,
+                             config.POSTGREST_HTTP_TIMEOUT)
+    return TracedClient(resilience.registry.wrap(storage))
+
+
+def build_replica():
+    storage = create_storage("supabase", supabase_url=config.SUPABASE_REPLICA_URL, supabase_key=config.SUPABASE_REPLICA_KEY,
+                             timeout=config.POSTGREST_HTTP_TIMEOUT)
+    return TracedClient(resilience.registry.wrap(storage, postgrest="postgrest_replica"))
+
+
+db = LazyStorage(build_storage)
+replica_db = LazyStorage(build_replica)
+
+
+def read_db(user: Optional[dict] = None):
+    return db if replicas.use_primary(user) else replica_db
+
+
+rate_limiter = create_rate_limiter(config.RATE_LIMIT_STORE, config.RATE_LIMIT_SQLITE_PATH, config.RATE_LIMIT_ENABLED)
+auth_inflight = InflightLimiter(config.AUTH_MAX_INFLIGHT)
+
+security = HTTPBearer()
+
+
+def access_claims(profile: dict) -> dict:
+    return {
+        "sub": str(profile["id"]),
+        "username": profile["username"],
+        "role": profile["role"],
+        "sub_role": profile.get("sub_role"),
+    }
+
+
+def create_access_token(data: dict) -> str:
+    from jose import jwt
+
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": time.time(), "type": "access"})
+    return jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
+
+
+def create_refresh_token(user_id: str) -> str:
+    from jose import jwt
+
+    expire = datetime.now(timezone.utc) + timedelta(days=config.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {"sub": str(user_id), "jti": uuid.uuid4().hex, "exp": expire, "iat": time.time(), "type": "refresh"}
+    return jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
+
+
+def decode_refresh_token(token: str) -> dict:
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    if payload.get("type") != "refresh" or not payload.get("sub") or revocation.refresh_revoked(payload):
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    return payload
+
+
+def create_reset_token(email: str) -> str:
+    from jose import jwt
+
+    expire = datetime.now(timezone.utc) + timedelta(hours=1)
+    to_encode = {"email": email, "exp": expire, "type": "password_reset"}
+    return jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
+
+
+def verify_reset_token(token: str) -> str:
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+        email: str = payload.get("email")
+        token_type: str = payload.get("type")
+        if email is None or token_type != "password_reset":
+            raise HTTPException(status_code=400, detail="Invalid reset token")
+        return email
+    except JWTError:
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+
+
+def decode_access_token(credentials: HTTPAuthorizationCredentials) -> dict:
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(credentials.credentials, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    if payload.get("sub") is None or payload.get("type", "access") != "access":
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    if revocation.access_revoked(payload):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
+
+
+def load_profile(user_id: str) -> dict:
+    result = db.table("profiles").select("*").eq("id", user_id).maybeSingle().execute()
+    if result.data is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return result.data
+
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+
+    payload = decode_access_token(credentials)
+    if "role" in payload:
+        user = {"id": payload["sub"], "username": payload.get("username"), "role": payload["role"],
+                "sub_role": payload.get("sub_role")}
+    else:
+        user = load_profile(payload["sub"])
+    request.state.user_id = user["id"]
+    return user
+
+
+async def get_current_profile(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    payload = decode_access_token(credentials)
+    user = load_profile(payload["sub"])
+    request.state.user_id = user["id"]
+    return user
+
+
+async def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+
+def client_ip(request: Request) -> str:
+    forwarded = request.headers.get("x-forwarded-for")
+    if config.TRUSTED_PROXY_HOPS and forwarded:
+        hops = [h.strip() for h in forwarded.split(",") if h.strip()]
+        if hops:
+            return hops[-min(config.TRUSTED_PROXY_HOPS, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_rate_limit(name: str, key: Optional[str]):
+    retry_after = rate_limiter.hit(name, key)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+def auth_guard(scope: str):
+    async def guard(request: Request):
+        enforce_rate_limit(f"{scope}:ip", client_ip(request))
+        if not auth_inflight.try_acquire():
+            raise HTTPException(status_code=503, detail="Server busy. Please try again shortly.", headers={"Retry-After": "1"})
+        try:
+            yield
+        finally:
+            auth_inflight.release()
+    return guard
+
+
+def local_auth() -> bool:
+    return config.AUTH_MODE == "local" or config.STORAGE_BACKEND == "sqlite"
+
+
+async def create_auth_user(email: str, password: str, username: str, role: str) -> Optional[str]:
+    if local_auth():
+        user_id = str(uuid.uuid4())
+        db.table("credentials").insert({
+            "id": user_id,
+            "email": email,
+            "password_hash": await passwords.hash_password(password),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).execute()
+        return user_id
+
+    auth_result = db.auth.sign_up({
+        "email": email,
+        "password": password,
+        "options": {
+            "data": {
+                "username": username,
+                "role": role
+            }
+        }
+    })
+    return auth_result.user.id if auth_result.user else None
+
+
+async def check_password(user_profile: Optional[dict], password: str) -> bool:
+    if local_auth():
+        result = None
+        if user_profile:
+            result = db.table("credentials").select("password_hash").eq("id", user_profile["id"]).maybeSingle().execute()
+        if not result or not result.data:
+            # Spend the same bcrypt work as a real check so timing does not reveal the account.
+            await passwords.verify_unknown(password)
+            return False
+        valid, new_hash = await passwords.verify_password(password, result.data["password_hash"])
+        if new_hash:
+            db.table("credentials").update({
+                "password_hash": new_hash,
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }).eq("id", user_profile["id"]).execute()
+        return valid
+
+    if not user_profile:
+        return False
+    try:
+        auth_result = db.auth.sign_in_with_password({
+            "email": user_profile["email"],
+            "password": password
+        })
+        return bool(auth_result.user)
+    except Exception as e:
+        logging.error(f"Login error: {str(e)}")
+        return False
+
+
+async def set_password(user_id: str, email: str, password: str):
+    if local_auth():
+        db.table("credentials").upsert({
+            "id": user_id,
+            "email": email,
+            "password_hash": await passwords.hash_password(password),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).execute()
+        return
+
+    db.auth.admin.update_user_by_id(user_id, {"password": password})
+
+
+async def send_email_async(recipient_email: str, subject: str, html_content: str):
+    if not config.RESEND_API_KEY:
+        logging.warning(f"Email not sent (no API key): {subject} to {recipient_email}")
+        return False
+
+    params = {
+        "from": config.SENDER_EMAIL,
+        "to": [recipient_email],
+        "subject": subject,
+        "html": html_content
+    }
+
+    try:
+        import resend
+
+        resend.api_key = config.RESEND_API_KEY
+        result = await asyncio.to_thread(resilience.registry.call, "mail", "mail", lambda: resend.Emails.send(params))
+        logging.info(f"Email sent successfully: {subject} to {recipient_email}, ID: {result}")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to send email to {recipient_email}: {str(e)}")
+        return False
+
+
+async def send_email_batch_async(messages: List[dict]):
+    if not messages:
+        return 0
+    if not config.RESEND_API_KEY:
+        logging.warning(f"{len(messages)} emails not sent (no API key)")
+        return 0
+
+    import resend
+
+    resend.api_key = config.RESEND_API_KEY
+    sent = 0
+    for start in range(0, len(messages), config.EMAIL_BATCH_SIZE):
+        chunk = messages[start:start + config.EMAIL_BATCH_SIZE]
+        params = [
+            {"from": config.SENDER_EMAIL, "to": [m["to"]], "subject": m["subject"], "html": m["html"]}
+            for m in chunk
+        ]
+        try:
+            await asyncio.to_thread(resilience.registry.call, "mail", "mail", lambda: resend.Batch.send(params))
+            sent += len(chunk)
+            logging.info(f"Batch of {len(chunk)} emails sent successfully")
+        except Exception as e:
+            logging.error(f"Failed to send batch of {len(chunk)} emails: {str(e)}")
+    return sent
+
+
+def add_is_evaluated(idea_doc: dict) -> dict:
+    idea_doc["is_evaluated"] = idea_doc.get("evaluated_by") is not None
+    return idea_doc
+
+
+def format_idea(idea: dict) -> Idea:
+    idea = add_is_evaluated(idea)
+    return Idea(
+        id=str(idea["id"]),
+        idea_number=idea["idea_number"],
+        pillar=idea["pillar"],
+        title=idea["title"],
+        improvement_type=idea["improvement_type"],
+        current_process=idea["current_process"],
+        suggested_solution=idea["suggested_solution"],
+        benefits=idea["benefits"],
+        target_completion=idea.get("target_completion") or "",
+        department=idea.get("department"),
+        team=idea.get("team"),
+        status=idea["status"],
+        submitted_by=str(idea["submitted_by"]) if idea.get("submitted_by") else "",
+        submitted_by_username=idea.get("submitted_by_username") or "",
+        assigned_approver=str(idea["assigned_approver"]) if idea.get("assigned_approver") else None,
+        assigned_approver_username=idea.get("assigned_approver_username"),
+        created_at=idea["created_at"],
+        updated_at=idea["updated_at"],
+        is_quick_win=idea.get("is_quick_win"),
+        complexity_level=idea.get("complexity_level"),
+        savings_type=idea.get("savings_type"),
+        cost_savings=float(idea["cost_savings"]) if idea.get("cost_savings") else None,
+        time_saved_hours=float(idea["time_saved_hours"]) if idea.get("time_saved_hours") else None,
+        time_saved_minutes=float(idea["time_saved_minutes"]) if idea.get("time_saved_minutes") else None,
+        evaluation_notes=idea.get("evaluation_notes"),
+        assigned_to_tech=idea.get("assigned_to_tech") or False,
+        tech_person_name=idea.get("tech_person_name"),
+        is_best_idea=idea.get("is_best_idea") or False,
+        evaluated_by=str(idea["evaluated_by"]) if idea.get("evaluated_by") else None,
+        evaluated_by_username=idea.get("evaluated_by_username"),
+        evaluated_at=idea.get("evaluated_at"),
+        is_evaluated=idea.get("is_evaluated") or False,
+        is_archived=bool(idea.get("archived_at")),
+        attachment_count=int(idea.get("attachment_count") or 0)
+    )
@@ -0,0 +1,97 @@
+"""
+Append-only idea_events log with one row per status transition.
+Each row carries the time spent in the status it leaves, so cycle-time reports are a range scan on occurred_at.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from readiness import percentile
+
+logger = logging.getLogger("events")
+
+GROUPS = {"pillar": "pillar", "department": "department", "approver": "approver_username"}
+
+# metric -> (duration column, predicate on the event row)
+METRICS = {
+    "time_in_pending": ("duration_seconds", lambda e: e["from_status"] == "pending"),
+    "approval_latency": ("duration_seconds", lambda e: e["from_status"] == "pending" and e["to_status"] == "approved"),
+    "revision_turnaround": ("duration_seconds", lambda e: e["from_status"] == "revision_requested" and e["to_status"] == "pending"),
+    "time_to_implementation": ("age_seconds", lambda e: e["to_status"] == "implemented" and e["from_status"] != "implemented"),
+}
+
+PERCENTILES = [50, 90, 95]
+
+
+def seconds_between(start: Optional[str], end: str) -> Optional[float]:
+    if not start:
+        return None
+    return max(0.0, (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds())
+
+
+def entered_status_at(idea: dict) -> Optional[str]:
+    if idea.get("status_changed_at"):
+        return idea["status_changed_at"]
+    if idea.get("status") == "pending":
+        return idea.get("created_at")
+    return idea.get("updated_at")
+
+
+def status_update(idea: dict, to_status: str, now: str) -> dict:
+    update = {"status": to_status, "updated_at": now}
+    if to_status != idea.get("status"):
+        update["status_changed_at"] = now
+    return update
+
+
+def event_row(idea: dict, action: str, to_status: str, actor: dict, now: str) -> dict:
+    return {
+        "idea_id": idea["id"],
+        "action": action,
+        "from_status": idea.get("status"),
+        "to_status": to_status,
+        "actor_id": actor["id"],
+        "actor_username": actor["username"],
+        "pillar": idea.get("pillar"),
+        "department": idea.get("department"),
+        "approver_id": idea.get("assigned_approver"),
+        "approver_username": idea.get("assigned_approver_username"),
+        "occurred_at": now,
+        "duration_seconds": seconds_between(entered_status_at(idea), now),
+        "age_seconds": seconds_between(idea.get("created_at"), now),
+    }
+
+
+def record(db, idea: dict, action: str, to_status: str, actor: dict, now: str) -> None:
+    record_many(db, [event_row(idea, action, to_status, actor, now)])
+
+
+def record_many(db, rows: List[dict]) -> None:
+    # The transition is already committed; a lost event must not fail it or invite a retry.
+    try:
+        db.table("idea_events").insert(rows).execute()
+    except Exception as e:
+        logger.error(f"Failed to record {len(rows)} idea events: {str(e)}")
+
+
+def summarize(values: List[float]) -> dict:
+    summary = {"count": len(values)}
+    for pct in PERCENTILES:
+        value = percentile(values, pct)
+        summary[f"p{pct}_hours"] = round(value / 3600, 2) if value is not None else None
+    return summary
+
+
+def cycle_times(events: Iterable[dict], group_by: Optional[str] = None) -> Dict[str, dict]:
+    samples = defaultdict(lambda: defaultdict(list))
+    for event in events:
+        key = (event.get(GROUPS[group_by]) or "Unassigned") if group_by else "all"
+        for metric, (column, matches) in METRICS.items():
+            if event.get(column) is not None and matches(event):
+                samples[key][metric].append(float(event[column]))
+
+    return {
+        key: {metric: summarize(samples[key][metric]) for metric in METRICS}
+        for key in sorted(samples)
+    }
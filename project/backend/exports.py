@@ -0,0 +1,181 @@
+"""
+Idea exports in CSV, Parquet and XLSX, read in EXPORT_PAGE_SIZE keyset pages from ideas, then ideas_archive.
+CSV and Parquet stream one page at a time; XLSX builds the whole sheet.
+"""
+import csv
+import io
+from typing import Iterator, List
+
+import config
+
+# (header, idea field, kind)
+COLUMNS = [
+    ("Idea Number", "idea_number", "text"),
+    ("Title", "title", "text"),
+    ("Status", "status", "text"),
+    ("Pillar", "pillar", "text"),
+    ("Department", "department", "text"),
+    ("Team", "team", "text"),
+    ("Improvement Type", "improvement_type", "text"),
+    ("Submitted By", "submitted_by_username", "text"),
+    ("Assigned Approver", "assigned_approver_username", "text"),
+    ("Quick Win", "is_quick_win", "bool"),
+    ("Complexity", "complexity_level", "text"),
+    ("Savings Type", "savings_type", "text"),
+    ("Cost Savings", "cost_savings", "number"),
+    ("Time Saved (Hours)", "time_saved_hours", "number"),
+    ("Time Saved (Minutes)", "time_saved_minutes", "number"),
+    ("Evaluated By", "evaluated_by_username", "text"),
+    ("Tech Person", "tech_person_name", "text"),
+    ("Best Idea", "is_best_idea", "flag"),
+    ("Target Completion", "target_completion", "text"),
+    ("Created At", "created_at", "text"),
+]
+HEADERS = [header for header, _, _ in COLUMNS]
+SELECT = "id," + ",".join(field for _, field, _ in COLUMNS)
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def typed(idea: dict) -> list:
+    values = []
+    for _, field, kind in COLUMNS:
+        value = idea.get(field)
+        if kind == "number":
+            value = float(value) if value not in (None, "") else None
+        elif kind == "bool":
+            value = bool(value) if value is not None else None
+        elif kind == "flag":
+            value = bool(value)
+        values.append(value)
+    return values
+
+
+def display(idea: dict) -> list:
+    values = []
+    for (_, _, kind), value in zip(COLUMNS, typed(idea)):
+        if kind in ("bool", "flag"):
+            value = "" if value is None else "Yes" if value else "No"
+        elif kind == "number":
+            value = value or ""
+        elif value is None:
+            value = ""
+        values.append(value)
+    return values
+
+
+def pages(db, page_size: int = None) -> Iterator[List[dict]]:
+    page_size = page_size or config.EXPORT_PAGE_SIZE
+    for table in ("ideas", "ideas_archive"):
+        last_id = None
+        while True:
+            query = db.table(table).select(SELECT)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            fetched = query.order("id").limit(page_size).execute().data
+            if not fetched:
+                break
+            last_id = fetched[-1]["id"]
+            rows = fetched
+            if table == "ideas_archive":
+                hot = db.table("ideas").select("id").in_("id", [row["id"] for row in fetched]).execute().data
+                hot_ids = {row["id"] for row in hot}
+                rows = [row for row in fetched if row["id"] not in hot_ids]
+            if rows:
+                yield rows
+            if len(fetched) < page_size:
+                break
+
+
+def stream_csv(db, page_size: int = None) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADERS)
+    for page in pages(db, page_size):
+        for idea in page:
+            writer.writerow(display(idea))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    types = {"text": pa.string(), "number": pa.float64(), "bool": pa.bool_(), "flag": pa.bool_()}
+    return pa.schema([(header, types[kind]) for header, _, kind in COLUMNS])
+
+
+class _Drain(io.RawIOBase):
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def stream_parquet(db, page_size: int = None) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema()
+    sink = _Drain()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for page in pages(db, page_size):
+            columns = list(zip(*(typed(idea) for idea in page)))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+            ))
+            yield sink.take()
+    yield sink.take()
+
+
+def build_xlsx(db, page_size: int = None) -> io.BytesIO:
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Eye-deas"
+
+    header_fill = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+
+    for col_num, header in enumerate(HEADERS, 1):
+        cell = ws.cell(row=1, column=col_num, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+
+    widths = [len(header) for header in HEADERS]
+    for page in pages(db, page_size):
+        for idea in page:
+            values = display(idea)
+            ws.append(values)
+            widths = [max(width, len(str(value))) for width, value in zip(widths, values)]
+
+    for col_num, width in enumerate(widths, 1):
+        ws.column_dimensions[ws.cell(row=1, column=col_num).column_letter].width = min(width + 2, 50)
+
+    excel_file = io.BytesIO()
+    wb.save(excel_file)
+    excel_file.seek(0)
+    return excel_file
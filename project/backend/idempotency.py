@@ -0,0 +1,193 @@
+"""
+Idempotency-Key support for non-repeatable writes: a retry replays the stored response instead of running again.
+MemoryIdempotencyStore keeps keys per process; SQLiteIdempotencyStore shares them between workers on a host.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.responses import Response
+
+import config
+from core import get_current_user
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+@dataclass
+class Record:
+    fingerprint: str
+    expires: float
+    status_code: Optional[int] = None
+    body: bytes = b""
+    media_type: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+
+class Replay(Exception):
+    def __init__(self, record: Record):
+        self.record = record
+
+
+class MemoryIdempotencyStore:
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.records: "OrderedDict[str, Record]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[Record]:
+        with self.lock:
+            now = self.clock()
+            record = self.records.get(key)
+            if record is not None and record.expires > now:
+                return record
+            self.records.pop(key, None)
+            self.records[key] = Record(fingerprint, now + lock_seconds)
+            while len(self.records) > self.max_keys:
+                self.records.popitem(last=False)
+            return None
+
+    def complete(self, key: str, status_code: int, body: bytes, media_type: Optional[str], ttl: float) -> None:
+        with self.lock:
+            record = self.records.get(key)
+            if record is not None:
+                record.status_code, record.body, record.media_type = status_code, body, media_type
+                record.expires = self.clock() + ttl
+
+    def release(self, key: str) -> None:
+        with self.lock:
+            self.records.pop(key, None)
+
+    def prune(self) -> None:
+        with self.lock:
+            now = self.clock()
+            for key in [key for key, record in self.records.items() if record.expires < now]:
+                del self.records[key]
+
+    def reset(self) -> None:
+        with self.lock:
+            self.records.clear()
+
+
+class SQLiteIdempotencyStore:
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self.local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS idempotency_keys (key TEXT PRIMARY KEY, fingerprint TEXT, expires REAL,"
+            " status_code INTEGER, body BLOB, media_type TEXT)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def begin(self, key: str, fingerprint: str, lock_seconds: float) -> Optional[Record]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self.clock()
+            row = conn.execute(
+                "SELECT fingerprint, expires, status_code, body, media_type FROM idempotency_keys WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] > now:
+                conn.execute("COMMIT")
+                return Record(row[0], row[1], row[2], row[3] or b"", row[4])
+            conn.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, fingerprint, expires) VALUES (?, ?, ?)",
+                (key, fingerprint, now + lock_seconds),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return None
+
+    def complete(self, key: str, status_code: int, body: bytes, media_type: Optional[str], ttl: float) -> None:
+        self._connect().execute(
+            "UPDATE idempotency_keys SET status_code = ?, body = ?, media_type = ?, expires = ? WHERE key = ?",
+            (status_code, body, media_type, self.clock() + ttl, key),
+        )
+
+    def release(self, key: str) -> None:
+        self._connect().execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+
+    def prune(self) -> None:
+        self._connect().execute("DELETE FROM idempotency_keys WHERE expires < ?", (self.clock(),))
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM idempotency_keys")
+
+
+def create_store(store: str = "memory", sqlite_path: str = "idempotency.db"):
+    if store == "sqlite":
+        return SQLiteIdempotencyStore(sqlite_path)
+    if store == "memory":
+        return MemoryIdempotencyStore()
+    raise ValueError(f"Unknown IDEMPOTENCY_STORE: {store}")
+
+
+store = create_store(config.IDEMPOTENCY_STORE, config.IDEMPOTENCY_SQLITE_PATH)
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def idempotent(request: Request, current_user: dict = Depends(get_current_user)):
+    key = request.headers.get(HEADER)
+    if not key:
+        return
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"{HEADER} must be at most {MAX_KEY_LENGTH} characters")
+
+    scoped = f"{current_user['id']}:{key}"
+    request_fingerprint = fingerprint(request.method, request.url.path, await request.body())
+    record = store.begin(scoped, request_fingerprint, config.IDEMPOTENCY_LOCK_SECONDS)
+    if record is None:
+        request.state.idempotency_key = scoped
+        return
+    if record.fingerprint != request_fingerprint:
+        raise HTTPException(status_code=422, detail=f"{HEADER} was already used for a different request")
+    if not record.completed:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress",
+                            headers={"Retry-After": "1"})
+    raise Replay(record)
+
+
+async def replay_handler(request: Request, exc: Replay) -> Response:
+    record = exc.record
+    return Response(record.body, status_code=record.status_code, media_type=record.media_type,
+                    headers={"Idempotent-Replayed": "true"})
+
+
+async def capture(request: Request, response: Response) -> Response:
+    key = getattr(request.state, "idempotency_key", None)
+    if key is None:
+        return response
+    if response.status_code == 504:
+        return response
+    if response.status_code >= 500:
+        store.release(key)
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    store.complete(key, response.status_code, body, response.headers.get("content-type"), config.IDEMPOTENCY_TTL_SECONDS)
+    return Response(body, status_code=response.status_code, headers=dict(response.headers))
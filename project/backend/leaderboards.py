@@ -0,0 +1,145 @@
+"""
+Leaderboards kept as leaderboard_counters rows per (board, period, subject), updated by deltas on each write.
+`python leaderboards.py --rebuild` recomputes every counter from ideas and ideas_archive.
+"""
+import argparse
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("leaderboards")
+
+BOARDS = ["submitters", "departments", "cost_savings"]
+PERIODS = ["all", "year", "month", "week"]
+
+Key = Tuple[str, str, str]
+
+
+def period_key(period: str, at: datetime) -> str:
+    if period == "all":
+        return "all"
+    if period == "year":
+        return f"{at.year}"
+    if period == "month":
+        return f"{at.year}-{at.month:02d}"
+    year, week, _ = at.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _periods(timestamp: Optional[str]) -> List[str]:
+    if not timestamp:
+        return ["all"]
+    at = datetime.fromisoformat(timestamp)
+    return [period_key(period, at) for period in PERIODS]
+
+
+def contributions(idea: Optional[dict]) -> Dict[Key, Tuple[str, float]]:
+    if not idea:
+        return {}
+    result = {}
+
+    def add(board: str, timestamp: Optional[str], subject: Optional[str], label: Optional[str], value: float):
+        subject = subject or "Unassigned"
+        for period in _periods(timestamp):
+            result[(board, period, subject)] = (label or subject, value)
+
+    if idea.get("submitted_by"):
+        add("submitters", idea.get("created_at"), str(idea["submitted_by"]), idea.get("submitted_by_username"), 1)
+    if idea.get("status") == "implemented":
+        implemented_at = idea.get("status_changed_at") or idea.get("updated_at")
+        add("departments", implemented_at, idea.get("department"), idea.get("department"), 1)
+    if idea.get("evaluated_at") and idea.get("savings_type") == "cost_savings" and idea.get("cost_savings"):
+        add("cost_savings", idea["evaluated_at"], str(idea.get("submitted_by") or ""),
+            idea.get("submitted_by_username"), float(idea["cost_savings"]))
+    return result
+
+
+def counter_id(key: Key) -> str:
+    return ":".join(key)
+
+
+def update(db, before: Optional[dict], after: Optional[dict]) -> None:
+    update_many(db, [(before, after)])
+
+
+def update_many(db, changes: Iterable[Tuple[Optional[dict], Optional[dict]]]) -> None:
+    deltas = {}
+    for before, after in changes:
+        old, new = contributions(before), contributions(after)
+        for key in old.keys() | new.keys():
+            delta = new.get(key, (None, 0))[1] - old.get(key, (None, 0))[1]
+            if delta:
+                total = deltas.get(key, (None, 0))[1]
+                deltas[key] = (new.get(key) or old[key])[0], total + delta
+    deltas = {key: value for key, value in deltas.items() if value[1]}
+    if not deltas:
+        return
+    # The idea write is already committed; a failed increment is repaired by --rebuild, not a retry.
+    try:
+        apply(db, deltas)
+    except Exception as e:
+        logger.error(f"Failed to update leaderboard counters, run --rebuild: {str(e)}")
+
+
+def apply(db, deltas: Dict[Key, Tuple[str, float]]) -> None:
+    db.rpc("increment_leaderboard_counters", {"deltas": [
+        {"id": counter_id(key), "board": key[0], "period": key[1], "subject": key[2], "label": label, "value": delta}
+        for key, (label, delta) in deltas.items()
+    ]}).execute()
+
+
+def top(db, board: str, period: str = "all", limit: int = 10) -> List[dict]:
+    rows = (
+        db.table("leaderboard_counters").select("subject,label,value")
+        .eq("board", board).eq("period", period).gt("value", 0)
+        .order("value", desc=True).limit(limit).execute().data
+    )
+    return [
+        {"rank": rank, "subject": row["subject"], "label": row["label"], "value": row["value"]}
+        for rank, row in enumerate(rows, 1)
+    ]
+
+
+def totals(ideas: Iterable[dict]) -> Dict[Key, Tuple[str, float]]:
+    result = defaultdict(lambda: [None, 0.0])
+    for idea in ideas:
+        for key, (label, value) in contributions(idea).items():
+            result[key][0] = label
+            result[key][1] += value
+    return {key: (label, value) for key, (label, value) in result.items()}
+
+
+def rebuild(db, batch_size: int = 500) -> int:
+    import archive
+
+    counts = totals(archive.select_ideas(db, lambda query: query, include_archived=True))
+    db.table("leaderboard_counters").delete().neq("id", "").execute()
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [
+        {"id": counter_id(key), "board": key[0], "period": key[1], "subject": key[2], "label": label,
+         "value": value, "updated_at": now}
+        for key, (label, value) in counts.items()
+    ]
+    for start in range(0, len(rows), batch_size):
+        db.table("leaderboard_counters").upsert(rows[start:start + batch_size]).execute()
+    logger.info(f"Rebuilt {len(rows)} leaderboard counters")
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain leaderboard counters")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every counter from ideas")
+    args = parser.parse_args(argv)
+
+    from core import db
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.rebuild:
+        print(f"Rebuilt {rebuild(db)} leaderboard counters")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
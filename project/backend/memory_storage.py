@@ -0,0 +1,250 @@
+"""
+In-memory stand-in for the subset of the supabase-py client used by server.py, shared by the tests and benchmarks.
+Supports the PostgREST query builder chain and the auth calls made by the handlers.
+"""
+import copy
+import re
+import uuid
+from types import SimpleNamespace
+
+
+class MemoryResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class MemoryQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.payload = None
+        self.count_mode = None
+        self.filters = []
+        self.ordering = []
+        self.limit_count = None
+        self.offset = 0
+        self.single_mode = None
+
+    def select(self, columns="*", count=None):
+        self.columns = columns
+        self.count_mode = count
+        return self
+
+    def insert(self, payload):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def upsert(self, payload, **kwargs):
+        self.operation = "upsert"
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.operation = "update"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def _filter(self, predicate):
+        self.filters.append(predicate)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(lambda r: _norm(r.get(column)) == _norm(value))
+
+    def neq(self, column, value):
+        return self._filter(lambda r: _norm(r.get(column)) != _norm(value))
+
+    def gt(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) > value)
+
+    def gte(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) >= value)
+
+    def lt(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) < value)
+
+    def lte(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) <= value)
+
+    def in_(self, column, values):
+        values = {_norm(v) for v in values}
+        return self._filter(lambda r: _norm(r.get(column)) in values)
+
+    def is_(self, column, value):
+        if value in (None, "null"):
+            return self._filter(lambda r: r.get(column) is None)
+        return self._filter(lambda r: r.get(column) == value)
+
+    def contains(self, column, values):
+        return self._filter(lambda r: set(values).issubset(set(r.get(column) or [])))
+
+    def ilike(self, column, pattern):
+        tokens = re.findall(r"\\.|.", pattern, re.DOTALL)
+        regex = re.compile("".join(
+            ".*" if token == "%" else "." if token == "_" else re.escape(token[-1]) for token in tokens
+        ), re.IGNORECASE | re.DOTALL)
+        return self._filter(lambda r: regex.fullmatch(str(r.get(column) or "")) is not None)
+
+    def or_(self, filters):
+        predicates = []
+        for part in filters.split(","):
+            column, op, value = part.split(".", 2)
+            if op == "ilike":
+                predicates.append(MemoryQuery(self.db, self.table).ilike(column, value.replace("*", "%")).filters[0])
+            else:
+                predicates.append(getattr(MemoryQuery(self.db, self.table), op)(column, value).filters[0])
+        return self._filter(lambda r: any(p(r) for p in predicates))
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def maybe_single(self):
+        self.single_mode = "maybe"
+        return self
+
+    maybeSingle = maybe_single
+
+    def single(self):
+        self.single_mode = "single"
+        return self
+
+    def _matching(self):
+        rows = self.db.tables.setdefault(self.table, [])
+        return [r for r in rows if all(f(r) for f in self.filters)]
+
+    def execute(self):
+        self.db.executed += 1
+        rows = self.db.tables.setdefault(self.table, [])
+        if self.operation in ("insert", "upsert"):
+            docs = self.payload if isinstance(self.payload, list) else [self.payload]
+            created = []
+            for doc in docs:
+                doc = copy.deepcopy(doc)
+                doc.setdefault("id", str(uuid.uuid4()))
+                if self.operation == "upsert":
+                    rows[:] = [r for r in rows if r["id"] != doc["id"]]
+                rows.append(doc)
+                created.append(copy.deepcopy(doc))
+            return MemoryResponse(created)
+        if self.operation == "update":
+            matched = self._matching()
+            for row in matched:
+                row.update(copy.deepcopy(self.payload))
+            return MemoryResponse(copy.deepcopy(matched))
+        if self.operation == "delete":
+            matched = self._matching()
+            ids = {id(r) for r in matched}
+            rows[:] = [r for r in rows if id(r) not in ids]
+            return MemoryResponse(copy.deepcopy(matched))
+
+        matched = self._matching()
+        for column, desc in reversed(self.ordering):
+            matched.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        total = len(matched)
+        if self.limit_count is not None:
+            matched = matched[self.offset:self.offset + self.limit_count]
+        elif self.offset:
+            matched = matched[self.offset:]
+        data = copy.deepcopy(matched)
+        if self.single_mode:
+            if not data:
+                if self.single_mode == "single":
+                    raise ValueError("No rows found")
+                return MemoryResponse(None)
+            return MemoryResponse(data[0], total if self.count_mode else None)
+        return MemoryResponse(data, total if self.count_mode else None)
+
+
+class MemoryAuthAdmin:
+    def __init__(self, auth):
+        self.auth = auth
+
+    def update_user_by_id(self, user_id, attributes):
+        for user in self.auth.users.values():
+            if user["id"] == user_id:
+                user.update(attributes)
+                return SimpleNamespace(user=SimpleNamespace(id=user_id))
+        raise ValueError("User not found")
+
+
+class MemoryAuth:
+    def __init__(self):
+        self.users = {}
+        self.admin = MemoryAuthAdmin(self)
+
+    def sign_up(self, credentials):
+        email = credentials["email"]
+        if email in self.users:
+            raise ValueError("User already registered")
+        user_id = str(uuid.uuid4())
+        self.users[email] = {"id": user_id, "password": credentials["password"]}
+        return SimpleNamespace(user=SimpleNamespace(id=user_id, email=email))
+
+    def sign_in_with_password(self, credentials):
+        user = self.users.get(credentials["email"])
+        if not user or user["password"] != credentials["password"]:
+            raise ValueError("Invalid login credentials")
+        return SimpleNamespace(user=SimpleNamespace(id=user["id"], email=credentials["email"]))
+
+
+class MemoryCall:
+    def __init__(self, db, name, params):
+        self.db = db
+        self.function = getattr(self, name)
+        self.params = params
+
+    def increment_leaderboard_counters(self, deltas):
+        rows = {row["id"]: row for row in self.db.tables.setdefault("leaderboard_counters", [])}
+        for delta in deltas:
+            row = rows.get(delta["id"])
+            if row is None:
+                row = rows[delta["id"]] = {**delta, "value": 0}
+                self.db.tables["leaderboard_counters"].append(row)
+            row.update(label=delta["label"], value=row["value"] + delta["value"])
+
+    def refresh_attachment_count(self, target):
+        total = sum(1 for row in self.db.tables.get("idea_attachments", []) if row["idea_id"] == target)
+        for idea in self.db.tables.get("ideas", []):
+            if idea["id"] == target:
+                idea["attachment_count"] = total
+        return total
+
+    def execute(self):
+        self.db.executed += 1
+        return MemoryResponse(self.function(**copy.deepcopy(self.params)))
+
+
+class MemoryStorage:
+    def __init__(self):
+        self.tables = {}
+        self.auth = MemoryAuth()
+        self.executed = 0
+
+    def table(self, name):
+        return MemoryQuery(self, name)
+
+    def rpc(self, name, params):
+        return MemoryCall(self, name, params)
+
+
+def _norm(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    return str(value)
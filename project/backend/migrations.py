@@ -0,0 +1,83 @@
+"""
+Applies the SQL files in supabase/migrations to any Postgres DSN, recording versions in schema_migrations.
+Usage: python migrations.py --dsn postgresql://localhost/eyedea [--dry-run]
+"""
+import argparse
+import re
+from pathlib import Path
+from typing import List, NamedTuple
+
+import config
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "supabase" / "migrations"
+FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+class Migration(NamedTuple):
+    version: str
+    name: str
+    path: Path
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = FILENAME.match(path.name)
+        if not match:
+            raise ValueError(f"Migration file name must be <version>_<name>.sql: {path.name}")
+        migrations.append(Migration(match.group(1), match.group(2), path))
+    migrations.sort()
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError("Duplicate migration versions")
+    return migrations
+
+
+def applied_versions(conn) -> set:
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations "
+        "(version text PRIMARY KEY, name text NOT NULL, applied_at timestamptz NOT NULL DEFAULT now())"
+    )
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations").fetchall()}
+
+
+def migrate(conn, directory: Path = MIGRATIONS_DIR, dry_run: bool = False) -> List[Migration]:
+    with conn.transaction():
+        done = applied_versions(conn)
+    pending = [m for m in discover(directory) if m.version not in done]
+    if dry_run:
+        return pending
+    for migration in pending:
+        with conn.transaction():
+            conn.execute(migration.path.read_text())
+            conn.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                         (migration.version, migration.name))
+    return pending
+
+
+def connect(dsn: str):
+    import psycopg
+
+    return psycopg.connect(dsn, autocommit=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply pending SQL migrations")
+    parser.add_argument("--dsn", default=config.DATABASE_URL)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL is required")
+
+    with connect(args.dsn) as conn:
+        pending = migrate(conn, dry_run=args.dry_run)
+    verb = "Would apply" if args.dry_run else "Applied"
+    for migration in pending:
+        print(f"{verb} {migration.version}_{migration.name}")
+    if not pending:
+        print("Schema is up to date")
+    return pending
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+from pydantic import BaseModel, EmailStr, ConfigDict
+from typing import Any, Dict, List, Optional, Union
+
+
+class UserBase(BaseModel):
+    username: str
+    email: EmailStr
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: str = "user"
+    sub_role: Optional[str] = None
+    department: Optional[str] = None
+    team: Optional[str] = None
+    pillar: Optional[str] = None
+    manager: Optional[str] = None
+    approved_pillars: Optional[List[str]] = []
+    approved_departments: Optional[List[str]] = []
+
+
+class UserCreate(UserBase):
+    password: str
+
+
+class UserPasswordChange(BaseModel):
+    current_password: str
+    new_password: str
+
+
+class ForgotPasswordRequest(BaseModel):
+    email: EmailStr
+
+
+class ResetPasswordRequest(BaseModel):
+    token: str
+    new_password: str
+
+
+class SubRoleSelection(BaseModel):
+    sub_role: str
+
+
+class UserLogin(BaseModel):
+    username: str
+    password: str
+
+
+class User(UserBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    created_at: str
+
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str
+    user: User
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class IdeaBase(BaseModel):
+    pillar: str
+    title: str
+    improvement_type: str
+    current_process: str
+    suggested_solution: str
+    benefits: str
+    target_completion: str
+    department: Optional[str] = None
+    team: Optional[str] = None
+
+
+class IdeaCreate(IdeaBase):
+    pass
+
+
+class CIEvaluation(BaseModel):
+    is_quick_win: bool
+    complexity_level: Optional[str] = None
+    savings_type: Optional[str] = None
+    cost_savings: Optional[float] = None
+    time_saved_hours: Optional[float] = None
+    time_saved_minutes: Optional[float] = None
+    evaluation_notes: Optional[str] = None
+    assigned_to_tech: Optional[bool] = False
+    tech_person_name: Optional[str] = None
+
+
+class CIBatchEvaluationItem(CIEvaluation):
+    idea_id: str
+
+
+class CIBatchEvaluation(BaseModel):
+    evaluations: List[CIBatchEvaluationItem]
+
+
+class BestIdeaSelection(BaseModel):
+    idea_id: str
+    is_best_idea: bool
+
+
+class Idea(IdeaBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    idea_number: str
+    status: str
+    submitted_by: str
+    submitted_by_username: str
+    assigned_approver: Optional[str] = None
+    assigned_approver_username: Optional[str] = None
+    created_at: str
+    updated_at: str
+    is_quick_win: Optional[bool] = None
+    complexity_level: Optional[str] = None
+    savings_type: Optional[str] = None
+    cost_savings: Optional[float] = None
+    time_saved_hours: Optional[float] = None
+    time_saved_minutes: Optional[float] = None
+    evaluation_notes: Optional[str] = None
+    assigned_to_tech: Optional[bool] = False
+    tech_person_name: Optional[str] = None
+    is_best_idea: Optional[bool] = False
+    evaluated_by: Optional[str] = None
+    evaluated_by_username: Optional[str] = None
+    evaluated_at: Optional[str] = None
+    is_evaluated: Optional[bool] = False
+    is_archived: Optional[bool] = False
+    attachment_count: int = 0
+
+
+class IdeaBatchRequest(BaseModel):
+    ids: List[str]
+
+
+class IdeaBatchItem(BaseModel):
+    id: str
+    found: bool
+    idea: Optional[Idea] = None
+
+
+class IdeaBatchResponse(BaseModel):
+    results: List[IdeaBatchItem]
+
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None
+    path: str
+    params: Dict[str, Union[str, List[str]]] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
+
+
+class CommentBase(BaseModel):
+    comment_text: str
+
+
+class Comment(CommentBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    idea_id: str
+    user_id: str
+    username: str
+    created_at: str
+
+
+class CommentPage(BaseModel):
+    items: List[Comment]
+    total: int
+    offset: int
+    limit: int
+    has_more: bool
+
+
+class EvaluationInfo(BaseModel):
+    is_evaluated: bool = False
+    evaluated_by: Optional[str] = None
+    evaluated_by_username: Optional[str] = None
+    evaluated_at: Optional[str] = None
+    is_quick_win: Optional[bool] = None
+    complexity_level: Optional[str] = None
+    savings_type: Optional[str] = None
+    cost_savings: Optional[float] = None
+    time_saved_hours: Optional[float] = None
+    time_saved_minutes: Optional[float] = None
+    evaluation_notes: Optional[str] = None
+    assigned_to_tech: Optional[bool] = False
+    tech_person_name: Optional[str] = None
+
+
+class IdeaDetailResponse(BaseModel):
+    idea: Idea
+    comments: CommentPage
+    evaluation: EvaluationInfo
+    allowed_actions: List[str]
+
+
+class Attachment(BaseModel):
+    id: str
+    idea_id: str
+    filename: str
+    content_type: str
+    size_bytes: int
+    sha256: str
+    has_thumbnail: bool = False
+    uploaded_by: Optional[str] = None
+    uploaded_by_username: Optional[str] = None
+    created_at: str
+
+
+class IdeaAction(BaseModel):
+    comment: Optional[str] = None
+
+
+class DepartmentBase(BaseModel):
+    name: str
+    pillar: str
+
+
+class Department(DepartmentBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+
+
+class PillarBase(BaseModel):
+    name: str
+
+
+class Pillar(PillarBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+
+
+class TeamBase(BaseModel):
+    name: str
+    pillar: str
+    department: str
+
+
+class Team(TeamBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+
+
+class TechPersonBase(BaseModel):
+    name: str
+    email: Optional[str] = None
+    specialization: Optional[str] = None
+
+
+class TechPerson(TechPersonBase):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+
+
+class DashboardStats(BaseModel):
+    total_ideas: int
+    pending_ideas: int
+    approved_ideas: int
+    declined_ideas: int
+    revision_requested_ideas: int
+    my_ideas: int
+
+
+class CIStatusUpdate(BaseModel):
+    new_status: str
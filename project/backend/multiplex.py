@@ -0,0 +1,88 @@
+"""
+In-process dispatch of batched GET sub-requests (POST /api/batch) through the app's own ASGI stack.
+The caller's profile travels in scope["state"]["batch_user"], so sub-requests are not authenticated again.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORWARDED_HEADERS = {b"authorization", b"accept-language", b"user-agent", b"x-forwarded-for", b"x-real-ip"}
+DROPPED_RESPONSE_HEADERS = {"content-length", "transfer-encoding", "connection"}
+
+
+def sub_scope(parent: Dict[str, Any], path: str, query_string: bytes, user: dict) -> Dict[str, Any]:
+    headers = [(k, v) for k, v in parent.get("headers", []) if k in FORWARDED_HEADERS]
+    headers.append((b"accept", b"application/json"))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": parent.get("root_path", ""),
+        "query_string": query_string,
+        "headers": headers,
+        "client": parent.get("client"),
+        "server": parent.get("server"),
+        "state": {"batch_user": user},
+    }
+
+
+async def dispatch(app, scope: Dict[str, Any]) -> Tuple[int, Dict[str, str], Any]:
+    start: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+    complete = asyncio.Event()
+    requested = False
+    dropped = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal dropped
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            if json_response(start.get("headers", [])):
+                chunks.append(message.get("body", b""))
+            elif message.get("body"):
+                dropped = True
+            if not message.get("more_body", False):
+                complete.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        logger.exception(f"Batched request to {scope['path']} failed")
+        if not start:
+            return 500, {}, {"detail": "Internal Server Error"}
+    finally:
+        complete.set()
+
+    if dropped:
+        return 406, {}, {"detail": "Only JSON responses can be batched"}
+
+    headers = {}
+    for key, value in start.get("headers", []):
+        name = key.decode("latin-1").lower()
+        if name not in DROPPED_RESPONSE_HEADERS:
+            headers[name] = value.decode("latin-1")
+    return start.get("status", 500), headers, decode_body(b"".join(chunks))
+
+
+def json_response(headers: List[Tuple[bytes, bytes]]) -> bool:
+    return any(key.lower() == b"content-type" and value.startswith(b"application/json") for key, value in headers)
+
+
+def decode_body(body: bytes) -> Any:
+    return json.loads(body) if body else None
@@ -0,0 +1,86 @@
+"""
+bcrypt hashing and verification in a bounded process pool, off the event loop.
+Unknown logins are checked against a dummy hash so timing does not reveal which usernames exist.
+"""
+import asyncio
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import config
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+_contexts = {}
+_dummy_hashes = {}
+_pool: Optional[ProcessPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+_slots_loop = None
+
+
+def get_context(rounds: Optional[int] = None) -> "CryptContext":
+    rounds = rounds or config.BCRYPT_ROUNDS
+    context = _contexts.get(rounds)
+    if context is None:
+        from passlib.context import CryptContext
+
+        context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        _contexts[rounds] = context
+    return context
+
+
+def hash_sync(password: str, rounds: Optional[int] = None) -> str:
+    return get_context(rounds).hash(password)
+
+
+def verify_sync(password: str, hashed: str, rounds: Optional[int] = None) -> Tuple[bool, Optional[str]]:
+    context = get_context(rounds)
+    try:
+        valid = context.verify(password, hashed)
+    except (ValueError, TypeError):
+        return False, None
+    if valid and context.needs_update(hashed):
+        return True, context.hash(password)
+    return valid, None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS)
+    return _pool
+
+
+async def _run(fn, *args):
+    global _slots, _slots_loop
+    loop = asyncio.get_running_loop()
+    if _slots is None or _slots_loop is not loop:
+        _slots = asyncio.Semaphore(config.PASSWORD_HASH_QUEUE)
+        _slots_loop = loop
+    async with _slots:
+        return await loop.run_in_executor(_get_pool(), fn, *args)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(hash_sync, password, config.BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await _run(verify_sync, password, hashed, config.BCRYPT_ROUNDS)
+
+
+async def verify_unknown(password: str) -> None:
+    rounds = config.BCRYPT_ROUNDS
+    if rounds not in _dummy_hashes:
+        _dummy_hashes[rounds] = await _run(hash_sync, secrets.token_urlsafe(16), rounds)
+    await verify_password(password, _dummy_hashes[rounds])
+
+
+def shutdown() -> None:
+    global _pool, _slots, _slots_loop
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _slots = None
+    _slots_loop = None
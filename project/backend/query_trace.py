@@ -0,0 +1,159 @@
+import time
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+logger = logging.getLogger("query_trace")
+
+FILTER_METHODS = {
+    "eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+    "contains", "contained_by", "or_", "order", "limit", "range",
+}
+OPERATION_METHODS = {"select", "insert", "update", "upsert", "delete"}
+
+
+@dataclass
+class QueryRecord:
+    table: str
+    operation: str
+    filters: List[str]
+    rows: int
+    elapsed_ms: float
+
+    def describe(self) -> str:
+        filters = "&".join(self.filters)
+        return f"{self.operation} {self.table}{'?' + filters if filters else ''} rows={self.rows} {self.elapsed_ms:.1f}ms"
+
+
+@dataclass
+class QueryTrace:
+    label: str = ""
+    records: List[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(r.elapsed_ms for r in self.records)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+
+_current_trace: ContextVar[Optional[QueryTrace]] = ContextVar("query_trace", default=None)
+
+
+def start_trace(label: str = ""):
+    trace = QueryTrace(label=label)
+    token = _current_trace.set(trace)
+    return trace, token
+
+
+def end_trace(token) -> None:
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[QueryTrace]:
+    return _current_trace.get()
+
+
+def log_trace(trace: QueryTrace) -> None:
+    if not trace.records:
+        return
+    logger.info(f"{trace.label} queries={trace.count} db_ms={trace.total_ms:.1f}")
+    for record in trace.records:
+        logger.debug(f"{trace.label} {record.describe()}")
+
+
+def _record(table: str, operation: str, filters: List[str], result: Any, elapsed_ms: float) -> None:
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    data = getattr(result, "data", None)
+    if isinstance(data, list):
+        rows = len(data)
+    elif data:
+        rows = 1
+    else:
+        rows = 0
+    trace.records.append(QueryRecord(table, operation, list(filters), rows, elapsed_ms))
+
+
+def _format_filter(name: str, args: tuple, kwargs: dict) -> str:
+    name = name.rstrip("_")
+    if name == "order":
+        return f"order={args[0]}.{'desc' if kwargs.get('desc') else 'asc'}"
+    if name in ("limit", "range"):
+        return f"{name}={','.join(str(a) for a in args)}"
+    if len(args) >= 2:
+        return f"{args[0]}={name}.{args[1]}"
+    return f"{name}={','.join(str(a) for a in args)}"
+
+
+class TracedQuery:
+    def __init__(self, builder: Any, table: str, operation: str = "select", filters: Optional[List[str]] = None):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._filters = filters or []
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            operation = name if name in OPERATION_METHODS else self._operation
+            filters = self._filters
+            if name in FILTER_METHODS:
+                filters = filters + [_format_filter(name, args, kwargs)]
+            return TracedQuery(result, self._table, operation, filters)
+
+        return wrapper
+
+    def execute(self):
+        started = time.perf_counter()
+        result = self._builder.execute()
+        _record(self._table, self._operation, self._filters, result, (time.perf_counter() - started) * 1000)
+        return result
+
+
+class _TracedNamespace:
+    def __init__(self, target: Any, table: str):
+        self._target = target
+        self._table = table
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return _TracedNamespace(attr, f"{self._table}.{name}")
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = attr(*args, **kwargs)
+            _record(self._table, name, [], result, (time.perf_counter() - started) * 1000)
+            return result
+
+        return wrapper
+
+
+class TracedClient:
+    def __init__(self, client: Any):
+        self.client = client
+
+    def table(self, name: str) -> TracedQuery:
+        return TracedQuery(self.client.table(name), name)
+
+    def rpc(self, name: str, params: dict) -> TracedQuery:
+        return TracedQuery(self.client.rpc(name, params), name, "rpc")
+
+    @property
+    def auth(self):
+        return _TracedNamespace(self.client.auth, "auth")
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
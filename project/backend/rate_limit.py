@@ -0,0 +1,166 @@
+"""
+Token-bucket rate limiting and load shedding for unauthenticated endpoints.
+MemoryBucketStore keeps buckets per process; SQLiteBucketStore shares them between workers on a host.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+DEFAULT_LIMITS = {
+    "login:ip": "30/60",
+    "login:username": "5/60",
+    "register:ip": "10/600",
+    "register:username": "5/600",
+    "register:email": "5/600",
+    "refresh:ip": "60/60",
+    "forgot_password:ip": "10/600",
+    "forgot_password:email": "3/3600",
+}
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: float
+    period: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        capacity, period = spec.split("/")
+        return cls(float(capacity), float(period))
+
+
+def load_limits(environ=os.environ) -> Dict[str, Limit]:
+    limits = {}
+    for name, default in DEFAULT_LIMITS.items():
+        env_name = "RATE_LIMIT_" + name.replace(":", "_").upper()
+        limits[name] = Limit.parse(environ.get(env_name, default))
+    return limits
+
+
+def _refill(tokens: float, updated: float, now: float, limit: Limit) -> float:
+    return min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+
+
+def _take(tokens: float, limit: Limit, cost: float):
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / limit.refill_per_second
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit, cost: float = 1.0) -> float:
+        with self.lock:
+            now = self.clock()
+            tokens, updated = self.buckets.pop(key, (limit.capacity, now))
+            tokens, retry_after = _take(_refill(tokens, updated, now, limit), limit, cost)
+            self.buckets[key] = (tokens, now)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+            return retry_after
+
+    def prune(self, older_than: float) -> None:
+        with self.lock:
+            cutoff = self.clock() - older_than
+            for key in [key for key, (_, updated) in self.buckets.items() if updated < cutoff]:
+                del self.buckets[key]
+
+    def reset(self) -> None:
+        with self.lock:
+            self.buckets.clear()
+
+
+class SQLiteBucketStore:
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self.local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def take(self, key: str, limit: Limit, cost: float = 1.0) -> float:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self.clock()
+            row = conn.execute("SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (limit.capacity, now)
+            tokens, retry_after = _take(_refill(tokens, updated, now, limit), limit, cost)
+            conn.execute("INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                         (key, tokens, now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def prune(self, older_than: float) -> None:
+        self._connect().execute("DELETE FROM rate_limit_buckets WHERE updated < ?", (self.clock() - older_than,))
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM rate_limit_buckets")
+
+
+class RateLimiter:
+    def __init__(self, store, limits: Dict[str, Limit], enabled: bool = True):
+        self.store = store
+        self.limits = limits
+        self.enabled = enabled
+
+    def hit(self, name: str, key: Optional[str]) -> float:
+        if not self.enabled or not key or name not in self.limits:
+            return 0.0
+        return self.store.take(f"{name}:{key.lower()}", self.limits[name])
+
+    def prune(self) -> None:
+        # A bucket idle for a full period has refilled and is the same as a missing one.
+        self.store.prune(max((limit.period for limit in self.limits.values()), default=0.0))
+
+    def reset(self) -> None:
+        self.store.reset()
+
+
+class InflightLimiter:
+    def __init__(self, max_inflight: int):
+        self.max_inflight = max_inflight
+        self.inflight = 0
+
+    def try_acquire(self) -> bool:
+        if self.max_inflight and self.inflight >= self.max_inflight:
+            return False
+        self.inflight += 1
+        return True
+
+    def release(self) -> None:
+        self.inflight = max(0, self.inflight - 1)
+
+
+def create_rate_limiter(store: str = "memory", sqlite_path: str = "rate_limits.db", enabled: bool = True) -> RateLimiter:
+    if store == "sqlite":
+        return RateLimiter(SQLiteBucketStore(sqlite_path), load_limits(), enabled)
+    if store == "memory":
+        return RateLimiter(MemoryBucketStore(), load_limits(), enabled)
+    raise ValueError(f"Unknown RATE_LIMIT_STORE: {store}")
@@ -0,0 +1,72 @@
+"""
+Single-flight cache for expensive dashboard reads, kept for READ_CACHE_TTL_SECONDS.
+Writes to ideas in this worker bump the version, which invalidates every cached result.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import config
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+INVALIDATING_PREFIXES = ("/api/ideas", "/api/admin")
+READ_ONLY_PATHS = {"/api/ideas/batch", "/api/batch"}
+
+
+class SingleFlightCache:
+    def __init__(self, ttl: float, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.version = 0
+        self.entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self.inflight: Dict[Tuple[Hashable, int], asyncio.Task] = {}
+        self.computations = 0
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self.entries.clear()
+
+    def clear(self) -> None:
+        self.invalidate()
+        self.inflight.clear()
+        self.computations = 0
+
+    def lookup(self, key: Hashable):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        version, expires, value = entry
+        if version != self.version or expires <= self.clock():
+            del self.entries[key]
+            return None
+        return entry
+
+    async def _compute(self, key: Hashable, version: int, compute: Callable[[], Any]) -> Any:
+        try:
+            self.computations += 1
+            value = await asyncio.to_thread(compute)
+        finally:
+            self.inflight.pop((key, version), None)
+        if self.ttl > 0 and version == self.version:
+            self.entries[key] = (version, self.clock() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    async def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self.lookup(key)
+        if entry is not None:
+            return entry[2]
+
+        flight = (key, self.version)
+        task = self.inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, self.version, compute))
+            self.inflight[flight] = task
+        return await asyncio.shield(task)
+
+
+cache = SingleFlightCache(config.READ_CACHE_TTL_SECONDS, config.READ_CACHE_MAX_ENTRIES)
@@ -0,0 +1,181 @@
+"""
+Background upstream probes; /api/health/ready only reads the cached snapshot.
+A worker is unready when a critical upstream fails, its p95 exceeds READINESS_P95_MS or the snapshot goes stale.
+"""
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger("readiness")
+
+
+def percentile(values: Iterable[float], pct: float) -> Optional[float]:
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class UpstreamStatus:
+    def __init__(self, name: str, window: int, critical: bool):
+        self.name = name
+        self.critical = critical
+        self.latencies = deque(maxlen=window)
+        self.ok: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def record(self, ok: bool, latency_ms: float, error: Optional[str] = None) -> None:
+        self.ok = ok
+        self.error = error
+        self.latencies.append(latency_ms)
+        self.checked_at = datetime.now(timezone.utc).isoformat()
+        self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+
+    @property
+    def p95_ms(self) -> Optional[float]:
+        return percentile(self.latencies, 95)
+
+    def as_dict(self) -> dict:
+        p95 = self.p95_ms
+        return {
+            "ok": self.ok,
+            "critical": self.critical,
+            "last_ms": round(self.latencies[-1], 1) if self.latencies else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "samples": len(self.latencies),
+            "consecutive_failures": self.consecutive_failures,
+            "error": self.error,
+            "checked_at": self.checked_at,
+        }
+
+
+class HealthMonitor:
+    def __init__(self, probes: Dict[str, Callable[[], None]], interval: float, timeout: float,
+                 p95_threshold_ms: float, window: int = 30, critical: Iterable[str] = (), enabled: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        critical = set(critical)
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self.p95_threshold_ms = p95_threshold_ms
+        self.enabled = enabled
+        self.clock = clock
+        self.statuses = {name: UpstreamStatus(name, window, name in critical) for name in probes}
+        self.refreshed_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def probe(self, name: str, fn: Callable[[], None]) -> None:
+        started = self.clock()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(fn), self.timeout)
+            ok, error = True, None
+        except asyncio.TimeoutError:
+            ok, error = False, f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            ok, error = False, str(e) or type(e).__name__
+        self.statuses[name].record(ok, (self.clock() - started) * 1000, error)
+        if not ok:
+            logger.warning(f"Readiness probe {name} failed: {error}")
+
+    async def refresh(self) -> None:
+        await asyncio.gather(*(self.probe(name, fn) for name, fn in self.probes.items()))
+        self.refreshed_at = self.clock()
+
+    async def run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.enabled and self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+    def readiness(self) -> Tuple[bool, List[str]]:
+        if not self.enabled:
+            return True, []
+        if self.refreshed_at is None:
+            return False, ["probes have not completed yet"]
+        reasons = []
+        if self.clock() - self.refreshed_at > 3 * self.interval + self.timeout:
+            reasons.append("probe results are stale")
+        for status in self.statuses.values():
+            if not status.critical:
+                continue
+            p95 = status.p95_ms
+            if status.ok is False:
+                reasons.append(f"{status.name} failing: {status.error}")
+            elif p95 is not None and p95 > self.p95_threshold_ms:
+                reasons.append(f"{status.name} p95 {p95:.0f}ms exceeds {self.p95_threshold_ms:.0f}ms")
+        return not reasons, reasons
+
+    def snapshot(self) -> dict:
+        ready, reasons = self.readiness()
+        return {
+            "status": "ready" if ready else "unready",
+            "reasons": reasons,
+            "probes_enabled": self.enabled,
+            "age_s": round(self.clock() - self.refreshed_at, 1) if self.refreshed_at is not None else None,
+            "upstreams": {name: status.as_dict() for name, status in self.statuses.items()},
+        }
+
+
+def storage_probe() -> None:
+    from core import db
+
+    db.table("pillars").select("id").limit(1).execute()
+
+
+def auth_probe() -> None:
+    from core import db
+
+    if config.AUTH_MODE == "local" or config.STORAGE_BACKEND != "supabase":
+        db.table("credentials").select("id").limit(1).execute()
+        return
+
+    import httpx
+
+    response = httpx.get(f"{config.SUPABASE_URL}/auth/v1/health", headers={"apikey": config.SUPABASE_KEY or ""},
+                         timeout=config.HEALTH_PROBE_TIMEOUT)
+    response.raise_for_status()
+
+
+def mail_probe() -> None:
+    import httpx
+
+    response = httpx.get(config.MAIL_HEALTH_URL, headers={"Authorization": f"Bearer {config.RESEND_API_KEY}"},
+                         timeout=config.HEALTH_PROBE_TIMEOUT)
+    response.raise_for_status()
+
+
+def create_monitor() -> HealthMonitor:
+    probes = {"storage": storage_probe, "auth": auth_probe}
+    if config.RESEND_API_KEY:
+        probes["mail"] = mail_probe
+    return HealthMonitor(
+        probes,
+        interval=config.HEALTH_PROBE_INTERVAL,
+        timeout=config.HEALTH_PROBE_TIMEOUT,
+        p95_threshold_ms=config.READINESS_P95_MS,
+        window=config.HEALTH_PROBE_WINDOW,
+        critical=config.READINESS_CRITICAL,
+        enabled=config.HEALTH_PROBES_ENABLED,
+    )
+
+
+monitor = create_monitor()
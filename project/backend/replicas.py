@@ -0,0 +1,94 @@
+"""
+Read-replica routing: core.read_db() sends heavy reads to SUPABASE_REPLICA_URL when it is set.
+Callers who have just written are pinned to the primary for REPLICA_PIN_SECONDS.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import config
+
+
+class MemoryPinStore:
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.pins: "OrderedDict[str, float]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def pin(self, key: str, seconds: float) -> None:
+        with self.lock:
+            self.pins.pop(key, None)
+            self.pins[key] = self.clock() + seconds
+            while len(self.pins) > self.max_keys:
+                self.pins.popitem(last=False)
+
+    def pinned(self, key: str) -> bool:
+        return self.pins.get(key, 0) > self.clock()
+
+    def prune(self) -> None:
+        with self.lock:
+            now = self.clock()
+            for key in [key for key, until in self.pins.items() if until < now]:
+                del self.pins[key]
+
+    def reset(self) -> None:
+        with self.lock:
+            self.pins.clear()
+
+
+class SQLitePinStore:
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self.local = threading.local()
+        self._connect().execute("CREATE TABLE IF NOT EXISTS replica_pins (key TEXT PRIMARY KEY, until REAL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def pin(self, key: str, seconds: float) -> None:
+        self._connect().execute("INSERT OR REPLACE INTO replica_pins (key, until) VALUES (?, ?)",
+                                (key, self.clock() + seconds))
+
+    def pinned(self, key: str) -> bool:
+        row = self._connect().execute("SELECT until FROM replica_pins WHERE key = ?", (key,)).fetchone()
+        return bool(row) and row[0] > self.clock()
+
+    def prune(self) -> None:
+        self._connect().execute("DELETE FROM replica_pins WHERE until < ?", (self.clock(),))
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM replica_pins")
+
+
+def create_pin_store(store: str = "memory", sqlite_path: str = "replica_pins.db"):
+    if store == "sqlite":
+        return SQLitePinStore(sqlite_path)
+    if store == "memory":
+        return MemoryPinStore()
+    raise ValueError(f"Unknown REPLICA_PIN_STORE: {store}")
+
+
+pins = create_pin_store(config.REPLICA_PIN_STORE, config.REPLICA_PIN_SQLITE_PATH)
+
+
+def enabled() -> bool:
+    return bool(config.SUPABASE_REPLICA_URL)
+
+
+def record_write(user_id: Optional[str]) -> None:
+    if user_id and enabled():
+        pins.pin(str(user_id), config.REPLICA_PIN_SECONDS)
+
+
+def use_primary(user: Optional[dict]) -> bool:
+    return not enabled() or (user is not None and pins.pinned(str(user["id"])))
@@ -0,0 +1,308 @@
+"""
+Timeouts, circuit breakers and hedged reads around upstream calls (UPSTREAM_TIMEOUTS, CIRCUIT_*, HEDGE_*).
+Writes and auth mutators are never abandoned on timeout; only selects are hedged.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+import config
+from readiness import percentile
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+WRITE_OPERATIONS = {"insert", "update", "upsert", "delete", "rpc"}
+AUTH_READS = {"sign_in_with_password"}
+
+
+class UpstreamUnavailable(Exception):
+    status_code = 503
+
+    def __init__(self, upstream: str, message: str):
+        super().__init__(message)
+        self.upstream = upstream
+
+
+class UpstreamTimeout(UpstreamUnavailable):
+    status_code = 504
+
+
+def load_timeouts(spec: Optional[str] = None) -> Dict[str, float]:
+    timeouts = {}
+    for item in (spec or "").split(","):
+        if item.strip():
+            kind, seconds = item.split("=")
+            timeouts[kind.strip()] = float(seconds)
+    return timeouts
+
+
+def is_failure(exc: BaseException) -> bool:
+    if isinstance(exc, (UpstreamUnavailable, TimeoutError, ConnectionError, OSError)):
+        return True
+    import httpx
+
+    if isinstance(exc, httpx.TransportError):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(exc, "code", None)
+    return isinstance(status, int) and status >= 500
+
+
+def is_timeout(exc: BaseException) -> bool:
+    import httpx
+
+    return isinstance(exc, (TimeoutError, httpx.TimeoutException))
+
+
+async def unavailable_handler(request: Request, exc: UpstreamUnavailable) -> JSONResponse:
+    headers = {"Retry-After": str(int(config.CIRCUIT_RESET_SECONDS))} if exc.status_code == 503 else None
+    return JSONResponse({"detail": str(exc)}, status_code=exc.status_code, headers=headers)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self.times_opened = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.consecutive_failures += 1
+            self.trial_running = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def release(self) -> None:
+        with self.lock:
+            self.trial_running = False
+
+
+class Upstream:
+    def __init__(self, name: str, timeouts: Dict[str, float], breaker: CircuitBreaker, executor: ThreadPoolExecutor,
+                 hedge: bool = False, hedge_min_samples: int = 20, hedge_min_delay: float = 0.05,
+                 window: int = 200, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.timeouts = timeouts
+        self.breaker = breaker
+        self.executor = executor
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.clock = clock
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self.counters: Dict[tuple, int] = defaultdict(int)
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        samples = self.latencies[kind]
+        if not self.hedge or kind != "select" or len(samples) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, percentile(samples, 95))
+
+    def call(self, kind: str, fn: Callable[[], Any]) -> Any:
+        if not self.breaker.allow():
+            self.counters[(kind, "rejected")] += 1
+            raise UpstreamUnavailable(self.name, f"{self.name} is unavailable (circuit open)")
+
+        timeout = None if kind == "write" else self.timeouts.get(kind, self.timeouts.get("default", 10.0))
+        started = self.clock()
+        futures = [self.executor.submit(fn)]
+        delay = self.hedge_delay(kind)
+        if delay is not None and delay < timeout:
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                futures.append(self.executor.submit(fn))
+                self.counters[(kind, "hedged")] += 1
+
+        remaining = None if timeout is None else max(0.0, started + timeout - self.clock())
+        done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            self.counters[(kind, "timeout")] += 1
+            self.breaker.record_failure()
+            raise UpstreamTimeout(self.name, f"{self.name} did not respond within {timeout:g}s")
+
+        winner = futures[0] if futures[0] in done else next(iter(done))
+        if winner is not futures[0]:
+            self.counters[(kind, "hedge_won")] += 1
+        try:
+            result = winner.result()
+        except Exception as exc:
+            if kind == "write" and is_timeout(exc):
+                self.counters[(kind, "timeout")] += 1
+                self.breaker.record_failure()
+                raise UpstreamTimeout(self.name, f"{self.name} did not confirm the write in time") from exc
+            if is_failure(exc):
+                self.counters[(kind, "error")] += 1
+                self.breaker.record_failure()
+            else:
+                self.counters[(kind, "ok")] += 1
+                self.breaker.release()
+            raise
+        self.counters[(kind, "ok")] += 1
+        self.latencies[kind].append(self.clock() - started)
+        self.breaker.record_success()
+        return result
+
+
+class ResilientQuery:
+    def __init__(self, builder: Any, upstream: Upstream, operation: str = "select"):
+        self._builder = builder
+        self._upstream = upstream
+        self._operation = operation
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            operation = name if name == "select" or name in WRITE_OPERATIONS else self._operation
+            return ResilientQuery(result, self._upstream, operation) if hasattr(result, "execute") else result
+
+        return wrapper
+
+    def execute(self):
+        kind = "write" if self._operation in WRITE_OPERATIONS else "select"
+        return self._upstream.call(kind, self._builder.execute)
+
+
+class _ResilientNamespace:
+    def __init__(self, target: Any, upstream: Upstream):
+        self._target = target
+        self._upstream = upstream
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return _ResilientNamespace(attr, self._upstream)
+
+        kind = "auth" if name in AUTH_READS else "write"
+
+        def wrapper(*args, **kwargs):
+            return self._upstream.call(kind, lambda: attr(*args, **kwargs))
+
+        return wrapper
+
+
+class ResilientClient:
+    def __init__(self, client: Any, postgrest: Upstream, auth: Upstream):
+        self.client = client
+        self.postgrest = postgrest
+        self.auth_upstream = auth
+
+    def table(self, name: str) -> ResilientQuery:
+        return ResilientQuery(self.client.table(name), self.postgrest)
+
+    def rpc(self, name: str, params: dict) -> ResilientQuery:
+        return ResilientQuery(self.client.rpc(name, params), self.postgrest, "rpc")
+
+    @property
+    def auth(self):
+        return _ResilientNamespace(self.client.auth, self.auth_upstream)
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
+
+
+class Registry:
+    def __init__(self, timeouts: Dict[str, float], failure_threshold: int, reset_seconds: float, workers: int,
+                 hedge: bool = False, hedge_min_samples: int = 20, hedge_min_delay: float = 0.05):
+        self.timeouts = timeouts
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.workers = workers
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.upstreams: Dict[str, Upstream] = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str) -> Upstream:
+        with self.lock:
+            if name not in self.upstreams:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upstream")
+                self.upstreams[name] = Upstream(
+                    name, self.timeouts, CircuitBreaker(self.failure_threshold, self.reset_seconds), self.executor,
+                    hedge=self.hedge and name.startswith("postgrest"), hedge_min_samples=self.hedge_min_samples,
+                    hedge_min_delay=self.hedge_min_delay,
+                )
+            return self.upstreams[name]
+
+    def wrap(self, client: Any, postgrest: str = "postgrest", auth: str = "auth") -> Any:
+        if getattr(client, "name", None) != "supabase":
+            return client
+        return ResilientClient(client, self.get(postgrest), self.get(auth))
+
+    def call(self, name: str, kind: str, fn: Callable[[], Any]) -> Any:
+        return self.get(name).call(kind, fn)
+
+    def prometheus(self) -> str:
+        lines = [
+            "# TYPE upstream_calls_total counter",
+            "# TYPE upstream_circuit_state gauge",
+            "# TYPE upstream_circuit_opened_total counter",
+            "# TYPE upstream_consecutive_failures gauge",
+            "# TYPE upstream_latency_p95_seconds gauge",
+        ]
+        for name, upstream in sorted(self.upstreams.items()):
+            for (kind, outcome), count in sorted(upstream.counters.items()):
+                lines.append(f'upstream_calls_total{{upstream="{name}",kind="{kind}",outcome="{outcome}"}} {count}')
+            breaker = upstream.breaker
+            lines.append(f'upstream_circuit_state{{upstream="{name}",state="{breaker.state}"}} '
+                         f'{STATE_VALUES[breaker.state]}')
+            lines.append(f'upstream_circuit_opened_total{{upstream="{name}"}} {breaker.times_opened}')
+            lines.append(f'upstream_consecutive_failures{{upstream="{name}"}} {breaker.consecutive_failures}')
+            for kind, samples in sorted(upstream.latencies.items()):
+                if samples:
+                    lines.append(f'upstream_latency_p95_seconds{{upstream="{name}",kind="{kind}"}} '
+                                 f'{percentile(samples, 95):.6f}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self.lock:
+            self.upstreams.clear()
+
+
+registry = Registry(
+    load_timeouts(config.UPSTREAM_TIMEOUTS),
+    config.CIRCUIT_FAILURE_THRESHOLD,
+    config.CIRCUIT_RESET_SECONDS,
+    config.UPSTREAM_WORKERS,
+    hedge=config.HEDGE_READS,
+    hedge_min_samples=config.HEDGE_MIN_SAMPLES,
+    hedge_min_delay=config.HEDGE_MIN_DELAY_MS / 1000,
+)
@@ -0,0 +1,121 @@
+"""
+Revocation list for stateless tokens, keyed by subject (access:, refresh:) or by refresh token (jti:).
+A Bloom filter answers the common never-revoked case; entries expire with the tokens they reject.
+"""
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import config
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    def __init__(self, capacity: int = 10_000, error_rate: float = 0.001, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.clock = clock
+        self.entries: Dict[str, Tuple[float, float]] = {}
+        self.next_expiry = math.inf
+        self.filter = BloomFilter(capacity, error_rate)
+        self.lock = threading.Lock()
+
+    def _rebuild(self) -> None:
+        now = self.clock()
+        self.entries = {k: v for k, v in self.entries.items() if v[1] > now}
+        self.next_expiry = min((v[1] for v in self.entries.values()), default=math.inf)
+        self.capacity = max(self.capacity, 2 * len(self.entries))
+        self.filter = BloomFilter(self.capacity, self.error_rate)
+        for key in self.entries:
+            self.filter.add(key)
+
+    def revoke(self, key: str, ttl: float, at: Optional[float] = None) -> None:
+        now = self.clock()
+        revoked_at = now if at is None else at
+        with self.lock:
+            previous_at, previous_expiry = self.entries.get(key, (-math.inf, 0.0))
+            expires_at = max(previous_expiry, now + ttl)
+            self.entries[key] = (max(previous_at, revoked_at), expires_at)
+            self.next_expiry = min(self.next_expiry, expires_at)
+            if len(self.entries) > self.capacity:
+                self._rebuild()
+            else:
+                self.filter.add(key)
+
+    def is_revoked(self, key: str, issued_at: float) -> bool:
+        if self.next_expiry <= self.clock():
+            self.prune()
+        if key not in self.filter:
+            return False
+        entry = self.entries.get(key)
+        return entry is not None and issued_at < entry[0]
+
+    def prune(self) -> None:
+        with self.lock:
+            if self.next_expiry <= self.clock():
+                self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.entries = {}
+            self.next_expiry = math.inf
+            self.filter = BloomFilter(self.capacity, self.error_rate)
+
+
+revocations = RevocationList(config.REVOCATION_CAPACITY, config.REVOCATION_ERROR_RATE)
+
+
+def access_ttl() -> float:
+    return config.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+def refresh_ttl() -> float:
+    return config.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+def revoke_access(user_id: str) -> None:
+    revocations.revoke(f"access:{user_id}", access_ttl())
+
+
+def revoke_sessions(user_id: str) -> None:
+    revoke_access(user_id)
+    revocations.revoke(f"refresh:{user_id}", refresh_ttl())
+
+
+def revoke_refresh_token(jti: str) -> None:
+    revocations.revoke(f"jti:{jti}", refresh_ttl(), at=math.inf)
+
+
+def access_revoked(payload: dict) -> bool:
+    return revocations.is_revoked(f"access:{payload['sub']}", payload.get("iat", 0))
+
+
+def refresh_revoked(payload: dict) -> bool:
+    return (revocations.is_revoked(f"jti:{payload.get('jti')}", payload.get("iat", 0))
+            or revocations.is_revoked(f"refresh:{payload['sub']}", payload.get("iat", 0)))
@@ -0,0 +1,343 @@
+import re
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, File, Query, Response
+
+import revocation
+from core import db, read_db, get_current_user, get_admin_user, create_auth_user
+from models import UserBase, User, DepartmentBase, Department, PillarBase, Pillar, TeamBase, Team, TechPersonBase, TechPerson
+
+router = APIRouter(prefix="/api")
+
+DEMO_USERNAMES = ["admin", "approver1", "user1"]
+USER_SEARCH_COLUMNS = ["username", "first_name", "last_name", "email"]
+SEARCH_UNSAFE = re.compile(r'[,()*"]')
+LIKE_WILDCARDS = re.compile(r'([\\%_])')
+
+
+@router.get("/public/pillars", response_model=List[Pillar])
+async def get_public_pillars():
+    result = read_db().table("pillars").select("*").execute()
+    return [Pillar(id=str(p["id"]), name=p["name"]) for p in result.data]
+
+
+@router.get("/public/departments", response_model=List[Department])
+async def get_public_departments(pillar: Optional[str] = None):
+    query = read_db().table("departments").select("*")
+    if pillar:
+        query = query.eq("pillar", pillar)
+    result = query.execute()
+    return [Department(id=str(d["id"]), name=d["name"], pillar=d["pillar"]) for d in result.data]
+
+
+@router.get("/public/teams", response_model=List[Team])
+async def get_public_teams(pillar: Optional[str] = None, department: Optional[str] = None):
+    query = read_db().table("teams").select("*")
+    if pillar:
+        query = query.eq("pillar", pillar)
+    if department:
+        query = query.eq("department", department)
+    result = query.execute()
+    return [Team(id=str(t["id"]), name=t["name"], pillar=t["pillar"], department=t["department"]) for t in result.data]
+
+
+@router.get("/admin/users", response_model=List[User])
+async def get_users(
+    response: Response,
+    role: Optional[str] = None,
+    sub_role: Optional[str] = None,
+    pillar: Optional[str] = None,
+    department: Optional[str] = None,
+    team: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_admin_user)
+):
+    query = read_db(current_user).table("profiles").select("*", count="exact")
+    for username in DEMO_USERNAMES:
+        query = query.neq("username", username)
+    if role:
+        query = query.eq("role", role)
+    if sub_role:
+        query = query.eq("sub_role", sub_role)
+    if pillar:
+        query = query.eq("pillar", pillar)
+    if department:
+        query = query.eq("department", department)
+    if team:
+        query = query.eq("team", team)
+    search = LIKE_WILDCARDS.sub(r"\\\1", SEARCH_UNSAFE.sub("", q or "").strip())
+    if search:
+        query = query.or_(",".join(f"{column}.ilike.{search}*" for column in USER_SEARCH_COLUMNS))
+
+    result = query.order("username").range(offset, offset + limit - 1).execute()
+    response.headers["X-Total-Count"] = str(result.count or 0)
+    users = result.data
+    return [User(
+        id=str(u["id"]),
+        username=u["username"],
+        email=u["email"],
+        first_name=u.get("first_name"),
+        last_name=u.get("last_name"),
+        role=u["role"],
+        sub_role=u.get("sub_role"),
+        department=u.get("department"),
+        team=u.get("team"),
+        pillar=u.get("pillar"),
+        manager=u.get("manager"),
+        approved_pillars=u.get("approved_pillars") or [],
+        approved_departments=u.get("approved_departments") or [],
+        created_at=u["created_at"]
+    ) for u in users]
+
+
+@router.put("/admin/users/{user_id}", response_model=User)
+async def update_user(user_id: str, user_data: UserBase, current_user: dict = Depends(get_admin_user)):
+    update_doc = {
+        "username": user_data.username,
+        "email": user_data.email,
+        "role": user_data.role,
+        "department": user_data.department,
+        "team": user_data.team,
+        "pillar": user_data.pillar,
+        "manager": user_data.manager,
+        "approved_pillars": user_data.approved_pillars if user_data.role == "approver" else [],
+        "approved_departments": user_data.approved_departments if user_data.role == "approver" else []
+    }
+
+    result = db.table("profiles").update(update_doc).eq("id", user_id).execute()
+
+    if not result.data:
+        raise HTTPException(status_code=404, detail="User not found")
+    revocation.revoke_access(user_id)
+
+    updated = result.data[0]
+    return User(
+        id=str(updated["id"]),
+        username=updated["username"],
+        email=updated["email"],
+        first_name=updated.get("first_name"),
+        last_name=updated.get("last_name"),
+        role=updated["role"],
+        sub_role=updated.get("sub_role"),
+        department=updated.get("department"),
+        team=updated.get("team"),
+        pillar=updated.get("pillar"),
+        manager=updated.get("manager"),
+        approved_pillars=updated.get("approved_pillars") or [],
+        approved_departments=updated.get("approved_departments") or [],
+        created_at=updated["created_at"]
+    )
+
+
+@router.post("/admin/users/bulk-upload")
+async def bulk_upload_users(file: bytes = File(...), current_user: dict = Depends(get_admin_user)):
+    import csv
+    import io
+
+    try:
+        csv_content = file.decode('utf-8')
+        csv_reader = csv.DictReader(io.StringIO(csv_content))
+
+        created_users = []
+        errors = []
+
+        for row_num, row in enumerate(csv_reader, start=2):
+            try:
+                if not row.get('username') or not row.get('email') or not row.get('password'):
+                    errors.append(f"Row {row_num}: Missing required fields (username, email, password)")
+                    continue
+
+                existing = db.table("profiles").select("id").eq("username", row['username']).maybeSingle().execute()
+                if existing.data:
+                    errors.append(f"Row {row_num}: Username '{row['username']}' already exists")
+                    continue
+
+                user_id = await create_auth_user(row['email'], row['password'], row['username'], row.get('role', 'user'))
+                if not user_id:
+                    errors.append(f"Row {row_num}: Failed to create auth user")
+                    continue
+
+                approved_pillars = row.get('approved_pillars', '').split(';') if row.get('approved_pillars') else []
+                approved_departments = row.get('approved_departments', '').split(';') if row.get('approved_departments') else []
+
+                profile_doc = {
+                    "id": user_id,
+                    "username": row['username'],
+                    "email": row['email'],
+                    "role": row.get('role', 'user'),
+                    "department": row.get('department', ''),
+                    "team": row.get('team', ''),
+                    "pillar": row.get('pillar', ''),
+                    "manager": row.get('manager', ''),
+                    "approved_pillars": approved_pillars,
+                    "approved_departments": approved_departments,
+                    "created_at": datetime.now(timezone.utc).isoformat()
+                }
+
+                db.table("profiles").insert(profile_doc).execute()
+                created_users.append(row['username'])
+            except Exception as e:
+                errors.append(f"Row {row_num}: {str(e)}")
+
+        return {
+            "message": f"Bulk upload completed. Created {len(created_users)} users.",
+            "created_users": created_users,
+            "errors": errors
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to process file: {str(e)}")
+
+
+@router.delete("/admin/users/{user_id}")
+async def delete_user(user_id: str, current_user: dict = Depends(get_admin_user)):
+    user_result = db.table("profiles").select("username").eq("id", user_id).maybeSingle().execute()
+    if user_result.data and user_result.data.get("username") in DEMO_USERNAMES:
+        raise HTTPException(status_code=403, detail="Cannot delete demo accounts")
+
+    result = db.table("profiles").delete().eq("id", user_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="User not found")
+    revocation.revoke_sessions(user_id)
+    return {"message": "User deleted successfully"}
+
+
+@router.get("/admin/departments", response_model=List[Department])
+async def get_departments(pillar: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    query = read_db(current_user).table("departments").select("*")
+    if pillar:
+        query = query.eq("pillar", pillar)
+    result = query.execute()
+    return [Department(id=str(d["id"]), name=d["name"], pillar=d["pillar"]) for d in result.data]
+
+
+@router.post("/admin/departments", response_model=Department)
+async def create_department(dept_data: DepartmentBase, current_user: dict = Depends(get_admin_user)):
+    dept_doc = {"name": dept_data.name, "pillar": dept_data.pillar}
+    result = db.table("departments").insert(dept_doc).execute()
+    created = result.data[0]
+    return Department(id=str(created["id"]), name=created["name"], pillar=created["pillar"])
+
+
+@router.delete("/admin/departments/{dept_id}")
+async def delete_department(dept_id: str, current_user: dict = Depends(get_admin_user)):
+    result = db.table("departments").delete().eq("id", dept_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return {"message": "Department deleted successfully"}
+
+
+@router.get("/admin/pillars", response_model=List[Pillar])
+async def get_pillars(current_user: dict = Depends(get_current_user)):
+    result = read_db(current_user).table("pillars").select("*").execute()
+    return [Pillar(id=str(p["id"]), name=p["name"]) for p in result.data]
+
+
+@router.post("/admin/pillars", response_model=Pillar)
+async def create_pillar(pillar_data: PillarBase, current_user: dict = Depends(get_admin_user)):
+    pillar_doc = {"name": pillar_data.name}
+    result = db.table("pillars").insert(pillar_doc).execute()
+    created = result.data[0]
+    return Pillar(id=str(created["id"]), name=created["name"])
+
+
+@router.delete("/admin/pillars/{pillar_id}")
+async def delete_pillar(pillar_id: str, current_user: dict = Depends(get_admin_user)):
+    result = db.table("pillars").delete().eq("id", pillar_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Pillar not found")
+    return {"message": "Pillar deleted successfully"}
+
+
+@router.get("/admin/teams", response_model=List[Team])
+async def get_teams(pillar: Optional[str] = None, department: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    query = read_db(current_user).table("teams").select("*")
+    if pillar:
+        query = query.eq("pillar", pillar)
+    if department:
+        query = query.eq("department", department)
+    result = query.execute()
+    return [Team(id=str(t["id"]), name=t["name"], pillar=t["pillar"], department=t["department"]) for t in result.data]
+
+
+@router.post("/admin/teams", response_model=Team)
+async def create_team(team_data: TeamBase, current_user: dict = Depends(get_admin_user)):
+    team_doc = {"name": team_data.name, "pillar": team_data.pillar, "department": team_data.department}
+    result = db.table("teams").insert(team_doc).execute()
+    created = result.data[0]
+    return Team(id=str(created["id"]), name=created["name"], pillar=created["pillar"], department=created["department"])
+
+
+@router.delete("/admin/teams/{team_id}")
+async def delete_team(team_id: str, current_user: dict = Depends(get_admin_user)):
+    result = db.table("teams").delete().eq("id", team_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return {"message": "Team deleted successfully"}
+
+
+@router.get("/admin/tech-persons", response_model=List[TechPerson])
+async def get_tech_persons(current_user: dict = Depends(get_current_user)):
+    result = read_db(current_user).table("tech_persons").select("*").execute()
+    return [TechPerson(
+        id=str(p["id"]),
+        name=p["name"],
+        email=p.get("email"),
+        specialization=p.get("specialization")
+    ) for p in result.data]
+
+
+@router.post("/admin/tech-persons", response_model=TechPerson)
+async def create_tech_person(person_data: TechPersonBase, current_user: dict = Depends(get_admin_user)):
+    person_doc = {
+        "name": person_data.name,
+        "email": person_data.email,
+        "specialization": person_data.specialization
+    }
+    result = db.table("tech_persons").insert(person_doc).execute()
+    created = result.data[0]
+    return TechPerson(
+        id=str(created["id"]),
+        name=created["name"],
+        email=created.get("email"),
+        specialization=created.get("specialization")
+    )
+
+
+@router.delete("/admin/tech-persons/{person_id}")
+async def delete_tech_person(person_id: str, current_user: dict = Depends(get_admin_user)):
+    result = db.table("tech_persons").delete().eq("id", person_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Tech person not found")
+    return {"message": "Tech person deleted successfully"}
+
+
+@router.post("/admin/seed-data")
+async def seed_data(current_user: dict = Depends(get_admin_user)):
+    existing = db.table("pillars").select("id", count="exact").execute()
+    if existing.count and existing.count > 0:
+        return {"message": "Data already seeded"}
+
+    pillars = ["GBS", "Tech", "Finance", "HR"]
+    for pillar_name in pillars:
+        db.table("pillars").insert({"name": pillar_name}).execute()
+
+    departments = [
+        {"name": "Operations", "pillar": "GBS"},
+        {"name": "Technology", "pillar": "Tech"},
+        {"name": "Finance", "pillar": "Finance"},
+        {"name": "Human Resources", "pillar": "HR"}
+    ]
+    for dept in departments:
+        db.table("departments").insert(dept).execute()
+
+    teams = [
+        {"name": "Allowance Billing", "pillar": "GBS", "department": "Operations"},
+        {"name": "Pre-audit and AB", "pillar": "GBS", "department": "Operations"}
+    ]
+    for team in teams:
+        db.table("teams").insert(team).execute()
+
+    return {"message": "Sample data seeded successfully"}
@@ -0,0 +1,124 @@
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+
+import attachments
+import config
+from core import db, get_current_user
+from models import Attachment
+
+router = APIRouter(prefix="/api")
+
+
+def format_attachment(row: dict) -> Attachment:
+    return Attachment(
+        id=str(row["id"]),
+        idea_id=str(row["idea_id"]),
+        filename=row["filename"],
+        content_type=row["content_type"],
+        size_bytes=int(row["size_bytes"]),
+        sha256=row["sha256"],
+        has_thumbnail=bool(row.get("thumbnail_key")),
+        uploaded_by=str(row["uploaded_by"]) if row.get("uploaded_by") else None,
+        uploaded_by_username=row.get("uploaded_by_username"),
+        created_at=row["created_at"]
+    )
+
+
+def get_attachment_row(attachment_id: str) -> dict:
+    result = db.table("idea_attachments").select("*").eq("id", attachment_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return result.data
+
+
+@router.post("/ideas/{idea_id}/attachments", response_model=Attachment)
+async def upload_attachment(
+    idea_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    filename: str = Query(..., min_length=1, max_length=255),
+    current_user: dict = Depends(get_current_user)
+):
+    idea = db.table("ideas").select("id, submitted_by").eq("id", idea_id).maybeSingle().execute().data
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    if str(idea["submitted_by"]) != str(current_user["id"]) and current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to add attachments to this idea")
+
+    name = Path(filename.replace("\\", "/")).name.strip()
+    if not name:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > config.ATTACHMENT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Attachments are limited to {config.ATTACHMENT_MAX_BYTES} bytes")
+
+    attachment_id = str(uuid.uuid4())
+    key = f"{idea_id}/{attachment_id}"
+    try:
+        size, digest = await attachments.save(key, request.stream(), config.ATTACHMENT_MAX_BYTES)
+    except attachments.TooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if size == 0:
+        attachments.delete_objects([{"storage_key": key}])
+        raise HTTPException(status_code=400, detail="Empty upload")
+
+    content_type = (request.headers.get("content-type") or "application/octet-stream").split(";")[0].strip()
+    row = db.table("idea_attachments").insert({
+        "id": attachment_id,
+        "idea_id": idea_id,
+        "filename": name,
+        "content_type": content_type,
+        "size_bytes": size,
+        "sha256": digest,
+        "storage_key": key,
+        "uploaded_by": current_user["id"],
+        "uploaded_by_username": current_user["username"],
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }).execute().data[0]
+    attachments.refresh_count(db, idea_id)
+
+    if attachments.wants_thumbnail(row):
+        background_tasks.add_task(attachments.create_thumbnail, db, row)
+    return format_attachment(row)
+
+
+@router.get("/ideas/{idea_id}/attachments", response_model=List[Attachment])
+async def list_attachments(idea_id: str, current_user: dict = Depends(get_current_user)):
+    result = db.table("idea_attachments").select("*").eq("idea_id", idea_id).order("created_at").execute()
+    return [format_attachment(row) for row in result.data]
+
+
+@router.get("/attachments/{attachment_id}")
+async def download_attachment(
+    attachment_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user: dict = Depends(get_current_user)
+):
+    return attachments.download_response(get_attachment_row(attachment_id), range_header)
+
+
+@router.get("/attachments/{attachment_id}/thumbnail")
+async def get_thumbnail(attachment_id: str, current_user: dict = Depends(get_current_user)):
+    row = get_attachment_row(attachment_id)
+    if not row.get("thumbnail_key"):
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+    data = await run_in_threadpool(attachments.store.read, row["thumbnail_key"])
+    return Response(data, media_type="image/png", headers={"Cache-Control": "private, max-age=86400"})
+
+
+@router.delete("/attachments/{attachment_id}")
+async def delete_attachment(attachment_id: str, current_user: dict = Depends(get_current_user)):
+    row = get_attachment_row(attachment_id)
+    if str(row.get("uploaded_by")) != str(current_user["id"]) and current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to delete this attachment")
+
+    db.table("idea_attachments").delete().eq("id", attachment_id).execute()
+    attachments.refresh_count(db, row["idea_id"])
+    await run_in_threadpool(attachments.delete_objects, [row])
+    return {"message": "Attachment deleted successfully"}
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Depends
+
+import config
+import revocation
+from core import (
+    db, get_current_user, get_current_profile, enforce_rate_limit, auth_guard, access_claims, create_access_token,
+    create_refresh_token, decode_refresh_token, create_reset_token, verify_reset_token, create_auth_user,
+    check_password, set_password, send_email_async,
+)
+from models import (
+    UserCreate, UserPasswordChange, ForgotPasswordRequest, ResetPasswordRequest, SubRoleSelection, UserLogin,
+    User, TokenResponse, RefreshRequest,
+)
+
+router = APIRouter(prefix="/api")
+
+
+@router.post("/auth/register", response_model=User, dependencies=[Depends(auth_guard("register"))])
+async def register(user_data: UserCreate):
+    enforce_rate_limit("register:username", user_data.username)
+    enforce_rate_limit("register:email", user_data.email)
+
+    existing = db.table("profiles").select("id").eq("username", user_data.username).maybeSingle().execute()
+    if existing.data:
+        raise HTTPException(status_code=400, detail="Username already exists")
+
+    existing_email = db.table("profiles").select("id").eq("email", user_data.email).maybeSingle().execute()
+    if existing_email.data:
+        raise HTTPException(status_code=400, detail="Email already exists")
+
+    try:
+        user_id = await create_auth_user(user_data.email, user_data.password, user_data.username, user_data.role)
+        if not user_id:
+            raise HTTPException(status_code=400, detail="Failed to create user")
+
+        profile_doc = {
+            "id": user_id,
+            "username": user_data.username,
+            "email": user_data.email,
+            "first_name": user_data.first_name,
+            "last_name": user_data.last_name,
+            "role": user_data.role,
+            "sub_role": user_data.sub_role,
+            "department": user_data.department,
+            "team": user_data.team,
+            "pillar": user_data.pillar,
+            "manager": user_data.manager,
+            "approved_pillars": user_data.approved_pillars or [],
+            "approved_departments": user_data.approved_departments or [],
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+
+        db.table("profiles").insert(profile_doc).execute()
+
+        return User(
+            id=str(user_id),
+            username=user_data.username,
+            email=user_data.email,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            role=user_data.role,
+            sub_role=user_data.sub_role,
+            department=user_data.department,
+            team=user_data.team,
+            pillar=user_data.pillar,
+            manager=user_data.manager,
+            approved_pillars=user_data.approved_pillars or [],
+            approved_departments=user_data.approved_departments or [],
+            created_at=profile_doc["created_at"]
+        )
+    except Exception as e:
+        logging.error(f"Registration error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/auth/login", response_model=TokenResponse, dependencies=[Depends(auth_guard("login"))])
+async def login(credentials: UserLogin):
+    enforce_rate_limit("login:username", credentials.username)
+
+    profile = db.table("profiles").select("*").eq("username", credentials.username).maybeSingle().execute()
+    user_profile = profile.data
+
+    if not await check_password(user_profile, credentials.password) or not user_profile:
+        raise HTTPException(status_code=401, detail="Incorrect username or password")
+
+    return token_response(user_profile)
+
+
+def token_response(user_profile: dict) -> TokenResponse:
+    return TokenResponse(
+        access_token=create_access_token(data=access_claims(user_profile)),
+        refresh_token=create_refresh_token(user_profile["id"]),
+        token_type="bearer",
+        expires_in=int(revocation.access_ttl()),
+        user=User(
+            id=str(user_profile["id"]),
+            username=user_profile["username"],
+            email=user_profile["email"],
+            first_name=user_profile.get("first_name"),
+            last_name=user_profile.get("last_name"),
+            role=user_profile["role"],
+            sub_role=user_profile.get("sub_role"),
+            department=user_profile.get("department"),
+            team=user_profile.get("team"),
+            pillar=user_profile.get("pillar"),
+            manager=user_profile.get("manager"),
+            approved_pillars=user_profile.get("approved_pillars") or [],
+            approved_departments=user_profile.get("approved_departments") or [],
+            created_at=user_profile["created_at"]
+        )
+    )
+
+
+@router.post("/auth/refresh", response_model=TokenResponse, dependencies=[Depends(auth_guard("refresh"))])
+async def refresh(request: RefreshRequest):
+    payload = decode_refresh_token(request.refresh_token)
+
+    profile = db.table("profiles").select("*").eq("id", payload["sub"]).maybeSingle().execute()
+    if not profile.data:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    revocation.revoke_refresh_token(payload["jti"])
+    return token_response(profile.data)
+
+
+@router.post("/auth/logout")
+async def logout(request: RefreshRequest):
+    try:
+        payload = decode_refresh_token(request.refresh_token)
+    except HTTPException:
+        return {"message": "Logged out"}
+    revocation.revoke_refresh_token(payload["jti"])
+    return {"message": "Logged out"}
+
+
+@router.get("/auth/me", response_model=User)
+async def get_me(current_user: dict = Depends(get_current_profile)):
+    return User(
+        id=str(current_user["id"]),
+        username=current_user["username"],
+        email=current_user["email"],
+        first_name=current_user.get("first_name"),
+        last_name=current_user.get("last_name"),
+        role=current_user["role"],
+        sub_role=current_user.get("sub_role"),
+        department=current_user.get("department"),
+        team=current_user.get("team"),
+        pillar=current_user.get("pillar"),
+        manager=current_user.get("manager"),
+        approved_pillars=current_user.get("approved_pillars") or [],
+        approved_departments=current_user.get("approved_departments") or [],
+        created_at=current_user["created_at"]
+    )
+
+
+@router.post("/auth/set-sub-role")
+async def set_sub_role(selection: SubRoleSelection, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "approver":
+        raise HTTPException(status_code=403, detail="Only approvers can set sub-role")
+
+    if selection.sub_role not in ["approver", "ci_excellence"]:
+        raise HTTPException(status_code=400, detail="Invalid sub-role")
+
+    db.table("profiles").update({"sub_role": selection.sub_role}).eq("id", current_user["id"]).execute()
+    revocation.revoke_access(current_user["id"])
+    token = create_access_token(data=access_claims({**current_user, "sub_role": selection.sub_role}))
+
+    return {"message": "Sub-role set successfully", "sub_role": selection.sub_role, "access_token": token}
+
+
+@router.post("/auth/change-password")
+async def change_password(password_data: UserPasswordChange, current_user: dict = Depends(get_current_profile)):
+    if not await check_password(current_user, password_data.current_password):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+
+    try:
+        await set_password(current_user["id"], current_user["email"], password_data.new_password)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    revocation.revoke_sessions(current_user["id"])
+    return {"message": "Password changed successfully", **token_response(current_user).model_dump()}
+
+
+@router.post("/auth/forgot-password", dependencies=[Depends(auth_guard("forgot_password"))])
+async def forgot_password(request: ForgotPasswordRequest):
+    enforce_rate_limit("forgot_password:email", request.email)
+
+    profile = db.table("profiles").select("*").eq("email", request.email).maybeSingle().execute()
+
+    if not profile.data:
+        return {"message": "If the email exists, a password reset link has been sent"}
+
+    user = profile.data
+    reset_token = create_reset_token(request.email)
+
+    reset_link = f"{config.FRONTEND_URL}/reset-password?token={reset_token}"
+
+    if config.RESEND_API_KEY:
+        html = f"""
+        <html>
+            <body>
+                <h2>Password Reset Request</h2>
+                <p>Hello {user['username']},</p>
+                <p>You requested to reset your password for Philtech Eye-dea.</p>
+                <p>Click the link below to reset your password (valid for 1 hour):</p>
+                <p><a href="{reset_link}">Reset Password</a></p>
+                <p>If you didn't request this, please ignore this email.</p>
+                <br>
+                <p>Best regards,<br>Philtech Eye-dea Team</p>
+            </body>
+        </html>
+        """
+        asyncio.create_task(send_email_async(request.email, "Password Reset Request", html))
+        return {
+            "message": "Password reset link has been sent to your email",
+            "note": "Using Resend test mode - emails only delivered to verified addresses",
+            "reset_link": reset_link
+        }
+    else:
+        return {
+            "message": "Password reset link generated (email service not configured)",
+            "reset_link": reset_link
+        }
+
+
+@router.post("/auth/reset-password")
+async def reset_password(request: ResetPasswordRequest):
+    email = verify_reset_token(request.token)
+
+    profile = db.table("profiles").select("id").eq("email", email).maybeSingle().execute()
+    if not profile.data:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    try:
+        await set_password(profile.data["id"], email, request.new_password)
+        revocation.revoke_sessions(profile.data["id"])
+        return {"message": "Password reset successfully. You can now login with your new password."}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
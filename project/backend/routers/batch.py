@@ -0,0 +1,53 @@
+import asyncio
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.routing import Match
+
+import config
+import multiplex
+from core import get_current_user
+from models import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+
+router = APIRouter(prefix="/api")
+
+UNBATCHABLE_ROUTES = {
+    "/api/attachments/{attachment_id}",
+    "/api/attachments/{attachment_id}/thumbnail",
+    "/api/dashboard/export",
+    "/api/dashboard/export-excel",
+    "/api/health/metrics",
+}
+
+
+def streams(app, scope: dict) -> bool:
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None) in UNBATCHABLE_ROUTES
+    return False
+
+
+async def run_sub_request(request: Request, sub: BatchSubRequest, index: int, user: dict) -> BatchSubResponse:
+    sub_id = sub.id if sub.id is not None else str(index)
+    path, _, query = sub.path.partition("?")
+    if not path.startswith("/api/") or path.startswith("/api/batch") or ".." in path:
+        return BatchSubResponse(id=sub_id, status=400, body={"detail": "Only GET routes under /api/ may be batched"})
+
+    query_string = "&".join(part for part in (query, urlencode(sub.params, doseq=True)) if part)
+    scope = multiplex.sub_scope(request.scope, path, query_string.encode(), user)
+    if streams(request.app, scope):
+        return BatchSubResponse(id=sub_id, status=400, body={"detail": "File and export routes cannot be batched"})
+    status, headers, body = await multiplex.dispatch(request.app, scope)
+    return BatchSubResponse(id=sub_id, status=status, headers=headers, body=body)
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(batch_request: BatchRequest, request: Request, current_user: dict = Depends(get_current_user)):
+    if len(batch_request.requests) > config.BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {config.BATCH_MAX_REQUESTS} requests per batch")
+
+    responses = await asyncio.gather(*(
+        run_sub_request(request, sub, index, current_user) for index, sub in enumerate(batch_request.requests)
+    ))
+    return BatchResponse(responses=list(responses))
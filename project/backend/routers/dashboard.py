@@ -0,0 +1,291 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+import archive
+import events
+import exports
+import leaderboards
+import read_cache
+import replicas
+import timeseries
+from core import db, read_db, get_current_user, format_idea
+from models import DashboardStats
+
+router = APIRouter(prefix="/api")
+
+
+def compute_stats() -> dict:
+    total_result = db.table("ideas").select("id", count="exact").execute()
+    archived_result = db.table("ideas_archive").select("id", count="exact").execute()
+    total = (total_result.count or 0) + (archived_result.count or 0)
+
+    pending_result = db.table("ideas").select("id", count="exact").eq("status", "pending").execute()
+    pending = pending_result.count or 0
+
+    approved_result = db.table("ideas").select("id", count="exact").eq("status", "approved").execute()
+    approved = approved_result.count or 0
+
+    declined_result = db.table("ideas").select("id", count="exact").eq("status", "declined").execute()
+    archived_declined_result = db.table("ideas_archive").select("id", count="exact").eq("status", "declined").execute()
+    declined = (declined_result.count or 0) + (archived_declined_result.count or 0)
+
+    revision_result = db.table("ideas").select("id", count="exact").eq("status", "revision_requested").execute()
+    revision = revision_result.count or 0
+
+    return {
+        "total_ideas": total,
+        "pending_ideas": pending,
+        "approved_ideas": approved,
+        "declined_ideas": declined,
+        "revision_requested_ideas": revision
+    }
+
+
+@router.get("/dashboard/stats", response_model=DashboardStats)
+async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+    stats = await read_cache.cache.get(("stats", "all"), compute_stats)
+
+    my_ideas_result = db.table("ideas").select("id", count="exact").eq("submitted_by", current_user["id"]).execute()
+    my_ideas = my_ideas_result.count or 0
+
+    return {**stats, "my_ideas": my_ideas}
+
+
+@router.get("/dashboard/analytics")
+async def get_dashboard_analytics(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if replicas.enabled() and replicas.use_primary(current_user):
+        return await run_in_threadpool(compute_analytics, db, start_date, end_date)
+    key = ("analytics", start_date, end_date, "all")
+    return await read_cache.cache.get(key, lambda: compute_analytics(read_db(), start_date, end_date))
+
+
+def compute_analytics(source, start_date: Optional[str], end_date: Optional[str]) -> dict:
+    def apply(query):
+        if start_date:
+            query = query.gte("created_at", start_date)
+        if end_date:
+            query = query.lte("created_at", end_date)
+        return query
+
+    ideas_data = archive.select_ideas(source, apply, archive.may_contain(start_date))
+
+    total_ideas = len(ideas_data)
+    declined_count = len([i for i in ideas_data if i.get("status") == "declined"])
+    approved_count = len([i for i in ideas_data if i.get("status") == "approved"])
+    implemented_count = len([i for i in ideas_data if i.get("status") == "implemented"])
+    assigned_to_te_count = len([i for i in ideas_data if i.get("status") == "assigned_to_te"])
+    pending_count = len([i for i in ideas_data if i.get("status") == "pending"])
+    revision_count = len([i for i in ideas_data if i.get("status") == "revision_requested"])
+
+    quick_wins_count = len([i for i in ideas_data if i.get("is_quick_win") == True])
+
+    low_complexity = len([i for i in ideas_data if i.get("complexity_level") == "Low"])
+    medium_complexity = len([i for i in ideas_data if i.get("complexity_level") == "Medium"])
+    high_complexity = len([i for i in ideas_data if i.get("complexity_level") == "High"])
+
+    if start_date or end_date:
+        best_idea = source.table("ideas").select("*").eq("is_best_idea", True).maybeSingle().execute().data
+        if not best_idea:
+            best_idea = source.table("ideas_archive").select("*").eq("is_best_idea", True).maybeSingle().execute().data
+    else:
+        best_idea = next((i for i in ideas_data if i.get("is_best_idea")), None)
+
+    total_cost_savings = sum(
+        float(i.get("cost_savings") or 0)
+        for i in ideas_data
+        if i.get("savings_type") == "cost_savings" and i.get("cost_savings")
+    )
+
+    total_hours = sum(
+        float(i.get("time_saved_hours") or 0)
+        for i in ideas_data
+        if i.get("savings_type") == "time_saved"
+    )
+    total_minutes = sum(
+        float(i.get("time_saved_minutes") or 0)
+        for i in ideas_data
+        if i.get("savings_type") == "time_saved"
+    )
+
+    total_hours += int(total_minutes // 60)
+    total_minutes = int(total_minutes % 60)
+
+    denominator = total_ideas - declined_count
+    approval_rate = (approved_count / denominator * 100) if denominator > 0 else 0
+    implementation_rate = (implemented_count / denominator * 100) if denominator > 0 else 0
+    assigned_to_te_rate = (assigned_to_te_count / denominator * 100) if denominator > 0 else 0
+
+    return {
+        "quick_wins_count": quick_wins_count,
+        "complexity_counts": {
+            "low": low_complexity,
+            "medium": medium_complexity,
+            "high": high_complexity
+        },
+        "best_idea": format_idea(best_idea) if best_idea else None,
+        "total_cost_savings": total_cost_savings,
+        "total_time_saved": {
+            "hours": int(total_hours),
+            "minutes": int(total_minutes)
+        },
+        "total_ideas": total_ideas,
+        "approved_count": approved_count,
+        "declined_count": declined_count,
+        "implemented_count": implemented_count,
+        "assigned_to_te_count": assigned_to_te_count,
+        "pending_count": pending_count,
+        "revision_count": revision_count,
+        "approval_rate": round(approval_rate, 2),
+        "implementation_rate": round(implementation_rate, 2),
+        "assigned_to_te_rate": round(assigned_to_te_rate, 2),
+        "charts_data": {
+            "complexity_chart": [
+                {"name": "Low Complexity", "value": low_complexity},
+                {"name": "Medium Complexity", "value": medium_complexity},
+                {"name": "High Complexity", "value": high_complexity}
+            ],
+            "quick_wins_chart": [
+                {"name": "Quick Wins", "value": quick_wins_count},
+                {"name": "Not Quick Wins", "value": low_complexity + medium_complexity + high_complexity}
+            ],
+            "status_chart": [
+                {"name": "Approved", "value": approved_count},
+                {"name": "Implemented", "value": implemented_count},
+                {"name": "Assigned to T&E", "value": assigned_to_te_count},
+                {"name": "Pending", "value": pending_count},
+                {"name": "Revision Requested", "value": revision_count},
+                {"name": "Declined", "value": declined_count}
+            ]
+        }
+    }
+
+
+@router.get("/dashboard/timeseries")
+async def get_dashboard_timeseries(
+    interval: str = "week",
+    split_by: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if interval not in timeseries.INTERVALS:
+        raise HTTPException(status_code=400, detail=f"Invalid interval. Must be one of: {list(timeseries.INTERVALS)}")
+    if split_by and split_by not in timeseries.SPLITS:
+        raise HTTPException(status_code=400, detail=f"Invalid split_by. Must be one of: {timeseries.SPLITS}")
+
+    try:
+        if replicas.enabled() and replicas.use_primary(current_user):
+            return await run_in_threadpool(compute_timeseries, db, interval, split_by, start_date, end_date)
+        key = ("timeseries", interval, split_by, start_date, end_date)
+        return await read_cache.cache.get(
+            key, lambda: compute_timeseries(read_db(), interval, split_by, start_date, end_date)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def compute_timeseries(source, interval: str, split_by: Optional[str], start_date: Optional[str],
+                       end_date: Optional[str]) -> dict:
+    def apply(query, column="created_at"):
+        if start_date:
+            query = query.gte(column, start_date)
+        if end_date:
+            query = query.lte(column, end_date)
+        return query
+
+    ideas_data = archive.select_ideas(source, apply, archive.may_contain(start_date), timeseries.IDEA_COLUMNS)
+    events_data = apply(source.table("idea_events").select(timeseries.EVENT_COLUMNS), "occurred_at").execute().data
+    return timeseries.build_timeseries(ideas_data, events_data, interval, split_by, start_date, end_date)
+
+
+@router.get("/dashboard/cycle-times")
+async def get_cycle_times(
+    group_by: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    pillar: Optional[str] = None,
+    department: Optional[str] = None,
+    approver_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] not in ["approver", "admin"]:
+        raise HTTPException(status_code=403, detail="Only approvers can view cycle times")
+    if group_by and group_by not in events.GROUPS:
+        raise HTTPException(status_code=400, detail=f"Invalid group_by. Must be one of: {list(events.GROUPS)}")
+
+    query = db.table("idea_events").select(
+        "from_status,to_status,pillar,department,approver_username,occurred_at,duration_seconds,age_seconds"
+    )
+    if start_date:
+        query = query.gte("occurred_at", start_date)
+    if end_date:
+        query = query.lte("occurred_at", end_date)
+    if pillar:
+        query = query.eq("pillar", pillar)
+    if department:
+        query = query.eq("department", department)
+    if approver_id:
+        query = query.eq("approver_id", approver_id)
+    rows = query.execute().data
+
+    return {
+        "group_by": group_by,
+        "start_date": start_date,
+        "end_date": end_date,
+        "event_count": len(rows),
+        "groups": events.cycle_times(rows, group_by)
+    }
+
+
+@router.get("/dashboard/leaderboards/{board}")
+async def get_leaderboard(
+    board: str,
+    period: str = "all",
+    at: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    if board not in leaderboards.BOARDS:
+        raise HTTPException(status_code=404, detail="Leaderboard not found")
+    if period not in leaderboards.PERIODS:
+        raise HTTPException(status_code=400, detail=f"Invalid period. Must be one of: {leaderboards.PERIODS}")
+    try:
+        moment = datetime.fromisoformat(at) if at else datetime.now(timezone.utc)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date")
+
+    period_key = leaderboards.period_key(period, moment)
+    return {
+        "board": board,
+        "period": period_key,
+        "entries": leaderboards.top(db, board, period_key, limit)
+    }
+
+
+@router.get("/dashboard/export")
+async def export_ideas(format: str = "xlsx", current_user: dict = Depends(get_current_user)):
+    if format not in exports.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Must be one of: {list(exports.FORMATS)}")
+
+    media_type, extension = exports.FORMATS[format]
+    headers = {"Content-Disposition": f"attachment; filename=philtech_eyedeas.{extension}"}
+    source = read_db(current_user)
+    if format == "csv":
+        return StreamingResponse(exports.stream_csv(source), media_type=media_type, headers=headers)
+    if format == "parquet":
+        return StreamingResponse(exports.stream_parquet(source), media_type=media_type, headers=headers)
+    excel_file = await run_in_threadpool(exports.build_xlsx, source)
+    return StreamingResponse(excel_file, media_type=media_type, headers=headers)
+
+
+@router.get("/dashboard/export-excel")
+async def export_ideas_excel(current_user: dict = Depends(get_current_user)):
+    return await export_ideas("xlsx", current_user)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+import readiness
+import resilience
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/health")
+async def health():
+    return {"status": "healthy", "service": "Philtech Eye-dea API"}
+
+
+@router.get("/health/live")
+async def live():
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def ready():
+    snapshot = readiness.monitor.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["status"] == "ready" else 503)
+
+
+@router.get("/health/metrics")
+async def metrics():
+    return PlainTextResponse(resilience.registry.prometheus(), media_type="text/plain; version=0.0.4")
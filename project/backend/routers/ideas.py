@@ -0,0 +1,319 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+
+import archive
+import attachments
+import changes
+import config
+import leaderboards
+from core import db, read_db, get_current_user, get_admin_user, send_email_async, format_idea
+from idempotency import idempotent
+from models import (
+    IdeaCreate, Idea, IdeaBatchRequest, IdeaBatchItem, IdeaBatchResponse, CommentBase, Comment, CommentPage,
+    EvaluationInfo, IdeaDetailResponse,
+)
+from routers.workflow import allowed_actions
+
+router = APIRouter(prefix="/api")
+
+
+async def generate_idea_number() -> str:
+    result = db.table("ideas").select("id", count="exact").execute()
+    archived = db.table("ideas_archive").select("id", count="exact").execute()
+    count = (result.count or 0) + (archived.count or 0)
+    return f"EYE-{str(count + 1).zfill(5)}"
+
+
+@router.get("/ideas", response_model=List[Idea])
+async def get_ideas(
+    status: Optional[str] = None,
+    pillar: Optional[str] = None,
+    department: Optional[str] = None,
+    team: Optional[str] = None,
+    submitted_by: Optional[str] = None,
+    assigned_approver: Optional[str] = None,
+    include_archived: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    def apply(query):
+        if status:
+            query = query.eq("status", status)
+        if pillar:
+            query = query.eq("pillar", pillar)
+        if department:
+            query = query.eq("department", department)
+        if team:
+            query = query.eq("team", team)
+        if submitted_by:
+            query = query.eq("submitted_by", submitted_by)
+        if assigned_approver:
+            query = query.eq("assigned_approver", assigned_approver)
+        return query.order("created_at", desc=True)
+
+    include_archived = include_archived and (not status or status in archive.CLOSED_STATUSES)
+    ideas = archive.select_ideas(read_db(current_user), apply, include_archived)
+    if include_archived:
+        ideas.sort(key=lambda i: i["created_at"], reverse=True)
+    return [format_idea(idea) for idea in ideas]
+
+
+@router.post("/ideas", response_model=Idea, dependencies=[Depends(idempotent)])
+async def create_idea(idea_data: IdeaCreate, current_user: dict = Depends(get_current_user)):
+    idea_number = await generate_idea_number()
+
+    approver_query = db.table("profiles").select("*").eq("role", "approver")
+    if idea_data.pillar:
+        approver_query = approver_query.contains("approved_pillars", [idea_data.pillar])
+    approver_result = approver_query.limit(1).execute()
+    approver = approver_result.data[0] if approver_result.data else None
+
+    if not approver and idea_data.department:
+        approver_result = db.table("profiles").select("*").eq("role", "approver").eq("department", idea_data.department).limit(1).execute()
+        approver = approver_result.data[0] if approver_result.data else None
+
+    if not approver:
+        approver_result = db.table("profiles").select("*").eq("role", "approver").limit(1).execute()
+        approver = approver_result.data[0] if approver_result.data else None
+
+    idea_doc = {
+        "idea_number": idea_number,
+        "pillar": idea_data.pillar,
+        "title": idea_data.title,
+        "improvement_type": idea_data.improvement_type,
+        "current_process": idea_data.current_process,
+        "suggested_solution": idea_data.suggested_solution,
+        "benefits": idea_data.benefits,
+        "target_completion": idea_data.target_completion,
+        "department": idea_data.department,
+        "team": idea_data.team,
+        "status": "pending",
+        "submitted_by": current_user["id"],
+        "submitted_by_username": current_user["username"],
+        "assigned_approver": approver["id"] if approver else None,
+        "assigned_approver_username": approver["username"] if approver else None,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    result = db.table("ideas").insert(idea_doc).execute()
+    created_idea = result.data[0]
+    leaderboards.update(db, None, created_idea)
+
+    if approver:
+        html = f"""
+        <html>
+            <body>
+                <h2>New Eye-dea Submitted for Approval</h2>
+                <p><strong>Idea Number:</strong> {idea_number}</p>
+                <p><strong>Title:</strong> {idea_data.title}</p>
+                <p><strong>Submitted By:</strong> {current_user['username']}</p>
+                <p><strong>Pillar:</strong> {idea_data.pillar}</p>
+                <p><strong>Department:</strong> {idea_data.department}</p>
+                <p>Please review and approve/decline this Eye-dea.</p>
+            </body>
+        </html>
+        """
+        asyncio.create_task(send_email_async(approver["email"], f"New Eye-dea: {idea_data.title}", html))
+
+    return format_idea(created_idea)
+
+
+@router.get("/ideas/changes")
+async def get_idea_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        page = changes.read_changes(db, since, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "changes": [format_idea(idea) for idea in page["ideas"]],
+        "deleted": [
+            {"id": row["id"], "idea_number": row.get("idea_number"), "deleted_at": row["deleted_at"]}
+            for row in page["deleted"]
+        ],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"]
+    }
+
+
+def fetch_batch(ids: List[str]) -> IdeaBatchResponse:
+    wanted = list(dict.fromkeys(i for i in ids if i))
+    if len(wanted) > config.IDEA_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {config.IDEA_BATCH_MAX_IDS} ids per request")
+
+    found = {}
+    if wanted:
+        found = {str(idea["id"]): idea for idea in db.table("ideas").select("*").in_("id", wanted).execute().data}
+    missing = [i for i in wanted if i not in found]
+    if missing:
+        archived = db.table("ideas_archive").select("*").in_("id", missing).execute().data
+        found.update((str(idea["id"]), idea) for idea in archived)
+
+    formatted = {idea_id: format_idea(idea) for idea_id, idea in found.items()}
+    return IdeaBatchResponse(results=[
+        IdeaBatchItem(id=i, found=i in formatted, idea=formatted.get(i)) for i in ids if i
+    ])
+
+
+@router.get("/ideas/batch", response_model=IdeaBatchResponse)
+async def get_ideas_batch(ids: List[str] = Query([]), current_user: dict = Depends(get_current_user)):
+    return fetch_batch([part.strip() for value in ids for part in value.split(",")])
+
+
+@router.post("/ideas/batch", response_model=IdeaBatchResponse)
+async def post_ideas_batch(batch: IdeaBatchRequest, current_user: dict = Depends(get_current_user)):
+    return fetch_batch(batch.ids)
+
+
+@router.get("/ideas/{idea_id}", response_model=Idea)
+async def get_idea(idea_id: str, current_user: dict = Depends(get_current_user)):
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        result = db.table("ideas_archive").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return format_idea(result.data)
+
+
+def fetch_archived_detail(idea_id: str):
+    idea = db.table("ideas_archive").select("*").eq("id", idea_id).maybeSingle().execute().data
+    if not idea:
+        return None, []
+    hot = db.table("comments").select("*").eq("idea_id", idea_id).order("created_at").execute().data
+    archived = db.table("comments_archive").select("*").eq("idea_id", idea_id).order("created_at").execute().data
+    return idea, sorted(archive.merge(hot, archived), key=lambda c: c["created_at"])
+
+
+@router.get("/ideas/{idea_id}/detail", response_model=IdeaDetailResponse)
+async def get_idea_detail(
+    idea_id: str,
+    comments_offset: int = Query(0, ge=0),
+    comments_limit: int = Query(50, ge=1, le=200),
+    current_user: dict = Depends(get_current_user)
+):
+    idea_query = db.table("ideas").select("*").eq("id", idea_id).maybeSingle()
+    comments_query = (db.table("comments").select("*", count="exact").eq("idea_id", idea_id).order("created_at")
+                      .range(comments_offset, comments_offset + comments_limit - 1))
+    idea_result, comments_result = await asyncio.gather(
+        run_in_threadpool(idea_query.execute), run_in_threadpool(comments_query.execute)
+    )
+
+    idea = idea_result.data
+    comments = comments_result.data
+    total = comments_result.count or 0
+    if not idea:
+        idea, all_comments = await run_in_threadpool(fetch_archived_detail, idea_id)
+        if not idea:
+            raise HTTPException(status_code=404, detail="Idea not found")
+        total = len(all_comments)
+        comments = all_comments[comments_offset:comments_offset + comments_limit]
+
+    formatted = format_idea(idea)
+    return IdeaDetailResponse(
+        idea=formatted,
+        comments=CommentPage(
+            items=[format_comment(c) for c in comments],
+            total=total,
+            offset=comments_offset,
+            limit=comments_limit,
+            has_more=comments_offset + len(comments) < total
+        ),
+        evaluation=EvaluationInfo(**formatted.model_dump(include=set(EvaluationInfo.model_fields))),
+        allowed_actions=allowed_actions(idea, current_user)
+    )
+
+
+@router.put("/ideas/{idea_id}", response_model=Idea)
+async def update_idea(idea_id: str, idea_data: IdeaCreate, current_user: dict = Depends(get_current_user)):
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+    if str(idea["submitted_by"]) != str(current_user["id"]) and current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to update this idea")
+
+    update_doc = {
+        "pillar": idea_data.pillar,
+        "title": idea_data.title,
+        "improvement_type": idea_data.improvement_type,
+        "current_process": idea_data.current_process,
+        "suggested_solution": idea_data.suggested_solution,
+        "benefits": idea_data.benefits,
+        "target_completion": idea_data.target_completion,
+        "department": idea_data.department,
+        "team": idea_data.team,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    updated_result = db.table("ideas").update(update_doc).eq("id", idea_id).eq("status", idea["status"]).execute()
+    if not updated_result.data:
+        raise HTTPException(status_code=409, detail="Idea was changed by another request. Please reload and try again.")
+    leaderboards.update(db, idea, updated_result.data[0])
+    return format_idea(updated_result.data[0])
+
+
+@router.delete("/ideas/{idea_id}")
+async def delete_idea(idea_id: str, current_user: dict = Depends(get_admin_user)):
+    result = db.table("ideas").delete().eq("id", idea_id).execute()
+    if result.data:
+        db.table("comments").delete().eq("idea_id", idea_id).execute()
+        await attachments.purge(db, idea_id)
+        leaderboards.update(db, result.data[0], None)
+        changes.tombstone(db, result.data[0], current_user)
+        return {"message": "Idea deleted successfully"}
+    result = db.table("ideas_archive").delete().eq("id", idea_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    db.table("comments_archive").delete().eq("idea_id", idea_id).execute()
+    await attachments.purge(db, idea_id)
+    leaderboards.update(db, result.data[0], None)
+    changes.tombstone(db, result.data[0], current_user)
+    return {"message": "Idea deleted successfully"}
+
+
+def format_comment(c: dict) -> Comment:
+    return Comment(
+        id=str(c["id"]),
+        idea_id=str(c["idea_id"]),
+        user_id=str(c["user_id"]),
+        username=c["username"],
+        comment_text=c["comment_text"],
+        created_at=c["created_at"]
+    )
+
+
+@router.get("/ideas/{idea_id}/comments", response_model=List[Comment])
+async def get_comments(idea_id: str, include_archived: bool = False, current_user: dict = Depends(get_current_user)):
+    result = db.table("comments").select("*").eq("idea_id", idea_id).order("created_at").execute()
+    comments = result.data
+    if include_archived:
+        archived = db.table("comments_archive").select("*").eq("idea_id", idea_id).order("created_at").execute()
+        comments = sorted(archive.merge(comments, archived.data), key=lambda c: c["created_at"])
+    return [format_comment(c) for c in comments]
+
+
+@router.post("/ideas/{idea_id}/comments", response_model=Comment, dependencies=[Depends(idempotent)])
+async def add_comment(idea_id: str, comment_data: CommentBase, current_user: dict = Depends(get_current_user)):
+    idea_result = db.table("ideas").select("id").eq("id", idea_id).maybeSingle().execute()
+    if not idea_result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    comment_doc = {
+        "idea_id": idea_id,
+        "user_id": current_user["id"],
+        "username": current_user["username"],
+        "comment_text": comment_data.comment_text,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    result = db.table("comments").insert(comment_doc).execute()
+    return format_comment(result.data[0])
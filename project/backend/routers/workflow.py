@@ -0,0 +1,444 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Depends
+
+import config
+import events
+import leaderboards
+from core import db, get_current_user, send_email_async, send_email_batch_async
+from idempotency import idempotent
+from models import CIEvaluation, CIBatchEvaluation, BestIdeaSelection, IdeaAction, CIStatusUpdate
+
+router = APIRouter(prefix="/api")
+
+
+def transition(idea: dict, update_doc: dict) -> dict:
+    result = db.table("ideas").update(update_doc).eq("id", idea["id"]).eq("status", idea["status"]).execute()
+    if not result.data:
+        raise HTTPException(status_code=409, detail="Idea was changed by another request. Please reload and try again.")
+    return result.data[0]
+
+
+@router.post("/ideas/{idea_id}/approve", dependencies=[Depends(idempotent)])
+async def approve_idea(idea_id: str, action: IdeaAction, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] == "approver" and current_user.get("sub_role") == "ci_excellence":
+        raise HTTPException(status_code=403, detail="C.I. Excellence Team cannot approve ideas. Only evaluate approved ideas.")
+    if current_user["role"] not in ["approver", "admin"]:
+        raise HTTPException(status_code=403, detail="Only approvers can approve ideas")
+
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+
+    now = datetime.now(timezone.utc).isoformat()
+    update_doc = events.status_update(idea, "approved", now)
+    updated = transition(idea, update_doc)
+    events.record(db, idea, "approve", "approved", current_user, now)
+    leaderboards.update(db, idea, updated)
+
+    if action.comment:
+        db.table("comments").insert({
+            "idea_id": idea_id,
+            "user_id": current_user["id"],
+            "username": current_user["username"],
+            "comment_text": action.comment,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }).execute()
+
+    if idea.get("submitted_by"):
+        submitter_result = db.table("profiles").select("*").eq("id", idea["submitted_by"]).maybeSingle().execute()
+        if submitter_result.data:
+            submitter = submitter_result.data
+            html = f"""
+            <html>
+                <body>
+                    <h2>Your Eye-dea Has Been Approved!</h2>
+                    <p><strong>Idea Number:</strong> {idea['idea_number']}</p>
+                    <p><strong>Title:</strong> {idea['title']}</p>
+                    <p><strong>Approved By:</strong> {current_user['username']}</p>
+                    {f'<p><strong>Comment:</strong> {action.comment}</p>' if action.comment else ''}
+                </body>
+            </html>
+            """
+            asyncio.create_task(send_email_async(submitter["email"], f"Eye-dea Approved: {idea['title']}", html))
+
+    return {"message": "Idea approved successfully"}
+
+
+@router.post("/ideas/{idea_id}/decline", dependencies=[Depends(idempotent)])
+async def decline_idea(idea_id: str, action: IdeaAction, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] == "approver" and current_user.get("sub_role") == "ci_excellence":
+        raise HTTPException(status_code=403, detail="C.I. Excellence Team cannot decline ideas")
+    if current_user["role"] not in ["approver", "admin"]:
+        raise HTTPException(status_code=403, detail="Only approvers can decline ideas")
+
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+
+    now = datetime.now(timezone.utc).isoformat()
+    update_doc = events.status_update(idea, "declined", now)
+    updated = transition(idea, update_doc)
+    events.record(db, idea, "decline", "declined", current_user, now)
+    leaderboards.update(db, idea, updated)
+
+    if action.comment:
+        db.table("comments").insert({
+            "idea_id": idea_id,
+            "user_id": current_user["id"],
+            "username": current_user["username"],
+            "comment_text": action.comment,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }).execute()
+
+    if idea.get("submitted_by"):
+        submitter_result = db.table("profiles").select("*").eq("id", idea["submitted_by"]).maybeSingle().execute()
+        if submitter_result.data:
+            submitter = submitter_result.data
+            html = f"""
+            <html>
+                <body>
+                    <h2>Your Eye-dea Has Been Declined</h2>
+                    <p><strong>Idea Number:</strong> {idea['idea_number']}</p>
+                    <p><strong>Title:</strong> {idea['title']}</p>
+                    <p><strong>Declined By:</strong> {current_user['username']}</p>
+                    {f'<p><strong>Comment:</strong> {action.comment}</p>' if action.comment else ''}
+                </body>
+            </html>
+            """
+            asyncio.create_task(send_email_async(submitter["email"], f"Eye-dea Declined: {idea['title']}", html))
+
+    return {"message": "Idea declined successfully"}
+
+
+@router.post("/ideas/{idea_id}/request-revision", dependencies=[Depends(idempotent)])
+async def request_revision(idea_id: str, action: IdeaAction, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] == "approver" and current_user.get("sub_role") == "ci_excellence":
+        raise HTTPException(status_code=403, detail="C.I. Excellence Team cannot request revisions")
+    if current_user["role"] not in ["approver", "admin"]:
+        raise HTTPException(status_code=403, detail="Only approvers can request revisions")
+
+    if not action.comment:
+        raise HTTPException(status_code=400, detail="Comment is required for revision requests")
+
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+
+    now = datetime.now(timezone.utc).isoformat()
+    update_doc = events.status_update(idea, "revision_requested", now)
+    updated = transition(idea, update_doc)
+    events.record(db, idea, "request_revision", "revision_requested", current_user, now)
+    leaderboards.update(db, idea, updated)
+
+    db.table("comments").insert({
+        "idea_id": idea_id,
+        "user_id": current_user["id"],
+        "username": current_user["username"],
+        "comment_text": action.comment,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }).execute()
+
+    if idea.get("submitted_by"):
+        submitter_result = db.table("profiles").select("*").eq("id", idea["submitted_by"]).maybeSingle().execute()
+        if submitter_result.data:
+            submitter = submitter_result.data
+            html = f"""
+            <html>
+                <body>
+                    <h2>Revision Requested for Your Eye-dea</h2>
+                    <p><strong>Idea Number:</strong> {idea['idea_number']}</p>
+                    <p><strong>Title:</strong> {idea['title']}</p>
+                    <p><strong>Requested By:</strong> {current_user['username']}</p>
+                    <p><strong>Comment:</strong> {action.comment}</p>
+                    <p>Please revise and resubmit your Eye-dea.</p>
+                </body>
+            </html>
+            """
+            asyncio.create_task(send_email_async(submitter["email"], f"Revision Requested: {idea['title']}", html))
+
+    return {"message": "Revision requested successfully"}
+
+
+@router.post("/ideas/{idea_id}/resubmit", dependencies=[Depends(idempotent)])
+async def resubmit_idea(idea_id: str, current_user: dict = Depends(get_current_user)):
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+    if str(idea["submitted_by"]) != str(current_user["id"]):
+        raise HTTPException(status_code=403, detail="Not authorized to resubmit this idea")
+
+    now = datetime.now(timezone.utc).isoformat()
+    update_doc = events.status_update(idea, "pending", now)
+    updated = transition(idea, update_doc)
+    events.record(db, idea, "resubmit", "pending", current_user, now)
+    leaderboards.update(db, idea, updated)
+
+    if idea.get("assigned_approver"):
+        approver_result = db.table("profiles").select("*").eq("id", idea["assigned_approver"]).maybeSingle().execute()
+        if approver_result.data:
+            approver = approver_result.data
+            html = f"""
+            <html>
+                <body>
+                    <h2>Eye-dea Resubmitted for Review</h2>
+                    <p><strong>Idea Number:</strong> {idea['idea_number']}</p>
+                    <p><strong>Title:</strong> {idea['title']}</p>
+                    <p><strong>Submitted By:</strong> {current_user['username']}</p>
+                    <p>This Eye-dea has been revised and resubmitted for your review.</p>
+                </body>
+            </html>
+            """
+            asyncio.create_task(send_email_async(approver["email"], f"Eye-dea Resubmitted: {idea['title']}", html))
+
+    return {"message": "Idea resubmitted successfully"}
+
+
+def is_ci_evaluator(current_user: dict) -> bool:
+    return current_user["role"] == "admin" or (
+        current_user["role"] == "approver" and current_user.get("sub_role") == "ci_excellence"
+    )
+
+
+def require_ci_evaluator(current_user: dict) -> None:
+    if not is_ci_evaluator(current_user):
+        raise HTTPException(status_code=403, detail="Only C.I. Excellence Team can evaluate ideas")
+
+
+def allowed_actions(idea: dict, current_user: dict) -> List[str]:
+    if idea.get("archived_at"):
+        return []
+    status = idea.get("status")
+    is_owner = str(idea.get("submitted_by")) == str(current_user["id"])
+    is_admin = current_user["role"] == "admin"
+    reviewer = is_admin or (current_user["role"] == "approver" and current_user.get("sub_role") != "ci_excellence")
+
+    actions = ["comment"]
+    if (is_owner or is_admin) and status in ("pending", "revision_requested"):
+        actions.append("edit")
+    if is_owner or is_admin:
+        actions.append("add_attachment")
+    if reviewer and status == "pending":
+        actions += ["approve", "decline", "request_revision"]
+    if is_owner and status == "revision_requested":
+        actions.append("resubmit")
+    if is_ci_evaluator(current_user):
+        if status == "approved":
+            actions.append("ci_evaluate")
+        if status == "assigned_to_te":
+            actions.append("ci_update_status")
+        actions.append("mark_best_idea")
+    if is_admin:
+        actions.append("delete")
+    return actions
+
+
+def evaluation_update(idea: dict, evaluation: CIEvaluation, current_user: dict, now: str):
+    new_status = idea.get("status", "approved")
+    if evaluation.is_quick_win:
+        new_status = "implemented"
+    elif evaluation.assigned_to_tech and evaluation.tech_person_name:
+        new_status = "assigned_to_te"
+
+    update_doc = {
+        **events.status_update(idea, new_status, now),
+        "is_quick_win": evaluation.is_quick_win,
+        "evaluated_by": current_user["id"],
+        "evaluated_by_username": current_user["username"],
+        "evaluated_at": now
+    }
+
+    if not evaluation.is_quick_win:
+        update_doc["complexity_level"] = evaluation.complexity_level
+        update_doc["savings_type"] = evaluation.savings_type
+        update_doc["cost_savings"] = evaluation.cost_savings
+        update_doc["time_saved_hours"] = evaluation.time_saved_hours
+        update_doc["time_saved_minutes"] = evaluation.time_saved_minutes
+        update_doc["evaluation_notes"] = evaluation.evaluation_notes
+        update_doc["assigned_to_tech"] = evaluation.assigned_to_tech
+        update_doc["tech_person_name"] = evaluation.tech_person_name
+
+    return new_status, update_doc
+
+
+def evaluation_email(idea: dict, evaluation: CIEvaluation, current_user: dict) -> str:
+    return f"""
+    <html>
+        <body>
+            <h2>Your Eye-dea Has Been Evaluated</h2>
+            <p><strong>Idea Number:</strong> {idea['idea_number']}</p>
+            <p><strong>Title:</strong> {idea['title']}</p>
+            <p><strong>Evaluated By:</strong> {current_user['username']} (C.I. Excellence Team)</p>
+            <p><strong>Quick Win:</strong> {'Yes' if evaluation.is_quick_win else 'No'}</p>
+            {f'<p><strong>Complexity Level:</strong> {evaluation.complexity_level}</p>' if not evaluation.is_quick_win else ''}
+        </body>
+    </html>
+    """
+
+
+@router.post("/ideas/ci-evaluate", dependencies=[Depends(idempotent)])
+async def ci_evaluate_ideas(batch: CIBatchEvaluation, current_user: dict = Depends(get_current_user)):
+    require_ci_evaluator(current_user)
+
+    idea_ids = [evaluation.idea_id for evaluation in batch.evaluations]
+    if len(idea_ids) > config.CI_EVALUATE_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {config.CI_EVALUATE_BATCH_MAX} evaluations per request")
+    if len(set(idea_ids)) != len(idea_ids):
+        raise HTTPException(status_code=400, detail="Each idea can only be evaluated once per request")
+    if not idea_ids:
+        return {"evaluated": [], "not_evaluated": [], "not_found": []}
+
+    ideas = {str(idea["id"]): idea for idea in db.table("ideas").select("*").in_("id", idea_ids).execute().data}
+
+    now = datetime.now(timezone.utc).isoformat()
+    updates, groups = {}, {}
+    for evaluation in batch.evaluations:
+        idea = ideas.get(evaluation.idea_id)
+        if idea is None:
+            continue
+        new_status, update_doc = evaluation_update(idea, evaluation, current_user, now)
+        updates[evaluation.idea_id] = (new_status, update_doc)
+        key = (idea["status"], json.dumps(update_doc, sort_keys=True, default=str))
+        groups.setdefault(key, (update_doc, []))[1].append(evaluation.idea_id)
+
+    written = {}
+    for (status, _), (update_doc, group_ids) in groups.items():
+        result = db.table("ideas").update(update_doc).in_("id", group_ids).eq("status", status).execute()
+        written.update((str(row["id"]), row) for row in result.data)
+
+    evaluated = [evaluation for evaluation in batch.evaluations if evaluation.idea_id in written]
+    event_rows, changes = [], []
+    for evaluation in evaluated:
+        idea = ideas[evaluation.idea_id]
+        new_status, _ = updates[evaluation.idea_id]
+        event_rows.append(events.event_row(idea, "ci_evaluate", new_status, current_user, now))
+        changes.append((idea, written[evaluation.idea_id]))
+
+    if evaluated:
+        events.record_many(db, event_rows)
+        leaderboards.update_many(db, changes)
+
+    submitter_ids = list({ideas[e.idea_id]["submitted_by"] for e in evaluated if ideas[e.idea_id].get("submitted_by")})
+    if submitter_ids and config.RESEND_API_KEY:
+        profiles = db.table("profiles").select("id,email").in_("id", submitter_ids).execute().data
+        emails = {str(profile["id"]): profile["email"] for profile in profiles}
+        messages = []
+        for evaluation in evaluated:
+            idea = ideas[evaluation.idea_id]
+            recipient = emails.get(str(idea.get("submitted_by")))
+            if recipient:
+                messages.append({
+                    "to": recipient,
+                    "subject": f"Eye-dea Evaluated: {idea['title']}",
+                    "html": evaluation_email(idea, evaluation, current_user),
+                })
+        asyncio.create_task(send_email_batch_async(messages))
+
+    return {
+        "evaluated": [evaluation.idea_id for evaluation in evaluated],
+        "not_evaluated": [idea_id for idea_id in idea_ids if idea_id in ideas and idea_id not in written],
+        "not_found": [idea_id for idea_id in idea_ids if idea_id not in ideas],
+    }
+
+
+@router.post("/ideas/{idea_id}/ci-evaluate", dependencies=[Depends(idempotent)])
+async def ci_evaluate_idea(idea_id: str, evaluation: CIEvaluation, current_user: dict = Depends(get_current_user)):
+    require_ci_evaluator(current_user)
+
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+    now = datetime.now(timezone.utc).isoformat()
+    new_status, update_doc = evaluation_update(idea, evaluation, current_user, now)
+
+    updated = transition(idea, update_doc)
+    events.record(db, idea, "ci_evaluate", new_status, current_user, now)
+    leaderboards.update(db, idea, updated)
+
+    if idea.get("submitted_by") and config.RESEND_API_KEY:
+        submitter_result = db.table("profiles").select("*").eq("id", idea["submitted_by"]).maybeSingle().execute()
+        if submitter_result.data:
+            submitter = submitter_result.data
+            html = evaluation_email(idea, evaluation, current_user)
+            asyncio.create_task(send_email_async(submitter["email"], f"Eye-dea Evaluated: {idea['title']}", html))
+
+    return {"message": "Idea evaluated successfully"}
+
+
+@router.post("/ideas/{idea_id}/set-best-idea", dependencies=[Depends(idempotent)])
+async def set_best_idea(idea_id: str, selection: BestIdeaSelection, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "approver" or current_user.get("sub_role") != "ci_excellence":
+        if current_user["role"] != "admin":
+            raise HTTPException(status_code=403, detail="Only C.I. Excellence Team can select best ideas")
+
+    now = datetime.now(timezone.utc).isoformat()
+    if selection.is_best_idea:
+        db.table("ideas").update({"is_best_idea": False, "updated_at": now}).eq("is_best_idea", True).neq("id", idea_id).execute()
+
+    db.table("ideas").update({
+        "is_best_idea": selection.is_best_idea,
+        "updated_at": now
+    }).eq("id", idea_id).execute()
+
+    return {"message": "Best idea status updated"}
+
+
+@router.post("/ideas/{idea_id}/mark-best-idea", dependencies=[Depends(idempotent)])
+async def mark_best_idea(idea_id: str, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "approver" or current_user.get("sub_role") != "ci_excellence":
+        if current_user["role"] != "admin":
+            raise HTTPException(status_code=403, detail="Only C.I. Excellence Team can select best ideas")
+
+    result = db.table("ideas").select("id").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    now = datetime.now(timezone.utc).isoformat()
+    db.table("ideas").update({"is_best_idea": False, "updated_at": now}).eq("is_best_idea", True).neq("id", idea_id).execute()
+
+    db.table("ideas").update({
+        "is_best_idea": True,
+        "updated_at": now
+    }).eq("id", idea_id).execute()
+
+    return {"message": "Idea marked as best Eye-dea"}
+
+
+@router.post("/ideas/{idea_id}/ci-update-status", dependencies=[Depends(idempotent)])
+async def ci_update_status(idea_id: str, status_update: CIStatusUpdate, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "approver" or current_user.get("sub_role") != "ci_excellence":
+        if current_user["role"] != "admin":
+            raise HTTPException(status_code=403, detail="Only C.I. Excellence Team can update idea status")
+
+    result = db.table("ideas").select("*").eq("id", idea_id).maybeSingle().execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    idea = result.data
+    if idea.get("status") != "assigned_to_te":
+        raise HTTPException(status_code=400, detail="Can only change status of ideas assigned to T&E")
+
+    valid_statuses = ["implemented", "revision_requested", "declined"]
+    if status_update.new_status not in valid_statuses:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
+
+    now = datetime.now(timezone.utc).isoformat()
+    update_doc = events.status_update(idea, status_update.new_status, now)
+    updated = transition(idea, update_doc)
+    events.record(db, idea, "ci_update_status", status_update.new_status, current_user, now)
+    leaderboards.update(db, idea, updated)
+
+    return {"message": f"Idea status updated to {status_update.new_status}"}
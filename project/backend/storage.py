@@ -0,0 +1,491 @@
+"""
+Storage backends behind the PostgREST-style query builder: SupabaseStorage and SQLiteStorage.
+Selected with STORAGE_BACKEND=supabase|sqlite; SQLite implies AUTH_MODE=local (core.local_auth).
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+TEXT, REAL, BOOL, JSON = "TEXT", "REAL", "BOOL", "JSON"
+
+COMPARISONS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+SCHEMA: Dict[str, Dict[str, str]] = {
+    "profiles": {
+        "id": TEXT, "username": TEXT, "email": TEXT, "first_name": TEXT, "last_name": TEXT,
+        "role": TEXT, "sub_role": TEXT, "department": TEXT, "team": TEXT, "pillar": TEXT,
+        "manager": TEXT, "approved_pillars": JSON, "approved_departments": JSON, "created_at": TEXT,
+    },
+    "ideas": {
+        "id": TEXT, "idea_number": TEXT, "pillar": TEXT, "title": TEXT, "improvement_type": TEXT,
+        "current_process": TEXT, "suggested_solution": TEXT, "benefits": TEXT, "target_completion": TEXT,
+        "department": TEXT, "team": TEXT, "status": TEXT, "submitted_by": TEXT,
+        "submitted_by_username": TEXT, "assigned_approver": TEXT, "assigned_approver_username": TEXT,
+        "created_at": TEXT, "updated_at": TEXT, "is_quick_win": BOOL, "complexity_level": TEXT,
+        "savings_type": TEXT, "cost_savings": REAL, "time_saved_hours": REAL, "time_saved_minutes": REAL,
+        "evaluation_notes": TEXT, "assigned_to_tech": BOOL, "tech_person_name": TEXT, "is_best_idea": BOOL,
+        "evaluated_by": TEXT, "evaluated_by_username": TEXT, "evaluated_at": TEXT, "status_changed_at": TEXT,
+        "attachment_count": REAL,
+    },
+    "comments": {
+        "id": TEXT, "idea_id": TEXT, "user_id": TEXT, "username": TEXT, "comment_text": TEXT, "created_at": TEXT,
+    },
+    "pillars": {"id": TEXT, "name": TEXT},
+    "departments": {"id": TEXT, "name": TEXT, "pillar": TEXT},
+    "teams": {"id": TEXT, "name": TEXT, "pillar": TEXT, "department": TEXT},
+    "tech_persons": {"id": TEXT, "name": TEXT, "email": TEXT, "specialization": TEXT},
+    "credentials": {"id": TEXT, "email": TEXT, "password_hash": TEXT, "updated_at": TEXT},
+    "idea_events": {
+        "id": TEXT, "idea_id": TEXT, "action": TEXT, "from_status": TEXT, "to_status": TEXT,
+        "actor_id": TEXT, "actor_username": TEXT, "pillar": TEXT, "department": TEXT,
+        "approver_id": TEXT, "approver_username": TEXT, "occurred_at": TEXT,
+        "duration_seconds": REAL, "age_seconds": REAL,
+    },
+    "idea_tombstones": {"id": TEXT, "idea_number": TEXT, "deleted_at": TEXT, "deleted_by": TEXT},
+    "leaderboard_counters": {
+        "id": TEXT, "board": TEXT, "period": TEXT, "subject": TEXT, "label": TEXT, "value": REAL, "updated_at": TEXT,
+    },
+    "idea_attachments": {
+        "id": TEXT, "idea_id": TEXT, "filename": TEXT, "content_type": TEXT, "size_bytes": REAL, "sha256": TEXT,
+        "storage_key": TEXT, "thumbnail_key": TEXT, "uploaded_by": TEXT, "uploaded_by_username": TEXT,
+        "created_at": TEXT,
+    },
+}
+SCHEMA["ideas_archive"] = {**SCHEMA["ideas"], "archived_at": TEXT}
+SCHEMA["comments_archive"] = {**SCHEMA["comments"], "archived_at": TEXT}
+
+INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS profiles_username_idx ON profiles (username)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS profiles_email_idx ON profiles (email)",
+    "CREATE INDEX IF NOT EXISTS profiles_role_idx ON profiles (role)",
+    "CREATE INDEX IF NOT EXISTS profiles_role_sub_role_username_idx ON profiles (role, sub_role, username)",
+    "CREATE INDEX IF NOT EXISTS profiles_pillar_username_idx ON profiles (pillar, username)",
+    "CREATE INDEX IF NOT EXISTS profiles_department_username_idx ON profiles (department, username)",
+    "CREATE INDEX IF NOT EXISTS profiles_team_username_idx ON profiles (team, username)",
+    "CREATE INDEX IF NOT EXISTS profiles_username_nocase_idx ON profiles (username COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS profiles_email_nocase_idx ON profiles (email COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS profiles_first_name_nocase_idx ON profiles (first_name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS profiles_last_name_nocase_idx ON profiles (last_name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS ideas_created_at_idx ON ideas (created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_status_created_at_idx ON ideas (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_pillar_created_at_idx ON ideas (pillar, created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_department_created_at_idx ON ideas (department, created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_team_created_at_idx ON ideas (team, created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_submitted_by_created_at_idx ON ideas (submitted_by, created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_assigned_approver_created_at_idx ON ideas (assigned_approver, created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_best_idea_idx ON ideas (is_best_idea) WHERE is_best_idea = 1",
+    "CREATE INDEX IF NOT EXISTS comments_idea_id_created_at_idx ON comments (idea_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS departments_pillar_idx ON departments (pillar)",
+    "CREATE INDEX IF NOT EXISTS teams_pillar_department_idx ON teams (pillar, department)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS credentials_email_idx ON credentials (email)",
+    "CREATE INDEX IF NOT EXISTS ideas_status_updated_at_idx ON ideas (status, updated_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_archive_created_at_idx ON ideas_archive (created_at)",
+    "CREATE INDEX IF NOT EXISTS ideas_archive_status_created_at_idx ON ideas_archive (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS comments_archive_idea_id_created_at_idx ON comments_archive (idea_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idea_events_occurred_at_idx ON idea_events (occurred_at)",
+    "CREATE INDEX IF NOT EXISTS idea_events_idea_id_occurred_at_idx ON idea_events (idea_id, occurred_at)",
+    "CREATE INDEX IF NOT EXISTS idea_events_pillar_occurred_at_idx ON idea_events (pillar, occurred_at)",
+    "CREATE INDEX IF NOT EXISTS idea_events_department_occurred_at_idx ON idea_events (department, occurred_at)",
+    "CREATE INDEX IF NOT EXISTS idea_events_approver_id_occurred_at_idx ON idea_events (approver_id, occurred_at)",
+    "CREATE INDEX IF NOT EXISTS leaderboard_counters_board_period_value_idx ON leaderboard_counters (board, period, value)",
+    "CREATE INDEX IF NOT EXISTS ideas_updated_at_id_idx ON ideas (updated_at, id)",
+    "CREATE INDEX IF NOT EXISTS idea_tombstones_deleted_at_id_idx ON idea_tombstones (deleted_at, id)",
+    "CREATE INDEX IF NOT EXISTS idea_attachments_idea_id_created_at_idx ON idea_attachments (idea_id, created_at)",
+]
+
+
+class StorageError(Exception):
+    pass
+
+
+class Result:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class SupabaseQuery:
+    def __init__(self, builder: Any):
+        self._builder = builder
+
+    def maybeSingle(self):
+        return SupabaseQuery(self._builder.maybe_single())
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return SupabaseQuery(result) if hasattr(result, "execute") else result
+
+        return wrapper
+
+    def execute(self):
+        # postgrest returns None instead of a response when maybe_single() finds no row
+        result = self._builder.execute()
+        return Result(None) if result is None else result
+
+
+class SupabaseStorage:
+    name = "supabase"
+
+    def __init__(self, url: str, key: str, timeout: Optional[float] = None):
+        from supabase import ClientOptions, create_client
+
+        options = ClientOptions(postgrest_client_timeout=timeout) if timeout else ClientOptions()
+        self.client = create_client(url, key, options)
+        self.auth = self.client.auth
+
+    def table(self, name: str) -> SupabaseQuery:
+        return SupabaseQuery(self.client.table(name))
+
+    def rpc(self, name: str, params: dict) -> SupabaseQuery:
+        return SupabaseQuery(self.client.rpc(name, params))
+
+
+class SQLiteQuery:
+    def __init__(self, storage: "SQLiteStorage", table: str):
+        if table not in SCHEMA:
+            raise StorageError(f"Unknown table: {table}")
+        self.storage = storage
+        self.table = table
+        self.columns = SCHEMA[table]
+        self.operation = "select"
+        self.selected = "*"
+        self.payload: Any = None
+        self.count_mode: Optional[str] = None
+        self.where: List[str] = []
+        self.params: List[Any] = []
+        self.ordering: List[str] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+        self.single = False
+
+    def _column(self, name: str) -> str:
+        if name not in self.columns:
+            raise StorageError(f"Unknown column {self.table}.{name}")
+        return f'"{name}"'
+
+    def _value(self, column: str, value: Any) -> Any:
+        kind = self.columns.get(column)
+        if kind == BOOL and value is not None:
+            return 1 if value else 0
+        if kind == JSON and value is not None:
+            return json.dumps(value)
+        return value
+
+    def _filter(self, column: str, op: str, value: Any):
+        self.where.append(f"{self._column(column)} {op} ?")
+        self.params.append(self._value(column, value))
+        return self
+
+    def select(self, columns: str = "*", count: Optional[str] = None):
+        self.selected = columns
+        self.count_mode = count
+        return self
+
+    def insert(self, payload):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def upsert(self, payload, **kwargs):
+        self.operation = "upsert"
+        self.payload = payload
+        return self
+
+    def update(self, payload: dict):
+        self.operation = "update"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column: str, value: Any):
+        return self._filter(column, "=", value)
+
+    def neq(self, column: str, value: Any):
+        return self._filter(column, "!=", value)
+
+    def gt(self, column: str, value: Any):
+        return self._filter(column, ">", value)
+
+    def gte(self, column: str, value: Any):
+        return self._filter(column, ">=", value)
+
+    def lt(self, column: str, value: Any):
+        return self._filter(column, "<", value)
+
+    def lte(self, column: str, value: Any):
+        return self._filter(column, "<=", value)
+
+    def like(self, column: str, pattern: str):
+        self.where.append(f"{self._column(column)} GLOB ?")
+        self.params.append(pattern.replace("*", "[*]").replace("?", "[?]").replace("%", "*").replace("_", "?"))
+        return self
+
+    def ilike(self, column: str, pattern: str):
+        self.where.append(f"{self._column(column)} LIKE ? ESCAPE '\\'")
+        self.params.append(pattern)
+        return self
+
+    def or_(self, filters: str):
+        clauses = []
+        for part in filters.split(","):
+            column, op, value = part.split(".", 2)
+            if op == "ilike":
+                clauses.append(f"{self._column(column)} LIKE ? ESCAPE '\\'")
+                self.params.append(value.replace("*", "%"))
+            elif op in COMPARISONS:
+                clauses.append(f"{self._column(column)} {COMPARISONS[op]} ?")
+                self.params.append(self._value(column, value))
+            else:
+                raise StorageError(f"Unsupported or_ operator: {op}")
+        self.where.append(f"({' OR '.join(clauses)})")
+        return self
+
+    def is_(self, column: str, value: Any):
+        if value is None or value == "null":
+            self.where.append(f"{self._column(column)} IS NULL")
+            return self
+        return self._filter(column, "IS", value)
+
+    def in_(self, column: str, values):
+        values = list(values)
+        if not values:
+            self.where.append("0")
+            return self
+        self.where.append(f"{self._column(column)} IN ({', '.join('?' for _ in values)})")
+        self.params.extend(self._value(column, v) for v in values)
+        return self
+
+    def contains(self, column: str, values):
+        for value in values:
+            self.where.append(f"EXISTS (SELECT 1 FROM json_each({self._column(column)}) WHERE value = ?)")
+            self.params.append(value)
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self.ordering.append(f"{self._column(column)} {'DESC NULLS FIRST' if desc else 'ASC NULLS LAST'}")
+        return self
+
+    def limit(self, count: int):
+        self.limit_count = count
+        return self
+
+    def range(self, start: int, end: int):
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def maybe_single(self):
+        self.single = True
+        return self
+
+    maybeSingle = maybe_single
+
+    def _where_sql(self) -> str:
+        return f" WHERE {' AND '.join(self.where)}" if self.where else ""
+
+    def _select_list(self) -> str:
+        if self.selected.strip() == "*":
+            return "*"
+        return ", ".join(self._column(c.strip()) for c in self.selected.split(","))
+
+    def execute(self) -> Result:
+        return self.storage.run(self)
+
+    def run(self, conn: sqlite3.Connection) -> Result:
+        if self.operation in ("insert", "upsert"):
+            docs = self.payload if isinstance(self.payload, list) else [self.payload]
+            created = []
+            for doc in docs:
+                doc = dict(doc)
+                doc.setdefault("id", str(uuid.uuid4()))
+                columns = [self._column(c) for c in doc]
+                verb = "INSERT OR REPLACE" if self.operation == "upsert" else "INSERT"
+                sql = f"{verb} INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in doc)}) RETURNING *"
+                try:
+                    row = conn.execute(sql, [self._value(c, v) for c, v in doc.items()]).fetchone()
+                except sqlite3.IntegrityError as e:
+                    raise StorageError(str(e))
+                created.append(self.storage.decode(self.table, row))
+            return Result(created)
+
+        if self.operation == "update":
+            assignments = ", ".join(f"{self._column(c)} = ?" for c in self.payload)
+            params = [self._value(c, v) for c, v in self.payload.items()] + self.params
+            rows = conn.execute(f"UPDATE {self.table} SET {assignments}{self._where_sql()} RETURNING *", params).fetchall()
+            return Result([self.storage.decode(self.table, r) for r in rows])
+
+        if self.operation == "delete":
+            rows = conn.execute(f"DELETE FROM {self.table}{self._where_sql()} RETURNING *", self.params).fetchall()
+            return Result([self.storage.decode(self.table, r) for r in rows])
+
+        count = None
+        if self.count_mode:
+            count = conn.execute(f"SELECT COUNT(*) FROM {self.table}{self._where_sql()}", self.params).fetchone()[0]
+        sql = f"SELECT {self._select_list()} FROM {self.table}{self._where_sql()}"
+        if self.ordering:
+            sql += f" ORDER BY {', '.join(self.ordering)}"
+        limit = 1 if self.single else self.limit_count
+        if limit is not None or self.offset:
+            sql += f" LIMIT {int(limit) if limit is not None else -1} OFFSET {int(self.offset)}"
+        rows = [self.storage.decode(self.table, r) for r in conn.execute(sql, self.params).fetchall()]
+        if self.single:
+            return Result(rows[0] if rows else None, count)
+        return Result(rows, count)
+
+
+class SQLiteStorage:
+    name = "sqlite"
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.create_schema()
+
+    def create_schema(self) -> None:
+        with self.lock:
+            for table, columns in SCHEMA.items():
+                defs = ", ".join(
+                    f'"{name}" {"TEXT PRIMARY KEY" if name == "id" else kind.replace(BOOL, "INTEGER").replace(JSON, "TEXT")}'
+                    for name, kind in columns.items()
+                )
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({defs})")
+                existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+                for name, kind in columns.items():
+                    if name not in existing:
+                        self.conn.execute(f'ALTER TABLE {table} ADD COLUMN "{name}" {kind.replace(BOOL, "INTEGER").replace(JSON, "TEXT")}')
+            for statement in INDEXES:
+                self.conn.execute(statement)
+
+    def decode(self, table: str, row: sqlite3.Row) -> dict:
+        columns = SCHEMA[table]
+        doc = {}
+        for key in row.keys():
+            value = row[key]
+            kind = columns.get(key)
+            if kind == BOOL and value is not None:
+                value = bool(value)
+            elif kind == JSON:
+                value = json.loads(value) if value else []
+            doc[key] = value
+        return doc
+
+    def table(self, name: str) -> SQLiteQuery:
+        return SQLiteQuery(self, name)
+
+    def rpc(self, name: str, params: dict) -> "SQLiteCall":
+        if name not in SQLITE_FUNCTIONS:
+            raise StorageError(f"Unknown function: {name}")
+        return SQLiteCall(self, name, params)
+
+    def bulk_load(self, table: str, rows: List[dict]) -> None:
+        columns = list(SCHEMA[table])
+        query = SQLiteQuery(self, table)
+        sql = f"INSERT INTO {table} ({', '.join(query._column(c) for c in columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(sql, ([query._value(c, row.get(c)) for c in columns] for row in rows))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def run(self, query: SQLiteQuery) -> Result:
+        with self.lock:
+            return query.run(self.conn)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def increment_leaderboard_counters(conn: sqlite3.Connection, deltas: List[dict]) -> None:
+    conn.executemany(
+        "INSERT INTO leaderboard_counters (id, board, period, subject, label, value, updated_at) "
+        "VALUES (:id, :board, :period, :subject, :label, :value, :updated_at) "
+        "ON CONFLICT (id) DO UPDATE SET value = leaderboard_counters.value + excluded.value, "
+        "label = excluded.label, updated_at = excluded.updated_at",
+        [{**delta, "updated_at": datetime.now(timezone.utc).isoformat()} for delta in deltas],
+    )
+
+
+def refresh_attachment_count(conn: sqlite3.Connection, target: str) -> int:
+    total = conn.execute("SELECT count(*) FROM idea_attachments WHERE idea_id = ?", (target,)).fetchone()[0]
+    conn.execute("UPDATE ideas SET attachment_count = ?, updated_at = ? WHERE id = ?",
+                 (total, datetime.now(timezone.utc).isoformat(), target))
+    return total
+
+
+SQLITE_FUNCTIONS = {
+    "increment_leaderboard_counters": increment_leaderboard_counters,
+    "refresh_attachment_count": refresh_attachment_count,
+}
+
+
+class SQLiteCall:
+    def __init__(self, storage: SQLiteStorage, name: str, params: dict):
+        self.storage = storage
+        self.name = name
+        self.params = params
+
+    def execute(self) -> Result:
+        conn = self.storage.conn
+        with self.storage.lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                data = SQLITE_FUNCTIONS[self.name](conn, **self.params)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return Result(data)
+
+
+def create_storage(backend: str, sqlite_path: str = ":memory:", supabase_url: Optional[str] = None,
+                   supabase_key: Optional[str] = None, timeout: Optional[float] = None):
+    backend = backend.lower()
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path)
+    if backend == "supabase":
+        if not supabase_url or not supabase_key:
+            raise ValueError("Supabase credentials not found in environment variables")
+        return SupabaseStorage(supabase_url, supabase_key, timeout)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+class LazyStorage:
+    """Defers building the storage client (and importing its SDK) until first use."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.client = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        if self.client is None:
+            with self.lock:
+                if self.client is None:
+                    self.client = self.factory()
+        return self.client
+
+    def override(self, client) -> None:
+        self.client = client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
@@ -0,0 +1,114 @@
+"""
+Bucketed dashboard trends: ideas by created_at and idea_events by occurred_at, one pandas pass per source.
+"""
+from typing import List, Optional
+
+INTERVALS = {"day": "D", "week": "W", "month": "M"}
+SPLITS = ["pillar", "department"]
+STATUSES = ["pending", "approved", "assigned_to_te", "implemented", "revision_requested", "declined"]
+TRANSITIONS = ["approved", "declined", "revision_requested", "assigned_to_te", "implemented"]
+
+IDEA_COLUMNS = "id,created_at,status,pillar,department,savings_type,cost_savings,time_saved_hours,time_saved_minutes"
+EVENT_COLUMNS = "occurred_at,to_status,pillar,department"
+MAX_BUCKETS = 1000
+
+
+def bucket_start(timestamps, interval: str):
+    import pandas as pd
+
+    parsed = pd.to_datetime(timestamps, utc=True, format="ISO8601").dt.tz_localize(None)
+    return parsed.dt.to_period(INTERVALS[interval]).dt.start_time
+
+
+def bucket_range(first, last, interval: str):
+    import pandas as pd
+
+    return pd.period_range(first, last, freq=INTERVALS[interval]).start_time
+
+
+def _frame(rows: List[dict], time_column: str, interval: str, split_by: Optional[str]):
+    import pandas as pd
+
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    frame["bucket"] = bucket_start(frame[time_column], interval)
+    if split_by:
+        frame["key"] = frame.get(split_by, pd.Series(index=frame.index, dtype=object)).fillna("Unassigned")
+    else:
+        frame["key"] = "all"
+    return frame
+
+
+def _counts(frame, column: str, values: List[str]):
+    import pandas as pd
+
+    if frame.empty:
+        return pd.DataFrame(columns=values)
+    counts = frame.groupby(["key", "bucket", column]).size().unstack(column, fill_value=0)
+    return counts.reindex(columns=values, fill_value=0)
+
+
+def _savings(frame):
+    import numpy as np
+    import pandas as pd
+
+    if frame.empty:
+        return pd.DataFrame(columns=["submitted", "cost_savings", "time_saved_hours"])
+    savings_type = frame.get("savings_type", pd.Series(index=frame.index, dtype=object))
+    numeric = frame.reindex(columns=["cost_savings", "time_saved_hours", "time_saved_minutes"])
+    numeric = numeric.apply(pd.to_numeric, errors="coerce").fillna(0.0)
+    frame = frame.assign(
+        cost_savings=np.where(savings_type == "cost_savings", numeric["cost_savings"], 0.0),
+        time_saved_hours=np.where(savings_type == "time_saved",
+                                  numeric["time_saved_hours"] + numeric["time_saved_minutes"] / 60, 0.0),
+    )
+    return frame.groupby(["key", "bucket"]).agg(
+        submitted=("bucket", "size"),
+        cost_savings=("cost_savings", "sum"),
+        time_saved_hours=("time_saved_hours", "sum"),
+    )
+
+
+def build_timeseries(ideas: List[dict], events: List[dict], interval: str, split_by: Optional[str] = None,
+                     start_date: Optional[str] = None, end_date: Optional[str] = None) -> dict:
+    import pandas as pd
+
+    first = bucket_start(pd.Series([start_date]), interval)[0] if start_date else None
+    last = bucket_start(pd.Series([end_date]), interval)[0] if end_date else None
+
+    frames = [_frame(ideas, "created_at", interval, split_by), _frame(events, "occurred_at", interval, split_by)]
+    present = [frame for frame in frames if not frame.empty]
+    if not present:
+        return {"interval": interval, "split_by": split_by, "buckets": [], "series": []}
+
+    stamps = pd.concat([frame["bucket"] for frame in present])
+    first = stamps.min() if first is None else first
+    last = stamps.max() if last is None else last
+    buckets = bucket_range(first, last, interval)
+    if len(buckets) > MAX_BUCKETS:
+        raise ValueError(f"Range spans {len(buckets)} {interval} buckets (max {MAX_BUCKETS})")
+    keys = sorted(set().union(*(frame["key"] for frame in present)))
+
+    statuses = _counts(frames[0], "status", STATUSES).add_prefix("status:")
+    transitions = _counts(frames[1], "to_status", TRANSITIONS).add_prefix("transition:")
+    table = pd.concat([_savings(frames[0]), statuses, transitions], axis=1)
+    table = table.reindex(pd.MultiIndex.from_product([keys, buckets], names=["key", "bucket"])).fillna(0)
+
+    series = {key: [] for key in keys}
+    for (key, bucket), row in zip(table.index, table.to_dict("records")):
+        series[key].append({
+            "bucket": bucket.date().isoformat(),
+            "submitted": int(row["submitted"]),
+            "statuses": {status: int(row[f"status:{status}"]) for status in STATUSES},
+            "transitions": {status: int(row[f"transition:{status}"]) for status in TRANSITIONS},
+            "cost_savings": round(float(row["cost_savings"]), 2),
+            "time_saved_hours": round(float(row["time_saved_hours"]), 2),
+        })
+
+    return {
+        "interval": interval,
+        "split_by": split_by,
+        "buckets": [bucket.date().isoformat() for bucket in buckets],
+        "series": [{"key": key, "points": points} for key, points in series.items()],
+    }
@@ -0,0 +1,170 @@
+"""
+Synthetic data generator for benchmarks.
+Builds a realistic org (pillars -> departments -> teams -> employees, approvers and
+C.I. Excellence staff) and N ideas with comments, deterministically from a seed.
+"""
+import argparse
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PILLARS = {
+    "GBS": ["Operations", "Finance and Accounting", "Procurement", "Customer Care"],
+    "Tech": ["Technology", "Infrastructure", "Data and Analytics"],
+    "Finance": ["Finance", "Treasury", "Tax"],
+    "HR": ["Human Resources", "Learning and Development", "Payroll"],
+    "Sales": ["Enterprise Sales", "Channel Sales"],
+}
+TEAMS_PER_DEPARTMENT = 4
+IMPROVEMENT_TYPES = ["Process Improvement", "Cost Reduction", "Automation", "Quality", "Customer Experience"]
+STATUS_WEIGHTS = {
+    "pending": 25, "approved": 20, "revision_requested": 8, "declined": 12,
+    "assigned_to_te": 10, "implemented": 25,
+}
+WORDS = (
+    "automate reconcile invoice approval backlog template dashboard report manual "
+    "handoff billing audit workflow spreadsheet email reminder vendor onboarding "
+    "payroll ticket escalation checklist validation duplicate lookup"
+).split()
+
+BENCH_PASSWORD = "bench-password"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _email(username: str) -> str:
+    return f"{username}@philtech-bench.com"
+
+
+def generate(idea_count: int = 10_000, employees: int = 2_000, comments_per_idea: float = 2.0,
+             seed: int = 42, days: int = 730) -> dict:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    tables = {"pillars": [], "departments": [], "teams": [], "tech_persons": [],
+              "profiles": [], "ideas": [], "comments": []}
+
+    org = []
+    for pillar, departments in PILLARS.items():
+        tables["pillars"].append({"id": str(uuid.UUID(int=rng.getrandbits(128))), "name": pillar})
+        for department in departments:
+            tables["departments"].append({"id": str(uuid.UUID(int=rng.getrandbits(128))), "name": department, "pillar": pillar})
+            for n in range(TEAMS_PER_DEPARTMENT):
+                team = f"{department} Team {n + 1}"
+                tables["teams"].append({"id": str(uuid.UUID(int=rng.getrandbits(128))), "name": team,
+                                        "pillar": pillar, "department": department})
+                org.append((pillar, department, team))
+
+    for n in range(20):
+        tables["tech_persons"].append({"id": str(uuid.UUID(int=rng.getrandbits(128))), "name": f"Tech Person {n + 1}",
+                                       "email": f"tech{n + 1}@philtech-bench.com", "specialization": rng.choice(["RPA", "Web", "Data"])})
+
+    def profile(username, role, sub_role=None, pillar=None, department=None, team=None, approved_pillars=None):
+        created = now - timedelta(days=days + rng.randint(0, 365))
+        doc = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "username": username, "email": _email(username),
+            "first_name": username.split("_")[0].title(), "last_name": "Bench", "role": role, "sub_role": sub_role,
+            "pillar": pillar, "department": department, "team": team, "manager": None,
+            "approved_pillars": approved_pillars or [], "approved_departments": [], "created_at": created.isoformat(),
+        }
+        tables["profiles"].append(doc)
+        return doc
+
+    admin = profile("bench_admin", "admin")
+    approvers = [profile(f"approver_{p.lower()}", "approver", "approver", pillar=p, approved_pillars=[p]) for p in PILLARS]
+    ci_team = [profile(f"ci_{n + 1}", "approver", "ci_excellence") for n in range(5)]
+    submitters = []
+    for n in range(employees):
+        pillar, department, team = rng.choice(org)
+        submitters.append(profile(f"employee_{n + 1}", "user", pillar=pillar, department=department, team=team))
+    approver_by_pillar = {a["pillar"]: a for a in approvers}
+
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    for n in range(idea_count):
+        submitter = rng.choice(submitters)
+        approver = approver_by_pillar[submitter["pillar"]]
+        created = now - timedelta(seconds=rng.randint(0, days * 86400))
+        updated = created + timedelta(seconds=rng.randint(0, 30 * 86400))
+        status = rng.choices(statuses, weights)[0]
+        idea = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "idea_number": f"EYE-{str(n + 1).zfill(5)}",
+            "pillar": submitter["pillar"], "department": submitter["department"], "team": submitter["team"],
+            "title": _sentence(rng, 5), "improvement_type": rng.choice(IMPROVEMENT_TYPES),
+            "current_process": _sentence(rng, 30), "suggested_solution": _sentence(rng, 30),
+            "benefits": _sentence(rng, 15), "target_completion": (created + timedelta(days=90)).date().isoformat(),
+            "status": status, "submitted_by": submitter["id"], "submitted_by_username": submitter["username"],
+            "assigned_approver": approver["id"], "assigned_approver_username": approver["username"],
+            "created_at": created.isoformat(), "updated_at": updated.isoformat(), "is_best_idea": False,
+        }
+        if status in ("assigned_to_te", "implemented"):
+            evaluator = rng.choice(ci_team)
+            quick_win = status == "implemented" and rng.random() < 0.5
+            savings_type = rng.choice(["cost_savings", "time_saved"])
+            idea.update({
+                "is_quick_win": quick_win, "evaluated_by": evaluator["id"], "evaluated_by_username": evaluator["username"],
+                "evaluated_at": updated.isoformat(),
+                "complexity_level": None if quick_win else rng.choice(["Low", "Medium", "High"]),
+                "savings_type": None if quick_win else savings_type,
+                "cost_savings": round(rng.uniform(500, 250_000), 2) if not quick_win and savings_type == "cost_savings" else None,
+                "time_saved_hours": rng.randint(1, 400) if not quick_win and savings_type == "time_saved" else None,
+                "time_saved_minutes": rng.randint(0, 59) if not quick_win and savings_type == "time_saved" else None,
+                "assigned_to_tech": status == "assigned_to_te",
+                "tech_person_name": rng.choice(tables["tech_persons"])["name"] if status == "assigned_to_te" else None,
+            })
+        tables["ideas"].append(idea)
+
+        for c in range(int(rng.expovariate(1 / comments_per_idea)) if comments_per_idea else 0):
+            author = rng.choice([submitter, approver])
+            tables["comments"].append({
+                "id": str(uuid.UUID(int=rng.getrandbits(128))), "idea_id": idea["id"], "user_id": author["id"],
+                "username": author["username"], "comment_text": _sentence(rng, 12),
+                "created_at": (created + timedelta(hours=c + 1)).isoformat(),
+            })
+
+    if tables["ideas"]:
+        rng.choice(tables["ideas"])["is_best_idea"] = True
+
+    return {
+        "tables": tables,
+        "users": {"admin": admin, "approvers": approvers, "ci_team": ci_team, "submitters": submitters},
+        "password": BENCH_PASSWORD,
+    }
+
+
+def load_into(db, dataset: dict) -> None:
+    if hasattr(db, "bulk_load"):
+        import passwords
+
+        for name, rows in dataset["tables"].items():
+            db.bulk_load(name, rows)
+        password_hash = passwords.hash_sync(dataset["password"])
+        db.bulk_load("credentials", [{"id": u["id"], "email": u["email"], "password_hash": password_hash}
+                                     for u in dataset["tables"]["profiles"]])
+        return
+    for name, rows in dataset["tables"].items():
+        db.tables[name] = rows
+    for user in dataset["tables"]["profiles"]:
+        db.auth.users[user["email"]] = {"id": user["id"], "password": dataset["password"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Eye-dea dataset as JSON")
+    parser.add_argument("--ideas", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--comments-per-idea", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args()
+
+    dataset = generate(args.ideas, args.employees, args.comments_per_idea, args.seed)
+    args.out.write_text(json.dumps(dataset["tables"]))
+    counts = {name: len(rows) for name, rows in dataset["tables"].items()}
+    print(f"Wrote {args.out}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Export throughput benchmark: rows/s and MB/s per format for /api/dashboard/export.
+
+Each format is downloaded --repeat times in-process against the SQLite engine (or the
+in-memory Supabase stand-in with --storage memory). Latency percentiles and the
+exported size are reported per format:
+
+    python -m benchmarks.export_throughput --ideas 50000 --repeat 5 --formats csv parquet xlsx
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datagen import generate
+from benchmarks.run import RESULTS_DIR, load_app, summarize
+
+FORMATS = ["csv", "parquet", "xlsx"]
+
+
+async def download(client, headers, fmt: str, repeat: int) -> dict:
+    latencies, errors, size = [], 0, 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        request_started = time.perf_counter()
+        response = await client.get("/api/dashboard/export", params={"format": fmt}, headers=headers)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        if response.status_code != 200:
+            errors += 1
+        size = len(response.content)
+    return {**summarize(latencies, errors, time.perf_counter() - started), "bytes": size}
+
+
+async def run(args) -> dict:
+    dataset = generate(idea_count=args.ideas, employees=args.employees, comments_per_idea=0, seed=args.seed)
+    app = load_app(dataset, args.storage)
+    import config
+
+    config.EXPORT_PAGE_SIZE = args.page_size
+    ci = dataset["users"]["ci_team"][0]["username"]
+
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=600) as client:
+        login = await client.post("/api/auth/login", json={"username": ci, "password": dataset["password"]})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        for fmt in args.formats:
+            stats = await download(client, headers, fmt, args.repeat)
+            seconds = stats["p50_ms"] / 1000
+            stats["rows_per_s"] = round(args.ideas / seconds, 1) if seconds else 0.0
+            stats["mb_per_s"] = round(stats["bytes"] / 1_000_000 / seconds, 2) if seconds else 0.0
+            results[fmt] = stats
+            print(f"{fmt:<8} n={stats['requests']} err={stats['errors']} p50={stats['p50_ms']:.1f}ms "
+                  f"size={stats['bytes'] / 1_000_000:.2f}MB rows/s={stats['rows_per_s']:.0f} MB/s={stats['mb_per_s']:.2f}")
+
+    return {
+        "label": args.label,
+        "storage": args.storage,
+        "ideas": args.ideas,
+        "page_size": args.page_size,
+        "repeat": args.repeat,
+        "formats": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export throughput per format")
+    parser.add_argument("--storage", default="sqlite",
+                        help="memory (Supabase stand-in), sqlite (in-memory) or a SQLite file path")
+    parser.add_argument("--ideas", type=int, default=20_000)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args(argv)
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+
+    out = args.out or RESULTS_DIR / f"export-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"Saved results to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
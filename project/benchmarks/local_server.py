@@ -0,0 +1,31 @@
+"""
+Serve the API with the in-memory Supabase stand-in loaded with a synthetic dataset,
+so `benchmarks.run --base-url` can measure a real HTTP stack without network credentials:
+
+    python -m benchmarks.local_server --ideas 10000 --port 8001
+"""
+import argparse
+
+import uvicorn
+
+from benchmarks.datagen import generate
+from benchmarks.run import load_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API against a local Supabase stand-in")
+    parser.add_argument("--ideas", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--comments-per-idea", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--storage", default="memory", help="memory, sqlite or a SQLite file path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    dataset = generate(args.ideas, args.employees, args.comments_per_idea, args.seed)
+    uvicorn.run(load_app(dataset, args.storage), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
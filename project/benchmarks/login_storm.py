@@ -0,0 +1,106 @@
+"""
+Login-storm benchmark: sustained logins per second against the SQLite engine, which
+verifies bcrypt in the process pool. While the storm runs, /api/health is probed to
+show how responsive the event loop stays.
+
+    python -m benchmarks.login_storm --duration 10 --concurrency 32 --rounds 12
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datagen import generate
+from benchmarks.run import RESULTS_DIR, load_app, summarize
+
+
+async def storm(client, usernames, password, duration: float, concurrency: int):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    counter = 0
+
+    async def worker():
+        nonlocal errors, counter
+        while time.perf_counter() < deadline:
+            username = usernames[counter % len(usernames)]
+            counter += 1
+            started = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"username": username, "password": password})
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def probe(client, duration: float, interval: float = 0.05):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/api/health")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return summarize(latencies, 0, duration)
+
+
+async def run(args) -> dict:
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    dataset = generate(idea_count=0, employees=args.users, seed=args.seed)
+    app = load_app(dataset, "sqlite")
+    usernames = [u["username"] for u in dataset["users"]["submitters"]]
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=120) as client:
+        logins, health = await asyncio.gather(
+            storm(client, usernames, dataset["password"], args.duration, args.concurrency),
+            probe(client, args.duration),
+        )
+
+    print(f"logins   n={logins['requests']} err={logins['errors']} p50={logins['p50_ms']:.1f}ms "
+          f"p95={logins['p95_ms']:.1f}ms p99={logins['p99_ms']:.1f}ms logins/s={logins['rps']:.1f}")
+    print(f"health   p50={health['p50_ms']:.1f}ms p95={health['p95_ms']:.1f}ms p99={health['p99_ms']:.1f}ms")
+    return {
+        "label": args.label,
+        "rounds": args.rounds,
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "logins": logins,
+        "health_during_storm": health,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sustained login throughput benchmark")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+    import passwords
+    passwords.shutdown()
+
+    out = args.out or RESULTS_DIR / f"login-storm-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"Saved results to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
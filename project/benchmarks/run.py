@@ -0,0 +1,242 @@
+"""
+Load-test runner for the Eye-dea API.
+
+Runs scripted scenarios in-process (ASGI, no network) or against a local server
+started with `python -m benchmarks.local_server`, on the in-memory Supabase stand-in
+or the SQLite engine (--storage sqlite), and reports p50/p95/p99 latency
+and requests per second. Results are saved as JSON so runs can be compared:
+
+    python -m benchmarks.run --ideas 10000 --requests 200 --concurrency 16
+    python -m benchmarks.run --base-url http://localhost:8001 --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datagen import generate
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def load_app(dataset: dict, storage: str = "memory"):
+    sys.path.insert(0, str(PROJECT_DIR / "backend"))
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_ANON_KEY", "local.bench.key")
+    import config
+    import core
+    import server
+    from memory_storage import MemoryStorage
+    from query_trace import TracedClient
+    from storage import SQLiteStorage
+    from benchmarks.datagen import load_into
+
+    if storage == "memory":
+        db = MemoryStorage()
+    else:
+        db = SQLiteStorage(":memory:" if storage == "sqlite" else storage)
+        config.STORAGE_BACKEND = "sqlite"
+    load_into(db, dataset)
+    core.db.override(TracedClient(db))
+    core.rate_limiter.enabled = False
+    return server.app
+
+
+class Context:
+    def __init__(self, dataset: dict):
+        users = dataset["users"]
+        self.password = dataset["password"]
+        self.admin = users["admin"]["username"]
+        self.approver = users["approvers"][0]["username"]
+        self.ci = users["ci_team"][0]["username"]
+        self.submitters = [u["username"] for u in users["submitters"]]
+        ideas = dataset["tables"]["ideas"]
+        self.idea_ids = [i["id"] for i in ideas]
+        approver_pillar = users["approvers"][0]["pillar"]
+        self.pending_ids = [i["id"] for i in ideas if i["status"] == "pending" and i["pillar"] == approver_pillar] or self.idea_ids
+        self.tokens = {}
+
+    def headers(self, username: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[username]}"}
+
+
+async def list_ideas(client, ctx, n):
+    return await client.get("/api/ideas", headers=ctx.headers(ctx.approver))
+
+
+async def idea_detail(client, ctx, n):
+    idea_id = ctx.idea_ids[n % len(ctx.idea_ids)]
+    headers = ctx.headers(ctx.approver)
+    idea, comments = await asyncio.gather(
+        client.get(f"/api/ideas/{idea_id}", headers=headers),
+        client.get(f"/api/ideas/{idea_id}/comments", headers=headers),
+    )
+    return idea if idea.status_code != 200 else comments
+
+
+async def approve(client, ctx, n):
+    idea_id = ctx.pending_ids[n % len(ctx.pending_ids)]
+    return await client.post(f"/api/ideas/{idea_id}/approve", json={"comment": "Approved in benchmark"},
+                             headers=ctx.headers(ctx.approver))
+
+
+async def analytics(client, ctx, n):
+    return await client.get("/api/dashboard/analytics", headers=ctx.headers(ctx.ci))
+
+
+async def export_excel(client, ctx, n):
+    return await client.get("/api/dashboard/export-excel", headers=ctx.headers(ctx.ci))
+
+
+async def login(client, ctx, n):
+    username = ctx.submitters[n % len(ctx.submitters)]
+    return await client.post("/api/auth/login", json={"username": username, "password": ctx.password})
+
+
+SCENARIOS = {
+    "list_ideas": list_ideas,
+    "idea_detail": idea_detail,
+    "approve": approve,
+    "analytics": analytics,
+    "export_excel": export_excel,
+    "login": login,
+}
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms, errors: int, wall_seconds: float) -> dict:
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+        "rps": round(len(values) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+    }
+
+
+async def run_scenario(client, ctx, scenario, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(n):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await scenario(client, ctx, n)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def authenticate(client, ctx) -> None:
+    for username in {ctx.admin, ctx.approver, ctx.ci}:
+        response = await client.post("/api/auth/login", json={"username": username, "password": ctx.password})
+        response.raise_for_status()
+        ctx.tokens[username] = response.json()["access_token"]
+
+
+async def run(args) -> dict:
+    dataset = generate(args.ideas, args.employees, args.comments_per_idea, args.seed)
+    ctx = Context(dataset)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(app=load_app(dataset, args.storage), base_url="http://bench", timeout=args.timeout)
+
+    results = {}
+    async with client:
+        await authenticate(client, ctx)
+        for name in args.scenarios:
+            requests = args.requests if name != "export_excel" else max(1, args.requests // 20)
+            await run_scenario(client, ctx, SCENARIOS[name], min(args.warmup, requests), args.concurrency)
+            results[name] = await run_scenario(client, ctx, SCENARIOS[name], requests, args.concurrency)
+            print_row(name, results[name])
+
+    return {
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "in-process",
+        "storage": None if args.base_url else args.storage,
+        "python": platform.python_version(),
+        "dataset": {"ideas": args.ideas, "employees": args.employees,
+                    "comments": len(dataset["tables"]["comments"]), "seed": args.seed},
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+
+
+def print_row(name: str, stats: dict, baseline: dict = None) -> None:
+    line = (f"{name:<14} n={stats['requests']:<6} err={stats['errors']:<4} p50={stats['p50_ms']:>9.2f}ms "
+            f"p95={stats['p95_ms']:>9.2f}ms p99={stats['p99_ms']:>9.2f}ms rps={stats['rps']:>9.2f}")
+    if baseline:
+        delta = (stats["p95_ms"] - baseline["p95_ms"]) / baseline["p95_ms"] * 100 if baseline["p95_ms"] else 0.0
+        line += f"  p95 {delta:+.1f}% vs baseline"
+    print(line)
+
+
+def compare(report: dict, baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nComparison with {baseline_path.name} ({baseline.get('label') or baseline['timestamp']}):")
+    for name, stats in report["scenarios"].items():
+        print_row(name, stats, baseline["scenarios"].get(name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eye-dea API load test and scale benchmark")
+    parser.add_argument("--base-url", help="Run against a live server instead of in-process")
+    parser.add_argument("--storage", default="memory",
+                        help="In-process storage: memory (Supabase stand-in), sqlite (in-memory) or a SQLite file path")
+    parser.add_argument("--ideas", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--comments-per-idea", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--label", default="")
+    parser.add_argument("--out", type=Path, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="Previous result file to compare against")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+
+    out = args.out or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}{'-' + args.label if args.label else ''}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved results to {out}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return report
+
+
+if __name__ == "__main__":
+    main()
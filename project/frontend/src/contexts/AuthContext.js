@@ -1,5 +1,6 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
 import axios from 'axios';
+import { retryWithRefresh, storeTokens } from '../lib/api';
 
 const AuthContext = createContext();
 
@@ -16,6 +17,11 @@ export const AuthProvider = ({ children }) => {
   const [loading, setLoading] = useState(true);
   const [token, setToken] = useState(localStorage.getItem('token'));
 
+  useEffect(() => {
+    const interceptor = axios.interceptors.response.use((response) => response, retryWithRefresh(axios));
+    return () => axios.interceptors.response.eject(interceptor);
+  }, []);
+
   useEffect(() => {
     if (token) {
       axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
@@ -42,9 +48,8 @@ export const AuthProvider = ({ children }) => {
       username,
       password
     });
-    const { access_token, user: userData } = response.data;
-    localStorage.setItem('token', access_token);
-    axios.defaults.headers.common['Authorization'] = `Bearer ${access_token}`;
+    const { access_token, refresh_token, user: userData } = response.data;
+    storeTokens(access_token, refresh_token);
     setToken(access_token);
     setUser(userData);
     return userData;
@@ -55,7 +60,13 @@ export const AuthProvider = ({ children }) => {
   };
 
   const logout = () => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/logout`, { refresh_token: refreshToken })
+        .catch(() => {});
+    }
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     delete axios.defaults.headers.common['Authorization'];
     setToken(null);
     setUser(null);
@@ -17,18 +17,76 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Stores a new token pair and sends it on every following request, including plain axios calls
+export const storeTokens = (accessToken, refreshToken) => {
+  localStorage.setItem('token', accessToken);
+  if (refreshToken) {
+    localStorage.setItem('refresh_token', refreshToken);
+  }
+  axios.defaults.headers.common['Authorization'] = `Bearer ${accessToken}`;
+};
+
+let refreshing = null;
+
+// Trades the stored refresh token for a new pair; concurrent 401s share one request
+export const refreshAccessToken = () => {
+  if (!refreshing) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    const request = refreshToken
+      ? axios.post(`${API_URL}/api/auth/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error('No refresh token'));
+    refreshing = request
+      .then((response) => {
+        const { access_token, refresh_token } = response.data;
+        storeTokens(access_token, refresh_token);
+        return access_token;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
+const NO_RETRY_PATHS = ['/api/auth/login', '/api/auth/refresh', '/api/auth/logout'];
+
+// Response error handler: retries a 401 once with a refreshed access token
+export const retryWithRefresh = (client) => async (error) => {
+  const original = error.config;
+  if (error.response?.status !== 401 || !original || original._retried
+      || NO_RETRY_PATHS.some((path) => original.url?.includes(path))) {
+    throw error;
+  }
+  original._retried = true;
+  const token = await refreshAccessToken();
+  original.headers.Authorization = `Bearer ${token}`;
+  return client(original);
+};
+
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
+  (error) => retryWithRefresh(api)(error).catch((failure) => {
+    if (error.response?.status === 401 && (!failure.response || failure.response.status === 401)) {
       localStorage.removeItem('token');
+      localStorage.removeItem('refresh_token');
       localStorage.removeItem('user');
       if (window.location.pathname !== '/login') {
         window.location.href = '/login';
       }
     }
-    return Promise.reject(error);
-  }
+    return Promise.reject(failure);
+  })
 );
 
+// Several GETs in one round trip through /api/batch; resolves to the bodies in order
+export const batchGet = async (paths) => {
+  const response = await api.post('/api/batch', { requests: paths.map((path) => ({ path })) });
+  return response.data.responses.map((sub, index) => {
+    if (sub.status >= 400) {
+      throw new Error(`${paths[index]} failed with status ${sub.status}`);
+    }
+    return sub.body;
+  });
+};
+
 export default api;
@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useRef } from 'react';
-import api from '../lib/api';
+import api, { batchGet } from '../lib/api';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
 import { Label } from '../components/ui/label';
@@ -12,8 +12,13 @@ import { Badge } from '../components/ui/badge';
 import { toast } from 'sonner';
 import { Plus, Trash2, Edit, Users, Briefcase, Building, UsersRound, Upload, Download, Wrench } from 'lucide-react';
 
+const USERS_PAGE_SIZE = 50;
+
 export default function AdminPanel() {
   const [users, setUsers] = useState([]);
+  const [userTotal, setUserTotal] = useState(0);
+  const [userPage, setUserPage] = useState(0);
+  const [userFilters, setUserFilters] = useState({ q: '', role: 'all', pillar: 'all' });
   const [departments, setDepartments] = useState([]);
   const [pillars, setPillars] = useState([]);
   const [teams, setTeams] = useState([]);
@@ -31,20 +36,42 @@ export default function AdminPanel() {
     fetchAllData();
   }, []);
 
+  useEffect(() => {
+    const timer = setTimeout(fetchUsers, 300);
+    return () => clearTimeout(timer);
+  }, [userFilters, userPage]);
+
+  const fetchUsers = async () => {
+    const params = { limit: USERS_PAGE_SIZE, offset: userPage * USERS_PAGE_SIZE };
+    if (userFilters.q.trim()) params.q = userFilters.q.trim();
+    if (userFilters.role !== 'all') params.role = userFilters.role;
+    if (userFilters.pillar !== 'all') params.pillar = userFilters.pillar;
+    try {
+      const response = await api.get('/api/admin/users', { params });
+      setUsers(response.data);
+      setUserTotal(Number(response.headers['x-total-count'] ?? response.data.length));
+    } catch (error) {
+      console.error('Failed to fetch users:', error);
+    }
+  };
+
+  const updateUserFilter = (field, value) => {
+    setUserFilters(prev => ({ ...prev, [field]: value }));
+    setUserPage(0);
+  };
+
   const fetchAllData = async () => {
     try {
-      const [usersRes, deptsRes, pillarsRes, teamsRes, techRes] = await Promise.all([
-        api.get('/api/admin/users'),
-        api.get('/api/admin/departments'),
-        api.get('/api/admin/pillars'),
-        api.get('/api/admin/teams'),
-        api.get('/api/admin/tech-persons')
+      const [depts, pillarList, teamList, techList] = await batchGet([
+        '/api/admin/departments',
+        '/api/admin/pillars',
+        '/api/admin/teams',
+        '/api/admin/tech-persons'
       ]);
-      setUsers(usersRes.data);
-      setDepartments(deptsRes.data);
-      setPillars(pillarsRes.data);
-      setTeams(teamsRes.data);
-      setTechPersons(techRes.data);
+      setDepartments(depts);
+      setPillars(pillarList);
+      setTeams(teamList);
+      setTechPersons(techList);
     } catch (error) {
       console.error('Failed to fetch data:', error);
     }
@@ -67,7 +94,7 @@ export default function AdminPanel() {
       toast.success('User updated successfully');
       setShowUserDialog(false);
       setEditingUser(null);
-      fetchAllData();
+      fetchUsers();
     } catch (error) {
       toast.error('Failed to update user');
     }
@@ -78,7 +105,7 @@ export default function AdminPanel() {
     try {
       await api.delete(`/api/admin/users/${userId}`);
       toast.success('User deleted');
-      fetchAllData();
+      fetchUsers();
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to delete user');
     }
@@ -104,7 +131,7 @@ export default function AdminPanel() {
         console.log('Errors:', response.data.errors);
         toast.warning(`${response.data.errors.length} errors occurred. Check console for details.`);
       }
-      fetchAllData();
+      fetchUsers();
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to upload file');
     } finally {
@@ -326,6 +353,37 @@ export default function AdminPanel() {
               </div>
             </CardHeader>
             <CardContent>
+              <div className="flex flex-wrap gap-3 mb-4">
+                <Input
+                  data-testid="user-search-input"
+                  placeholder="Search username, name or email"
+                  value={userFilters.q}
+                  onChange={(e) => updateUserFilter('q', e.target.value)}
+                  className="max-w-xs"
+                />
+                <Select value={userFilters.role} onValueChange={(value) => updateUserFilter('role', value)}>
+                  <SelectTrigger data-testid="user-role-filter" className="w-40">
+                    <SelectValue placeholder="Role" />
+                  </SelectTrigger>
+                  <SelectContent>
+                    <SelectItem value="all">All roles</SelectItem>
+                    <SelectItem value="user">User</SelectItem>
+                    <SelectItem value="approver">Approver</SelectItem>
+                    <SelectItem value="admin">Admin</SelectItem>
+                  </SelectContent>
+                </Select>
+                <Select value={userFilters.pillar} onValueChange={(value) => updateUserFilter('pillar', value)}>
+                  <SelectTrigger data-testid="user-pillar-filter" className="w-40">
+                    <SelectValue placeholder="Pillar" />
+                  </SelectTrigger>
+                  <SelectContent>
+                    <SelectItem value="all">All pillars</SelectItem>
+                    {pillars.map((pillar) => (
+                      <SelectItem key={pillar.id} value={pillar.name}>{pillar.name}</SelectItem>
+                    ))}
+                  </SelectContent>
+                </Select>
+              </div>
               <div className="overflow-x-auto">
                 <Table>
                   <TableHeader>
@@ -388,6 +446,33 @@ export default function AdminPanel() {
                   </TableBody>
                 </Table>
               </div>
+              <div className="flex justify-between items-center mt-4 text-sm text-gray-600">
+                <span data-testid="user-count">
+                  {userTotal === 0
+                    ? 'No users found'
+                    : `Showing ${userPage * USERS_PAGE_SIZE + 1}-${userPage * USERS_PAGE_SIZE + users.length} of ${userTotal}`}
+                </span>
+                <div className="flex gap-2">
+                  <Button
+                    data-testid="users-prev-page"
+                    variant="outline"
+                    size="sm"
+                    disabled={userPage === 0}
+                    onClick={() => setUserPage(userPage - 1)}
+                  >
+                    Previous
+                  </Button>
+                  <Button
+                    data-testid="users-next-page"
+                    variant="outline"
+                    size="sm"
+                    disabled={(userPage + 1) * USERS_PAGE_SIZE >= userTotal}
+                    onClick={() => setUserPage(userPage + 1)}
+                  >
+                    Next
+                  </Button>
+                </div>
+              </div>
             </CardContent>
           </Card>
         </TabsContent>
@@ -10,13 +10,15 @@ import {
   Zap, Award, TrendingUp, DollarSign, Clock, Download, 
   BarChart3, PieChart as PieChartIcon, Lightbulb, Users, CalendarIcon, CheckCircle, Wrench
 } from 'lucide-react';
-import { PieChart, Pie, Cell, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
+import { PieChart, Pie, Cell, BarChart, Bar, LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { format } from 'date-fns';
 
 const COLORS = ['#10B981', '#F59E0B', '#EF4444', '#3B82F6', '#8B5CF6', '#EC4899'];
 
 export default function CIDashboard() {
   const [analytics, setAnalytics] = useState(null);
+  const [trend, setTrend] = useState([]);
+  const [leaderboards, setLeaderboards] = useState({});
   const [loading, setLoading] = useState(true);
   const [exporting, setExporting] = useState(false);
   const [startDate, setStartDate] = useState(null);
@@ -26,14 +28,27 @@ export default function CIDashboard() {
     fetchAnalytics();
   }, [startDate, endDate]);
 
+  useEffect(() => {
+    fetchLeaderboards();
+  }, []);
+
   const fetchAnalytics = async () => {
     try {
       const params = {};
       if (startDate) params.start_date = format(startDate, 'yyyy-MM-dd');
       if (endDate) params.end_date = format(endDate, 'yyyy-MM-dd');
       
-      const response = await axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/dashboard/analytics`, { params });
+      const [response, timeseriesResponse] = await Promise.all([
+        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/dashboard/analytics`, { params }),
+        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/dashboard/timeseries`, { params: { ...params, interval: 'week' } })
+      ]);
       setAnalytics(response.data);
+      setTrend((timeseriesResponse.data.series[0]?.points || []).map((point) => ({
+        bucket: point.bucket,
+        submitted: point.submitted,
+        approved: point.transitions.approved,
+        implemented: point.transitions.implemented
+      })));
     } catch (error) {
       console.error('Failed to fetch analytics:', error);
       toast.error('Failed to load analytics data');
@@ -42,6 +57,18 @@ export default function CIDashboard() {
     }
   };
 
+  const fetchLeaderboards = async () => {
+    try {
+      const boards = ['submitters', 'departments', 'cost_savings'];
+      const responses = await Promise.all(boards.map((board) =>
+        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/dashboard/leaderboards/${board}`, { params: { limit: 5 } })
+      ));
+      setLeaderboards(Object.fromEntries(boards.map((board, index) => [board, responses[index].data.entries])));
+    } catch (error) {
+      console.error('Failed to fetch leaderboards:', error);
+    }
+  };
+
   const clearDateFilter = () => {
     setStartDate(null);
     setEndDate(null);
@@ -305,6 +332,37 @@ export default function CIDashboard() {
         </Card>
       </div>
 
+      {/* Weekly Trend Chart */}
+      <Card className="mb-8">
+        <CardHeader>
+          <div className="flex items-center space-x-2">
+            <TrendingUp className="w-5 h-5 text-blue-600" />
+            <CardTitle>Weekly Trend</CardTitle>
+          </div>
+          <CardDescription>Submissions, approvals and implementations per week</CardDescription>
+        </CardHeader>
+        <CardContent>
+          {trend.length > 0 ? (
+            <ResponsiveContainer width="100%" height={300}>
+              <LineChart data={trend}>
+                <CartesianGrid strokeDasharray="3 3" />
+                <XAxis dataKey="bucket" />
+                <YAxis allowDecimals={false} />
+                <Tooltip />
+                <Legend />
+                <Line type="monotone" dataKey="submitted" stroke="#3B82F6" name="Submitted" />
+                <Line type="monotone" dataKey="approved" stroke="#10B981" name="Approved" />
+                <Line type="monotone" dataKey="implemented" stroke="#8B5CF6" name="Implemented" />
+              </LineChart>
+            </ResponsiveContainer>
+          ) : (
+            <div className="h-[300px] flex items-center justify-center text-gray-500">
+              No trend data available yet
+            </div>
+          )}
+        </CardContent>
+      </Card>
+
       {/* Rates Row */}
       <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
         <Card>
@@ -374,6 +432,38 @@ export default function CIDashboard() {
         </Card>
       </div>
 
+      {/* Leaderboards */}
+      <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
+        {[
+          { board: 'submitters', title: 'Top Submitters', format: (value) => `${value} ideas` },
+          { board: 'departments', title: 'Top Departments', format: (value) => `${value} implemented` },
+          { board: 'cost_savings', title: 'Top Cost Savings', format: (value) => `$${value.toLocaleString()}` }
+        ].map(({ board, title, format: formatValue }) => (
+          <Card key={board}>
+            <CardHeader>
+              <div className="flex items-center space-x-2">
+                <Users className="w-5 h-5 text-blue-600" />
+                <CardTitle className="text-lg">{title}</CardTitle>
+              </div>
+            </CardHeader>
+            <CardContent>
+              {(leaderboards[board] || []).length > 0 ? (
+                <ol className="space-y-2">
+                  {leaderboards[board].map((entry) => (
+                    <li key={entry.subject} className="flex justify-between text-sm">
+                      <span className="text-gray-700">{entry.rank}. {entry.label}</span>
+                      <span className="font-semibold text-gray-900">{formatValue(entry.value)}</span>
+                    </li>
+                  ))}
+                </ol>
+              ) : (
+                <div className="text-sm text-gray-500">No entries yet</div>
+              )}
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+
       {/* Best Idea Section */}
       {analytics?.best_idea && (
         <Card className="bg-gradient-to-r from-yellow-50 to-amber-50 border-yellow-300">
@@ -1,7 +1,8 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { batchGet } from '../lib/api';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
 import { Label } from '../components/ui/label';
@@ -37,6 +38,12 @@ export default function CreateIdea() {
     manager: ''
   });
 
+  // One Idempotency-Key per version of the form, so retried submits never create a second idea.
+  const submissionKey = useRef(null);
+  useEffect(() => {
+    submissionKey.current = crypto.randomUUID();
+  }, [formData]);
+
   const improvementTypes = [
     'Standardization',
     'Automation',
@@ -78,14 +85,14 @@ export default function CreateIdea() {
 
   const fetchDropdownData = async () => {
     try {
-      const [pillarsRes, deptsRes, teamsRes] = await Promise.all([
-        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/admin/pillars`),
-        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/admin/departments`),
-        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/admin/teams`)
+      const [pillarList, deptList, teamList] = await batchGet([
+        '/api/admin/pillars',
+        '/api/admin/departments',
+        '/api/admin/teams'
       ]);
-      setPillars(pillarsRes.data);
-      setDepartments(deptsRes.data);
-      setTeams(teamsRes.data);
+      setPillars(pillarList);
+      setDepartments(deptList);
+      setTeams(teamList);
     } catch (error) {
       console.error('Failed to fetch dropdown data:', error);
     }
@@ -125,7 +132,9 @@ export default function CreateIdea() {
         await axios.put(`${process.env.REACT_APP_BACKEND_URL}/api/ideas/${id}`, submitData);
         toast.success('Eye-dea updated successfully!');
       } else {
-        await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/ideas`, submitData);
+        await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/ideas`, submitData, {
+          headers: { 'Idempotency-Key': submissionKey.current }
+        });
         toast.success('Eye-dea submitted successfully!');
       }
       navigate('/ideas');
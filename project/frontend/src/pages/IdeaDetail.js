@@ -1,6 +1,5 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate, useLocation } from 'react-router-dom';
-import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
 import { Button } from '../components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '../components/ui/card';
@@ -14,13 +13,16 @@ import { ArrowLeft, CheckCircle, XCircle, AlertCircle, Edit, Send, Star, Setting
 import { format } from 'date-fns';
 import CIEvaluationPanel from '../components/CIEvaluationPanel';
 
+const COMMENTS_PAGE_SIZE = 100;
+
 export default function IdeaDetail() {
   const { id } = useParams();
-  const { user } = useAuth();
   const navigate = useNavigate();
   const location = useLocation();
   const [idea, setIdea] = useState(null);
   const [comments, setComments] = useState([]);
+  const [commentsPage, setCommentsPage] = useState(null);
+  const [allowedActions, setAllowedActions] = useState([]);
   const [newComment, setNewComment] = useState('');
   const [actionComment, setActionComment] = useState('');
   const [loading, setLoading] = useState(true);
@@ -33,13 +35,18 @@ export default function IdeaDetail() {
 
   useEffect(() => {
     fetchIdea();
-    fetchComments();
   }, [id]);
 
+  // Idea, first page of comments, evaluation and permitted actions in one request
   const fetchIdea = async () => {
     try {
-      const response = await axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/ideas/${id}`);
-      setIdea(response.data);
+      const response = await axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/ideas/${id}/detail`, {
+        params: { comments_limit: COMMENTS_PAGE_SIZE }
+      });
+      setIdea(response.data.idea);
+      setComments(response.data.comments.items);
+      setCommentsPage(response.data.comments);
+      setAllowedActions(response.data.allowed_actions);
     } catch (error) {
       console.error('Failed to fetch idea:', error);
       toast.error('Failed to load Eye-dea');
@@ -48,10 +55,13 @@ export default function IdeaDetail() {
     }
   };
 
-  const fetchComments = async () => {
+  const loadMoreComments = async () => {
     try {
-      const response = await axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/ideas/${id}/comments`);
-      setComments(response.data);
+      const response = await axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/ideas/${id}/detail`, {
+        params: { comments_offset: comments.length, comments_limit: COMMENTS_PAGE_SIZE }
+      });
+      setComments([...comments, ...response.data.comments.items]);
+      setCommentsPage(response.data.comments);
     } catch (error) {
       console.error('Failed to fetch comments:', error);
     }
@@ -65,7 +75,7 @@ export default function IdeaDetail() {
       });
       toast.success('Comment added');
       setNewComment('');
-      fetchComments();
+      fetchIdea();
     } catch (error) {
       toast.error('Failed to add comment');
     }
@@ -79,7 +89,6 @@ export default function IdeaDetail() {
       toast.success('Eye-dea approved!');
       setActionComment('');
       fetchIdea();
-      fetchComments();
     } catch (error) {
       toast.error('Failed to approve Eye-dea');
     }
@@ -97,7 +106,6 @@ export default function IdeaDetail() {
       toast.success('Eye-dea declined');
       setActionComment('');
       fetchIdea();
-      fetchComments();
     } catch (error) {
       toast.error('Failed to decline Eye-dea');
     }
@@ -115,7 +123,6 @@ export default function IdeaDetail() {
       toast.success('Revision requested');
       setActionComment('');
       fetchIdea();
-      fetchComments();
     } catch (error) {
       toast.error('Failed to request revision');
     }
@@ -184,11 +191,9 @@ export default function IdeaDetail() {
     return <div className="text-center py-12">Eye-dea not found</div>;
   }
 
-  const isApprover = user?.role === 'approver' || user?.role === 'admin';
-  const isOwner = idea.submitted_by === user?.id;
-  const canEdit = isOwner && (idea.status === 'revision_requested' || idea.status === 'pending');
-  const isCIExcellence = (user?.role === 'approver' && user?.sub_role === 'ci_excellence') || user?.role === 'admin';
-  const canChangeStatus = isCIExcellence && idea.status === 'assigned_to_te';
+  const can = (action) => allowedActions.includes(action);
+  const canEdit = can('edit');
+  const canChangeStatus = can('ci_update_status');
 
   const handleBackToIdeas = () => {
     // Navigate back with preserved filters
@@ -311,7 +316,7 @@ export default function IdeaDetail() {
         </Card>
 
         {/* Resubmit Button for Revision Requested */}
-        {isOwner && idea.status === 'revision_requested' && (
+        {can('resubmit') && (
           <Card className="bg-orange-50 border-orange-300 border-2 shadow-md">
             <CardContent className="py-6">
               <div className="flex flex-col md:flex-row items-center justify-between gap-4">
@@ -358,7 +363,7 @@ export default function IdeaDetail() {
         )}
 
         {/* Approver Actions */}
-        {isApprover && idea.status === 'pending' && user.sub_role === 'approver' && (
+        {can('approve') && (
           <Card>
             <CardHeader>
               <CardTitle>Approver Actions</CardTitle>
@@ -406,7 +411,7 @@ export default function IdeaDetail() {
         )}
 
         {/* C.I. Excellence Team Evaluation */}
-        {user?.role === 'approver' && user?.sub_role === 'ci_excellence' && idea.status === 'approved' && (
+        {can('ci_evaluate') && (
           <CIEvaluationPanel 
             idea={idea}
             onEvaluationComplete={fetchIdea}
@@ -436,6 +441,11 @@ export default function IdeaDetail() {
                 ))}
               </div>
             )}
+            {commentsPage?.has_more && (
+              <Button data-testid="load-more-comments-btn" variant="outline" onClick={loadMoreComments}>
+                Load more comments
+              </Button>
+            )}
 
             <Separator />
 
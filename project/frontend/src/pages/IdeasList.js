@@ -2,6 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { Link, useSearchParams, useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { batchGet } from '../lib/api';
 import { Button } from '../components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '../components/ui/card';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '../components/ui/select';
@@ -40,6 +41,7 @@ export default function IdeasList() {
       if (filters.pillar) params.pillar = filters.pillar;
       if (filters.department) params.department = filters.department;
       if (filters.team) params.team = filters.team;
+      if (filters.status === 'implemented' || filters.status === 'declined') params.include_archived = true;
 
       const response = await axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/ideas`, { params });
       setIdeas(response.data);
@@ -52,14 +54,14 @@ export default function IdeasList() {
 
   const fetchFilterData = async () => {
     try {
-      const [pillarsRes, deptsRes, teamsRes] = await Promise.all([
-        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/admin/pillars`),
-        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/admin/departments`),
-        axios.get(`${process.env.REACT_APP_BACKEND_URL}/api/admin/teams`)
+      const [pillarList, deptList, teamList] = await batchGet([
+        '/api/admin/pillars',
+        '/api/admin/departments',
+        '/api/admin/teams'
       ]);
-      setPillars(pillarsRes.data);
-      setDepartments(deptsRes.data);
-      setTeams(teamsRes.data);
+      setPillars(pillarList);
+      setDepartments(deptList);
+      setTeams(teamList);
     } catch (error) {
       console.error('Failed to fetch filter data:', error);
     }
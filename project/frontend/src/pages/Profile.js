@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { storeTokens } from '../lib/api';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '../components/ui/card';
 import { Badge } from '../components/ui/badge';
 import { Button } from '../components/ui/button';
@@ -34,10 +35,12 @@ export default function Profile() {
     }
 
     try {
-      await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/change-password`, {
+      const response = await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/change-password`, {
         current_password: passwordForm.current_password,
         new_password: passwordForm.new_password
       });
+      // The change ends every other session; this one continues on the returned pair
+      storeTokens(response.data.access_token, response.data.refresh_token);
       toast.success('Password changed successfully');
       setPasswordForm({ current_password: '', new_password: '', confirm_password: '' });
       setChangingPassword(false);
@@ -53,9 +56,10 @@ export default function Profile() {
     }
 
     try {
-      await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/set-sub-role`, {
+      const response = await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/set-sub-role`, {
         sub_role: selectedSubRole
       });
+      storeTokens(response.data.access_token);
       toast.success('Sub-role updated successfully! Please refresh the page.');
       setChangingSubRole(false);
       // Refresh the page to update permissions
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
+import { storeTokens } from '../lib/api';
 import { Button } from '../components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '../components/ui/card';
 import { toast } from 'sonner';
@@ -13,9 +14,10 @@ export default function RoleSelection() {
   const handleRoleSelect = async (subRole) => {
     setSelecting(true);
     try {
-      await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/set-sub-role`, {
+      const response = await axios.post(`${process.env.REACT_APP_BACKEND_URL}/api/auth/set-sub-role`, {
         sub_role: subRole
       });
+      storeTokens(response.data.access_token);
       
       toast.success(`Role selected: ${subRole === 'approver' ? 'Approver' : 'C.I. Excellence Team'}`);
       
@@ -0,0 +1,87 @@
+-- Baseline schema: the tables the app has used since launch.
+-- Written with IF NOT EXISTS so it is a no-op on projects created through the dashboard.
+
+CREATE TABLE IF NOT EXISTS profiles (
+    id uuid PRIMARY KEY,
+    username text NOT NULL,
+    email text NOT NULL,
+    first_name text,
+    last_name text,
+    role text NOT NULL DEFAULT 'user',
+    sub_role text,
+    department text,
+    team text,
+    pillar text,
+    manager text,
+    approved_pillars text[] NOT NULL DEFAULT '{}',
+    approved_departments text[] NOT NULL DEFAULT '{}',
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS ideas (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    idea_number text NOT NULL,
+    pillar text,
+    title text NOT NULL,
+    improvement_type text,
+    current_process text,
+    suggested_solution text,
+    benefits text,
+    target_completion text,
+    department text,
+    team text,
+    status text NOT NULL DEFAULT 'pending',
+    submitted_by uuid,
+    submitted_by_username text,
+    assigned_approver uuid,
+    assigned_approver_username text,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    is_quick_win boolean,
+    complexity_level text,
+    savings_type text,
+    cost_savings numeric,
+    time_saved_hours numeric,
+    time_saved_minutes numeric,
+    evaluation_notes text,
+    assigned_to_tech boolean DEFAULT false,
+    tech_person_name text,
+    is_best_idea boolean DEFAULT false,
+    evaluated_by uuid,
+    evaluated_by_username text,
+    evaluated_at timestamptz
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    idea_id uuid NOT NULL,
+    user_id uuid NOT NULL,
+    username text NOT NULL,
+    comment_text text NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS pillars (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS departments (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    pillar text NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    pillar text NOT NULL,
+    department text NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tech_persons (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    email text,
+    specialization text
+);
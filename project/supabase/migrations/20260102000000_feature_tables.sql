@@ -0,0 +1,76 @@
+-- Tables and columns added by later features, with the indexes their own queries need.
+
+-- Local auth mode (AUTH_MODE=local).
+CREATE TABLE IF NOT EXISTS credentials (
+    id uuid PRIMARY KEY,
+    email text NOT NULL,
+    password_hash text NOT NULL,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE UNIQUE INDEX IF NOT EXISTS credentials_email_idx ON credentials (email);
+
+-- When the current status began (events.py).
+ALTER TABLE ideas ADD COLUMN IF NOT EXISTS status_changed_at timestamptz;
+
+-- Archive of closed ideas and their comments (archive.py).
+-- LIKE copies the columns ideas has at this point: later columns must be added to both tables.
+CREATE TABLE IF NOT EXISTS ideas_archive (
+    LIKE ideas INCLUDING DEFAULTS,
+    archived_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS ideas_archive_created_at_idx ON ideas_archive (created_at);
+CREATE INDEX IF NOT EXISTS ideas_archive_status_created_at_idx ON ideas_archive (status, created_at);
+CREATE INDEX IF NOT EXISTS ideas_status_updated_at_idx ON ideas (status, updated_at);
+
+CREATE TABLE IF NOT EXISTS comments_archive (
+    LIKE comments INCLUDING DEFAULTS,
+    archived_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS comments_archive_idea_id_created_at_idx ON comments_archive (idea_id, created_at);
+
+-- Status transition log (events.py).
+CREATE TABLE IF NOT EXISTS idea_events (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    idea_id uuid NOT NULL,
+    action text NOT NULL,
+    from_status text,
+    to_status text NOT NULL,
+    actor_id uuid,
+    actor_username text,
+    pillar text,
+    department text,
+    approver_id uuid,
+    approver_username text,
+    occurred_at timestamptz NOT NULL,
+    duration_seconds double precision,
+    age_seconds double precision
+);
+CREATE INDEX IF NOT EXISTS idea_events_occurred_at_idx ON idea_events (occurred_at);
+CREATE INDEX IF NOT EXISTS idea_events_idea_id_occurred_at_idx ON idea_events (idea_id, occurred_at);
+CREATE INDEX IF NOT EXISTS idea_events_pillar_occurred_at_idx ON idea_events (pillar, occurred_at);
+CREATE INDEX IF NOT EXISTS idea_events_department_occurred_at_idx ON idea_events (department, occurred_at);
+CREATE INDEX IF NOT EXISTS idea_events_approver_id_occurred_at_idx ON idea_events (approver_id, occurred_at);
+
+-- Leaderboard counters (leaderboards.py); id is "board:period:subject".
+CREATE TABLE IF NOT EXISTS leaderboard_counters (
+    id text PRIMARY KEY,
+    board text NOT NULL,
+    period text NOT NULL,
+    subject text NOT NULL,
+    label text,
+    value double precision NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS leaderboard_counters_board_period_value_idx ON leaderboard_counters (board, period, value);
+
+-- Change feed (changes.py).
+CREATE TABLE IF NOT EXISTS idea_tombstones (
+    id uuid PRIMARY KEY,
+    idea_number text,
+    deleted_at timestamptz NOT NULL,
+    deleted_by uuid
+);
+CREATE INDEX IF NOT EXISTS idea_tombstones_deleted_at_id_idx ON idea_tombstones (deleted_at, id);
+CREATE INDEX IF NOT EXISTS ideas_updated_at_id_idx ON ideas (updated_at, id);
@@ -0,0 +1,25 @@
+-- Indexes for the hot read paths. tests/test_query_plans.py EXPLAINs each query shape.
+
+-- GET /api/ideas: one optional equality filter, newest first. Each composite also serves the
+-- unfiltered dashboard counts by status and the "my ideas" count.
+CREATE INDEX IF NOT EXISTS ideas_status_created_at_idx ON ideas (status, created_at DESC);
+CREATE INDEX IF NOT EXISTS ideas_pillar_created_at_idx ON ideas (pillar, created_at DESC);
+CREATE INDEX IF NOT EXISTS ideas_department_created_at_idx ON ideas (department, created_at DESC);
+CREATE INDEX IF NOT EXISTS ideas_team_created_at_idx ON ideas (team, created_at DESC);
+CREATE INDEX IF NOT EXISTS ideas_submitted_by_created_at_idx ON ideas (submitted_by, created_at DESC);
+CREATE INDEX IF NOT EXISTS ideas_assigned_approver_created_at_idx ON ideas (assigned_approver, created_at DESC);
+
+-- GET /api/ideas without filters, and the created_at ranges of /api/dashboard/analytics.
+CREATE INDEX IF NOT EXISTS ideas_created_at_idx ON ideas (created_at);
+
+-- GET /api/ideas/{id}/comments.
+CREATE INDEX IF NOT EXISTS comments_idea_id_created_at_idx ON comments (idea_id, created_at);
+
+-- Login, registration and password reset look profiles up by username and email.
+CREATE UNIQUE INDEX IF NOT EXISTS profiles_username_idx ON profiles (username);
+CREATE UNIQUE INDEX IF NOT EXISTS profiles_email_idx ON profiles (email);
+
+-- Approver routing in create_idea: role = 'approver' AND approved_pillars @> '{<pillar>}'.
+-- btree_gin lets the equality on role live in the same GIN index as the array containment.
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+CREATE INDEX IF NOT EXISTS profiles_role_approved_pillars_idx ON profiles USING gin (role, approved_pillars);
@@ -0,0 +1,20 @@
+-- Idea attachments (attachments.py). The bytes live in object storage; these rows hold the metadata.
+
+CREATE TABLE IF NOT EXISTS idea_attachments (
+    id uuid PRIMARY KEY,
+    idea_id uuid NOT NULL,
+    filename text NOT NULL,
+    content_type text NOT NULL,
+    size_bytes bigint NOT NULL,
+    sha256 text NOT NULL,
+    storage_key text NOT NULL,
+    thumbnail_key text,
+    uploaded_by uuid,
+    uploaded_by_username text,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idea_attachments_idea_id_created_at_idx ON idea_attachments (idea_id, created_at);
+
+-- Idea lists return only this count, never the attachment rows.
+ALTER TABLE ideas ADD COLUMN IF NOT EXISTS attachment_count integer NOT NULL DEFAULT 0;
+ALTER TABLE ideas_archive ADD COLUMN IF NOT EXISTS attachment_count integer NOT NULL DEFAULT 0;
@@ -0,0 +1,16 @@
+-- Atomic leaderboard increments (leaderboards.apply). Each delta is added to the stored
+-- value in a single statement, so concurrent transitions never overwrite each other.
+
+CREATE OR REPLACE FUNCTION increment_leaderboard_counters(deltas jsonb)
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO leaderboard_counters (id, board, period, subject, label, value, updated_at)
+    SELECT d.id, d.board, d.period, d.subject, d.label, d.value, now()
+    FROM jsonb_to_recordset(deltas) AS d(id text, board text, period text, subject text, label text,
+                                         value double precision)
+    ON CONFLICT (id) DO UPDATE
+        SET value = leaderboard_counters.value + EXCLUDED.value,
+            label = EXCLUDED.label,
+            updated_at = EXCLUDED.updated_at;
+$$;
@@ -0,0 +1,16 @@
+-- Atomic attachment counts (attachments.refresh_count). The idea row is locked before
+-- counting, so concurrent uploads and deletes serialize and the last write sees every row.
+
+CREATE OR REPLACE FUNCTION refresh_attachment_count(target uuid)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    total integer;
+BEGIN
+    PERFORM 1 FROM ideas WHERE id = target FOR UPDATE;
+    SELECT count(*) INTO total FROM idea_attachments WHERE idea_id = target;
+    UPDATE ideas SET attachment_count = total, updated_at = now() WHERE id = target;
+    RETURN total;
+END;
+$$;
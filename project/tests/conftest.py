@@ -0,0 +1,138 @@
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "local.test.key")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "2")
+os.environ.setdefault("HEALTH_PROBES_ENABLED", "false")
+
+from memory_storage import MemoryStorage  # noqa: E402
+
+DEMO_USERS = [
+    {"username": "admin", "email": "admin@philtech.com", "password": "admin123", "role": "admin"},
+    {"username": "approver1", "email": "approver1@philtech.com", "password": "approver123", "role": "approver",
+     "sub_role": "approver", "approved_pillars": ["GBS"]},
+    {"username": "ci1", "email": "ci1@philtech.com", "password": "ci123", "role": "approver",
+     "sub_role": "ci_excellence", "approved_pillars": []},
+    {"username": "user1", "email": "user1@philtech.com", "password": "user123", "role": "user",
+     "pillar": "GBS", "department": "Operations", "team": "Allowance Billing"},
+]
+
+
+def seed(db: MemoryStorage, idea_count: int = 3) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    db.tables["pillars"] = [{"id": "p1", "name": "GBS"}, {"id": "p2", "name": "Tech"}]
+    db.tables["departments"] = [{"id": "d1", "name": "Operations", "pillar": "GBS"}]
+    db.tables["teams"] = [{"id": "t1", "name": "Allowance Billing", "pillar": "GBS", "department": "Operations"}]
+    db.tables["tech_persons"] = [{"id": "tp1", "name": "Tess Tech", "email": "tess@philtech.com", "specialization": "RPA"}]
+    db.tables["profiles"] = []
+    db.tables["comments"] = []
+    users = {}
+    for spec in DEMO_USERS:
+        auth = db.auth.sign_up({"email": spec["email"], "password": spec["password"]})
+        profile = {k: v for k, v in spec.items() if k != "password"}
+        profile.update({"id": auth.user.id, "created_at": now})
+        profile.setdefault("approved_pillars", [])
+        profile.setdefault("approved_departments", [])
+        db.tables["profiles"].append(profile)
+        users[spec["username"]] = profile
+
+    db.tables["ideas"] = []
+    for n in range(idea_count):
+        db.tables["ideas"].append({
+            "id": f"idea-{n + 1}",
+            "idea_number": f"EYE-{str(n + 1).zfill(5)}",
+            "pillar": "GBS",
+            "title": f"Idea {n + 1}",
+            "improvement_type": "Process",
+            "current_process": "Manual",
+            "suggested_solution": "Automate",
+            "benefits": "Faster",
+            "target_completion": "2026-12-31",
+            "department": "Operations",
+            "team": "Allowance Billing",
+            "status": "pending",
+            "submitted_by": users["user1"]["id"],
+            "submitted_by_username": "user1",
+            "assigned_approver": users["approver1"]["id"],
+            "assigned_approver_username": "approver1",
+            "created_at": now,
+            "updated_at": now,
+        })
+    return users
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    import config
+    import core
+    import idempotency
+    import read_cache
+    import replicas
+    import resilience
+    import revocation
+    from query_trace import TracedClient
+
+    db = MemoryStorage()
+    users = seed(db)
+    monkeypatch.setattr(core.db, "client", TracedClient(db))
+    monkeypatch.setattr(config, "QUERY_TRACE_HEADERS", True)
+    monkeypatch.setattr(config, "AUTH_MODE", "supabase")
+    monkeypatch.setattr(config, "STORAGE_BACKEND", "supabase")
+    monkeypatch.setattr(core.rate_limiter, "enabled", True)
+    core.rate_limiter.reset()
+    read_cache.cache.clear()
+    idempotency.store.reset()
+    replicas.pins.reset()
+    resilience.registry.reset()
+    revocation.revocations.reset()
+    return core, db, users
+
+
+@pytest.fixture
+def client(backend):
+    from fastapi.testclient import TestClient
+    import server
+
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(backend):
+    core, db, _ = backend
+
+    def headers_for(username: str) -> dict:
+        profile = next(p for p in db.tables["profiles"] if p["username"] == username)
+        token = core.create_access_token(data=core.access_claims(profile))
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers_for
+
+
+@pytest.fixture
+def query_budget(backend, monkeypatch):
+    import application
+    import config
+
+    traces = []
+    monkeypatch.setattr(config, "QUERY_TRACE_LOG", True)
+    monkeypatch.setattr(application, "log_trace", traces.append)
+
+    def check(response, budget: int):
+        trace = traces[-1]
+        assert response.headers["X-Query-Count"] == str(trace.count)
+        detail = "\n".join(f"  {r.describe()}" for r in trace.records)
+        assert trace.count <= budget, f"{trace.label} made {trace.count} queries (budget {budget}):\n{detail}"
+        return trace
+
+    return check
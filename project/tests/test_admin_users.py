@@ -0,0 +1,90 @@
+"""
+/admin/users: server-side filters, prefix search, paging and demo-account exclusion.
+"""
+import pytest
+
+
+@pytest.fixture
+def org(backend):
+    _, db, _ = backend
+    for n in range(12):
+        db.tables["profiles"].append({
+            "id": f"emp-{n}", "username": f"employee{n:02d}", "email": f"employee{n:02d}@philtech.com",
+            "first_name": "Maria" if n % 3 == 0 else "Jose", "last_name": f"Santos{n}",
+            "role": "approver" if n < 3 else "user", "sub_role": "ci_excellence" if n == 0 else None,
+            "pillar": "Tech" if n % 2 else "GBS", "department": "Operations", "team": f"Team {n % 4}",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        })
+    return db
+
+
+def usernames(response):
+    return [u["username"] for u in response.json()]
+
+
+class TestAdminUsers:
+    """Admin user listing"""
+
+    def test_demo_accounts_excluded(self, client, auth_headers, org):
+        """Demo accounts are filtered in the query, not after it"""
+        response = client.get("/api/admin/users", headers=auth_headers("admin"))
+        assert response.status_code == 200
+        names = usernames(response)
+        assert not {"admin", "approver1", "user1"} & set(names)
+        assert "ci1" in names
+        assert response.headers["X-Total-Count"] == str(len(names))
+
+    def test_filters(self, client, auth_headers, org):
+        """role, sub_role, pillar, department and team filter server-side"""
+        headers = auth_headers("admin")
+        response = client.get("/api/admin/users", headers=headers, params={"role": "approver", "pillar": "GBS"})
+        assert usernames(response) == ["employee00", "employee02"]
+        response = client.get("/api/admin/users", headers=headers, params={"sub_role": "ci_excellence"})
+        assert usernames(response) == ["ci1", "employee00"]
+        response = client.get("/api/admin/users", headers=headers,
+                              params={"department": "Operations", "team": "Team 1"})
+        assert usernames(response) == ["employee01", "employee05", "employee09"]
+
+    def test_prefix_search(self, client, auth_headers, org):
+        """q matches the start of username, first or last name, or email"""
+        headers = auth_headers("admin")
+        response = client.get("/api/admin/users", headers=headers, params={"q": "maria", "role": "user"})
+        assert usernames(response) == ["employee03", "employee06", "employee09"]
+        response = client.get("/api/admin/users", headers=headers, params={"q": "santos1"})
+        assert usernames(response) == ["employee01", "employee10", "employee11"]
+        response = client.get("/api/admin/users", headers=headers, params={"q": "ploy"})
+        assert usernames(response) == []
+
+    def test_search_strips_filter_syntax(self, client, auth_headers, org):
+        """Characters that would alter the or-filter are dropped"""
+        response = client.get("/api/admin/users", headers=auth_headers("admin"), params={"q": "employee01,role.eq.admin"})
+        assert response.status_code == 200
+
+    def test_search_escapes_like_wildcards(self, backend, client, auth_headers, org):
+        """_, % and \\ in q match themselves, not any character"""
+        _, db, _ = backend
+        for n, username in enumerate(["ops_lead", "opsxlead", "ops%desk", "ops\\desk"]):
+            db.tables["profiles"].append({"id": f"ops-{n}", "username": username, "email": f"staff{n}@philtech.com",
+                                          "role": "user", "created_at": "2026-01-01T00:00:00+00:00"})
+        headers = auth_headers("admin")
+        assert usernames(client.get("/api/admin/users", headers=headers, params={"q": "ops_"})) == ["ops_lead"]
+        assert usernames(client.get("/api/admin/users", headers=headers, params={"q": "ops%d"})) == ["ops%desk"]
+        assert usernames(client.get("/api/admin/users", headers=headers, params={"q": "ops\\"})) == ["ops\\desk"]
+
+    def test_paging(self, client, auth_headers, org):
+        """limit/offset page through users ordered by username with the total in X-Total-Count"""
+        headers = auth_headers("admin")
+        first = client.get("/api/admin/users", headers=headers, params={"role": "user", "limit": 5})
+        second = client.get("/api/admin/users", headers=headers, params={"role": "user", "limit": 5, "offset": 5})
+        assert first.headers["X-Total-Count"] == "9"
+        assert usernames(first) == [f"employee{n:02d}" for n in range(3, 8)]
+        assert usernames(second) == [f"employee{n:02d}" for n in range(8, 12)]
+
+    def test_page_size_bounded(self, client, auth_headers):
+        """Page size is capped"""
+        response = client.get("/api/admin/users", headers=auth_headers("admin"), params={"limit": 10_000})
+        assert response.status_code == 422
+
+    def test_requires_admin(self, client, auth_headers):
+        """Non-admins are rejected"""
+        assert client.get("/api/admin/users", headers=auth_headers("user1")).status_code == 403
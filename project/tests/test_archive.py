@@ -0,0 +1,170 @@
+"""
+Archival of closed ideas: the batch job and reads that union archived rows only when needed.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import archive
+
+OLD = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+
+
+@pytest.fixture
+def closed_ideas(backend):
+    _, db, users = backend
+    template = db.tables["ideas"][0]
+    for n, status in enumerate(["implemented", "declined", "implemented"]):
+        db.tables["ideas"].append({
+            **template, "id": f"old-{n}", "idea_number": f"EYE-9000{n}", "title": f"Old idea {n}",
+            "status": status, "created_at": OLD, "updated_at": OLD, "is_best_idea": n == 2,
+        })
+        db.tables["comments"].append({
+            "id": f"old-comment-{n}", "idea_id": f"old-{n}", "user_id": users["user1"]["id"],
+            "username": "user1", "comment_text": "Closed", "created_at": OLD,
+        })
+    db.tables["ideas"].append({**template, "id": "old-pending", "idea_number": "EYE-90009",
+                               "status": "pending", "created_at": OLD, "updated_at": OLD})
+    return db
+
+
+class TestArchiveJob:
+    """Batch archival"""
+
+    def test_moves_closed_ideas_with_comments(self, closed_ideas):
+        """Old implemented/declined ideas and their comments move to the archive tables"""
+        totals = archive.archive_closed_ideas(closed_ideas, days=180, batch_size=2)
+        assert totals["ideas"] == 3 and totals["comments"] == 3
+        assert {i["id"] for i in closed_ideas.tables["ideas_archive"]} == {"old-0", "old-1", "old-2"}
+        assert all(i["archived_at"] for i in closed_ideas.tables["ideas_archive"])
+        assert not [i for i in closed_ideas.tables["ideas"] if i["id"].startswith("old-") and i["id"] != "old-pending"]
+        assert not [c for c in closed_ideas.tables["comments"] if c["idea_id"].startswith("old-")]
+        assert len(closed_ideas.tables["comments_archive"]) == 3
+
+    def test_recent_and_open_ideas_stay(self, closed_ideas):
+        """Active ideas and recently closed ones are untouched"""
+        closed_ideas.tables["ideas"][0]["status"] = "implemented"
+        archive.archive_closed_ideas(closed_ideas, days=180)
+        ids = {i["id"] for i in closed_ideas.tables["ideas"]}
+        assert {"idea-1", "old-pending"} <= ids
+
+    def test_concurrent_changes_stay_hot(self, closed_ideas, monkeypatch):
+        """An idea reopened and a comment added after the select are neither deleted nor archived"""
+        table = closed_ideas.table
+        now = datetime.now(timezone.utc).isoformat()
+
+        def interleave(name):
+            if name == "ideas_archive" and not closed_ideas.tables.get("ideas_archive"):
+                reopened = next(i for i in closed_ideas.tables["ideas"] if i["id"] == "old-1")
+                reopened.update(status="pending", updated_at=now)
+                closed_ideas.tables["comments"].append({"id": "late", "idea_id": "old-0", "comment_text": "Late",
+                                                        "created_at": now})
+            return table(name)
+
+        monkeypatch.setattr(closed_ideas, "table", interleave)
+        totals = archive.archive_closed_ideas(closed_ideas, days=180)
+        assert totals["ideas"] == 2 and totals["comments"] == 2
+        assert {i["id"] for i in closed_ideas.tables["ideas_archive"]} == {"old-0", "old-2"}
+        assert {c["id"] for c in closed_ideas.tables["comments_archive"]} == {"old-comment-0", "old-comment-2"}
+        hot = {c["id"] for c in closed_ideas.tables["comments"]}
+        assert {"late", "old-comment-1"} <= hot
+        assert next(i for i in closed_ideas.tables["ideas"] if i["id"] == "old-1")["status"] == "pending"
+
+    def test_dry_run(self, closed_ideas):
+        """Dry runs count without moving anything"""
+        before = len(closed_ideas.tables["ideas"])
+        assert archive.archive_closed_ideas(closed_ideas, days=180, dry_run=True)["ideas"] == 3
+        assert len(closed_ideas.tables["ideas"]) == before
+        assert not closed_ideas.tables.get("ideas_archive")
+
+    def test_rerun_is_idempotent(self, closed_ideas):
+        """A second run finds nothing and keeps one archive row per idea"""
+        archive.archive_closed_ideas(closed_ideas, days=180)
+        assert archive.archive_closed_ideas(closed_ideas, days=180)["ideas"] == 0
+        assert len(closed_ideas.tables["ideas_archive"]) == 3
+
+    def test_runs_on_sqlite(self, tmp_path):
+        """The job runs unchanged on the SQLite engine"""
+        from storage import SQLiteStorage
+
+        store = SQLiteStorage(str(tmp_path / "archive.db"))
+        store.table("ideas").insert({
+            "id": "a", "idea_number": "EYE-00001", "pillar": "GBS", "title": "Old", "improvement_type": "P",
+            "current_process": "c", "suggested_solution": "s", "benefits": "b", "status": "declined",
+            "submitted_by": "u", "submitted_by_username": "u", "created_at": OLD, "updated_at": OLD,
+        }).execute()
+        store.table("comments").insert({"idea_id": "a", "user_id": "u", "username": "u", "comment_text": "x",
+                                        "created_at": OLD}).execute()
+        totals = archive.archive_closed_ideas(store, days=180)
+        assert (totals["ideas"], totals["comments"]) == (1, 1)
+        assert store.table("ideas").select("id").execute().data == []
+        assert store.table("ideas_archive").select("id").execute().data == [{"id": "a"}]
+        store.close()
+
+
+class TestArchivedReads:
+    """Reads that reach into the archive"""
+
+    @pytest.fixture(autouse=True)
+    def archived(self, closed_ideas):
+        archive.archive_closed_ideas(closed_ideas, days=180)
+
+    def test_get_idea_falls_back_to_archive(self, client, auth_headers):
+        """Archived ideas remain addressable by id"""
+        response = client.get("/api/ideas/old-0", headers=auth_headers("user1"))
+        assert response.status_code == 200
+        assert response.json()["is_archived"] is True
+
+    def test_list_excludes_archive_by_default(self, client, auth_headers):
+        """The default list only reads the hot table"""
+        ids = {i["id"] for i in client.get("/api/ideas", headers=auth_headers("user1")).json()}
+        assert "old-0" not in ids
+        response = client.get("/api/ideas", headers=auth_headers("user1"), params={"include_archived": "true"})
+        ids = [i["id"] for i in response.json()]
+        assert {"old-0", "old-1", "old-2", "idea-1"} <= set(ids)
+        assert ids.index("idea-1") < ids.index("old-0")
+
+    def test_archived_comments(self, client, auth_headers):
+        """Archived comments are returned when asked for"""
+        headers = auth_headers("user1")
+        assert client.get("/api/ideas/old-0/comments", headers=headers).json() == []
+        response = client.get("/api/ideas/old-0/comments", headers=headers, params={"include_archived": "true"})
+        assert [c["id"] for c in response.json()] == ["old-comment-0"]
+
+    def test_analytics_and_stats_include_archive(self, client, auth_headers):
+        """All-time analytics and stats still count archived ideas"""
+        headers = auth_headers("ci1")
+        analytics = client.get("/api/dashboard/analytics", headers=headers).json()
+        assert analytics["implemented_count"] == 2
+        assert analytics["declined_count"] == 1
+        assert analytics["best_idea"]["id"] == "old-2"
+        stats = client.get("/api/dashboard/stats", headers=headers).json()
+        assert stats["total_ideas"] == 7
+        assert stats["declined_ideas"] == 1
+
+    def test_recent_window_skips_archive(self, backend, client, auth_headers, query_budget):
+        """A date window newer than the archive cutoff never queries the archive"""
+        _, db, _ = backend
+        db.tables["ideas"][0]["is_best_idea"] = True
+        start = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        response = client.get("/api/dashboard/analytics", headers=auth_headers("ci1"), params={"start_date": start})
+        trace = query_budget(response, 3)
+        assert response.json()["implemented_count"] == 0
+        assert "ideas_archive" not in [r.table for r in trace.records]
+
+    def test_export_includes_archive(self, client, auth_headers):
+        """Excel export includes archived ideas"""
+        from io import BytesIO
+        from openpyxl import load_workbook
+
+        response = client.get("/api/dashboard/export-excel", headers=auth_headers("ci1"))
+        sheet = load_workbook(BytesIO(response.content)).active
+        assert sheet.max_row == 1 + 7
+
+    def test_new_idea_numbers_do_not_reuse_archived(self, client, auth_headers):
+        """Idea numbering counts archived ideas"""
+        response = client.post("/api/ideas", headers=auth_headers("user1"), json={
+            "pillar": "GBS", "title": "New", "improvement_type": "Process", "current_process": "Manual",
+            "suggested_solution": "Automate", "benefits": "Faster", "target_completion": "2026-12-31",
+        })
+        assert response.json()["idea_number"] == "EYE-00008"
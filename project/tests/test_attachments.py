@@ -0,0 +1,255 @@
+"""
+Idea attachments: streamed uploads, metadata rows, ranged downloads and thumbnails.
+"""
+import hashlib
+import io
+import uuid
+
+import pytest
+
+import attachments
+from storage import SQLiteStorage
+
+PAYLOAD = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def objects(backend, tmp_path, monkeypatch):
+    import config
+
+    monkeypatch.setattr(config, "ATTACHMENT_CHUNK_BYTES", 1024)
+    monkeypatch.setattr(attachments, "store", attachments.FilesystemObjectStore(str(tmp_path)))
+    yield tmp_path
+    attachments.shutdown()
+
+
+def chunks(data, size=1000):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def upload(client, headers, data=PAYLOAD, idea_id="idea-1", filename="process.bin", content_type=None):
+    headers = {**headers, "Content-Type": content_type or "application/octet-stream"}
+    return client.post(f"/api/ideas/{idea_id}/attachments", params={"filename": filename}, headers=headers,
+                       content=chunks(data))
+
+
+def stored_files(root):
+    return sorted(p for p in root.rglob("*") if p.is_file())
+
+
+class TestUpload:
+    """Chunked uploads into the object store"""
+
+    def test_streamed_upload_is_stored_with_metadata(self, objects, backend, client, auth_headers):
+        """The object matches the body byte for byte; the row records size and digest"""
+        _, db, _ = backend
+        response = upload(client, auth_headers("user1"), filename="../../screens/flow.bin")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["filename"] == "flow.bin"
+        assert body["size_bytes"] == len(PAYLOAD)
+        assert body["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+        assert stored_files(objects)[0].read_bytes() == PAYLOAD
+        assert db.tables["idea_attachments"][0]["storage_key"] == f"idea-1/{body['id']}"
+
+    def test_lists_carry_only_the_count(self, objects, client, auth_headers):
+        """Idea lists show attachment_count, the rows come from the attachments endpoint"""
+        headers = auth_headers("user1")
+        upload(client, headers)
+        upload(client, headers, filename="second.bin")
+
+        ideas = {i["id"]: i for i in client.get("/api/ideas", headers=headers).json()}
+        assert ideas["idea-1"]["attachment_count"] == 2
+        assert ideas["idea-2"]["attachment_count"] == 0
+        assert "attachments" not in ideas["idea-1"]
+        listed = client.get("/api/ideas/idea-1/attachments", headers=headers).json()
+        assert [a["filename"] for a in listed] == ["process.bin", "second.bin"]
+
+    def test_oversized_upload_leaves_nothing_behind(self, objects, backend, client, auth_headers, monkeypatch):
+        """The limit is enforced while streaming and the partial object is removed"""
+        import config
+
+        _, db, _ = backend
+        monkeypatch.setattr(config, "ATTACHMENT_MAX_BYTES", 4000)
+        response = upload(client, auth_headers("user1"))
+        assert response.status_code == 413
+        assert stored_files(objects) == []
+        assert not db.tables.get("idea_attachments")
+
+    def test_only_submitter_or_admin(self, objects, client, auth_headers):
+        """Other users may not attach files to an idea"""
+        assert upload(client, auth_headers("approver1")).status_code == 403
+        assert upload(client, auth_headers("admin")).status_code == 200
+        assert upload(client, auth_headers("user1"), idea_id="missing").status_code == 404
+
+
+class InterleavedUpload(SQLiteStorage):
+    def __init__(self, path):
+        super().__init__(path)
+        self.interleaved = False
+
+    def run(self, query):
+        result = super().run(query)
+        if query.table == "idea_attachments" and query.operation == "select" and not self.interleaved:
+            self.interleaved = True
+            self.table("idea_attachments").insert({"id": str(uuid.uuid4()), "idea_id": "idea-1"}).execute()
+            attachments.refresh_count(self, "idea-1")
+        return result
+
+
+class TestAttachmentCount:
+    """The count is taken and written in one database call"""
+
+    def test_one_call_and_no_read(self, objects, client, auth_headers, query_budget):
+        """An upload refreshes the count without counting the rows itself"""
+        response = upload(client, auth_headers("user1"))
+        trace = query_budget(response, 10)
+        assert ("refresh_attachment_count", "rpc") in [(r.table, r.operation) for r in trace.records]
+        assert not [r for r in trace.records if r.table == "idea_attachments" and r.operation == "select"]
+
+    def test_interleaved_upload_is_counted(self):
+        """An upload landing between another's count and write is not lost from the count"""
+        store = InterleavedUpload(":memory:")
+        store.table("ideas").insert({"id": "idea-1", "title": "Shared", "attachment_count": 0}).execute()
+        store.table("idea_attachments").insert({"id": str(uuid.uuid4()), "idea_id": "idea-1"}).execute()
+        attachments.refresh_count(store, "idea-1")
+        store.interleaved = True
+        rows = store.table("idea_attachments").select("id", count="exact").eq("idea_id", "idea-1").execute().count
+        idea = store.table("ideas").select("attachment_count").eq("id", "idea-1").maybeSingle().execute()
+        assert idea.data["attachment_count"] == rows
+        store.close()
+
+
+class TestDownload:
+    """Whole and ranged downloads"""
+
+    @pytest.fixture
+    def attachment(self, objects, client, auth_headers):
+        return upload(client, auth_headers("user1")).json()
+
+    def test_full_download(self, attachment, client, auth_headers):
+        """Without Range the whole object streams back"""
+        response = client.get(f"/api/attachments/{attachment['id']}", headers=auth_headers("approver1"))
+        assert response.status_code == 200
+        assert response.content == PAYLOAD
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-length"] == str(len(PAYLOAD))
+
+    def test_ranged_download(self, attachment, client, auth_headers):
+        """A byte range returns 206 with Content-Range"""
+        headers = {**auth_headers("user1"), "Range": "bytes=1000-2999"}
+        response = client.get(f"/api/attachments/{attachment['id']}", headers=headers)
+        assert response.status_code == 206
+        assert response.content == PAYLOAD[1000:3000]
+        assert response.headers["content-range"] == f"bytes 1000-2999/{len(PAYLOAD)}"
+
+    def test_suffix_and_unsatisfiable_ranges(self, attachment, client, auth_headers):
+        """bytes=-N is the last N bytes; a start past the end is 416"""
+        url = f"/api/attachments/{attachment['id']}"
+        tail = client.get(url, headers={**auth_headers("user1"), "Range": "bytes=-100"})
+        assert tail.content == PAYLOAD[-100:]
+        beyond = client.get(url, headers={**auth_headers("user1"), "Range": f"bytes={len(PAYLOAD)}-"})
+        assert beyond.status_code == 416
+        assert beyond.headers["content-range"] == f"bytes */{len(PAYLOAD)}"
+
+    def test_delete(self, attachment, objects, client, auth_headers):
+        """Deleting removes the row, the object and one from the count"""
+        headers = auth_headers("user1")
+        assert client.delete(f"/api/attachments/{attachment['id']}", headers=auth_headers("approver1")).status_code == 403
+        assert client.delete(f"/api/attachments/{attachment['id']}", headers=headers).status_code == 200
+        assert stored_files(objects) == []
+        assert client.get("/api/ideas/idea-1", headers=headers).json()["attachment_count"] == 0
+        assert client.get(f"/api/attachments/{attachment['id']}", headers=headers).status_code == 404
+
+    def test_deleting_the_idea_purges_attachments(self, attachment, objects, backend, client, auth_headers):
+        """Attachments do not outlive their idea"""
+        _, db, _ = backend
+        assert client.delete("/api/ideas/idea-1", headers=auth_headers("admin")).status_code == 200
+        assert stored_files(objects) == []
+        assert db.tables["idea_attachments"] == []
+
+
+class TestParseRange:
+    """Range header parsing"""
+
+    def test_forms(self):
+        """Closed, open-ended and suffix ranges; invalid headers are ignored"""
+        assert attachments.parse_range("bytes=0-9", 100) == (0, 9)
+        assert attachments.parse_range("bytes=90-", 100) == (90, 99)
+        assert attachments.parse_range("bytes=90-500", 100) == (90, 99)
+        assert attachments.parse_range("bytes=-500", 100) == (0, 99)
+        assert attachments.parse_range("bytes=9-0", 100) is None
+        assert attachments.parse_range("bytes=0-1,5-6", 100) is None
+        assert attachments.parse_range("items=0-1", 100) is None
+        with pytest.raises(attachments.RangeNotSatisfiable):
+            attachments.parse_range("bytes=100-", 100)
+
+
+class FakeS3:
+    def __init__(self):
+        self.calls = []
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create", None))
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, PartNumber, Body, **kwargs):
+        self.calls.append(("part", len(Body)))
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, MultipartUpload, **kwargs):
+        self.calls.append(("complete", [p["PartNumber"] for p in MultipartUpload["Parts"]]))
+
+    def put_object(self, Body, **kwargs):
+        self.calls.append(("put", len(Body)))
+
+
+class TestS3Writer:
+    """Multipart uploads keep at most one part in memory"""
+
+    def test_large_object_goes_up_in_parts(self):
+        """Full parts are sent as they fill; the remainder is the last part"""
+        s3 = FakeS3()
+        writer = attachments.S3Writer(s3, "bucket", "key", part_size=1000)
+        for chunk in chunks(PAYLOAD, 700):
+            writer.write(chunk)
+            assert len(writer.buffer) < 1000
+        writer.commit()
+        parts = [size for call, size in s3.calls if call == "part"]
+        assert parts == [1000] * 10 + [240]
+        assert s3.calls[-1] == ("complete", list(range(1, 12)))
+
+    def test_small_object_is_a_single_put(self):
+        """Objects smaller than one part skip the multipart protocol"""
+        s3 = FakeS3()
+        writer = attachments.S3Writer(s3, "bucket", "key", part_size=1000)
+        writer.write(b"x" * 10)
+        writer.commit()
+        assert s3.calls == [("put", 10)]
+
+
+class TestThumbnails:
+    """Image thumbnails from the process pool"""
+
+    def test_image_upload_gets_a_thumbnail(self, objects, client, auth_headers):
+        """A thumbnail is rendered after the upload and served as PNG"""
+        Image = pytest.importorskip("PIL.Image")
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 600), "red").save(buffer, format="JPEG")
+        headers = auth_headers("user1")
+
+        created = upload(client, headers, data=buffer.getvalue(), filename="screen.jpg", content_type="image/jpeg")
+        listed = client.get("/api/ideas/idea-1/attachments", headers=headers).json()
+        assert listed[0]["has_thumbnail"]
+
+        response = client.get(f"/api/attachments/{created.json()['id']}/thumbnail", headers=headers)
+        assert response.headers["content-type"] == "image/png"
+        assert Image.open(io.BytesIO(response.content)).size == (256, 128)
+
+    def test_other_files_have_none(self, objects, client, auth_headers):
+        """Non-image attachments are not thumbnailed"""
+        created = upload(client, auth_headers("user1")).json()
+        assert not created["has_thumbnail"]
+        response = client.get(f"/api/attachments/{created['id']}/thumbnail", headers=auth_headers("user1"))
+        assert response.status_code == 404
@@ -0,0 +1,88 @@
+"""
+/api/batch: several GET routes in one request, authenticated once.
+"""
+
+
+def batch(client, headers, *requests):
+    return client.post("/api/batch", headers=headers, json={"requests": list(requests)})
+
+
+class TestBatch:
+    """Multiplexed sub-requests"""
+
+    def test_bodies_match_direct_requests(self, client, auth_headers):
+        """Each sub-response is what the route returns on its own"""
+        headers = auth_headers("admin")
+        response = batch(client, headers, {"path": "/api/admin/pillars"}, {"path": "/api/admin/departments"},
+                         {"path": "/api/ideas/idea-2", "id": "idea"})
+        assert response.status_code == 200
+        pillars, departments, idea = response.json()["responses"]
+        assert [r["id"] for r in (pillars, departments, idea)] == ["0", "1", "idea"]
+        assert pillars["status"] == 200
+        assert pillars["body"] == client.get("/api/admin/pillars", headers=headers).json()
+        assert departments["body"] == client.get("/api/admin/departments", headers=headers).json()
+        assert idea["body"]["id"] == "idea-2"
+        assert idea["headers"]["content-type"] == "application/json"
+
+    def test_status_per_sub_request(self, client, auth_headers):
+        """Failures are reported per sub-request and do not fail the batch"""
+        response = batch(client, auth_headers("user1"), {"path": "/api/ideas/missing"},
+                         {"path": "/api/admin/users"}, {"path": "/api/ideas/idea-1"}, {"path": "/api/nowhere"})
+        assert response.status_code == 200
+        assert [r["status"] for r in response.json()["responses"]] == [404, 403, 200, 404]
+        assert response.json()["responses"][0]["body"] == {"detail": "Idea not found"}
+
+    def test_authenticates_once(self, backend, client, auth_headers):
+        """Sub-requests reuse the caller's identity; only the ideas themselves are read"""
+        _, db, _ = backend
+        headers = auth_headers("user1")
+        before = db.executed
+        batch(client, headers, {"path": "/api/ideas/idea-1"}, {"path": "/api/ideas/idea-2"},
+              {"path": "/api/ideas/idea-3"})
+        assert db.executed - before == 3
+
+    def test_query_params(self, backend, client, auth_headers):
+        """params and an inline query string are both passed on"""
+        _, db, _ = backend
+        db.tables["ideas"][0]["status"] = "approved"
+        headers = auth_headers("user1")
+        inline, separate = batch(client, headers, {"path": "/api/ideas?status=approved"},
+                                 {"path": "/api/ideas", "params": {"status": "pending"}}).json()["responses"]
+        assert [i["id"] for i in inline["body"]] == ["idea-1"]
+        assert {i["id"] for i in separate["body"]} == {"idea-2", "idea-3"}
+
+    def test_only_api_get_routes(self, client, auth_headers):
+        """The batch endpoint itself and paths outside /api are refused"""
+        response = batch(client, auth_headers("user1"), {"path": "/api/batch"}, {"path": "/docs"},
+                         {"path": "/api/../docs"})
+        assert [r["status"] for r in response.json()["responses"]] == [400, 400, 400]
+
+    def test_file_and_export_routes_are_refused(self, client, auth_headers):
+        """Streaming and binary routes are not buffered into the batch response"""
+        response = batch(client, auth_headers("admin"), {"path": "/api/dashboard/export"},
+                         {"path": "/api/dashboard/export-excel"}, {"path": "/api/attachments/att-1"},
+                         {"path": "/api/attachments/att-1/thumbnail"}, {"path": "/api/health/metrics"})
+        assert [r["status"] for r in response.json()["responses"]] == [400] * 5
+
+    def test_non_json_responses_are_dropped(self):
+        """A route that answers with anything but JSON is reported as 406 without its body"""
+        import asyncio
+
+        from fastapi import FastAPI
+        from fastapi.responses import PlainTextResponse
+
+        import multiplex
+
+        app = FastAPI()
+        app.get("/text")(lambda: PlainTextResponse("\xff" * 1000))
+        scope = multiplex.sub_scope({}, "/text", b"", {"id": "u"})
+        assert asyncio.run(multiplex.dispatch(app, scope)) == (406, {}, {"detail": "Only JSON responses can be batched"})
+
+    def test_limits_and_auth(self, client, auth_headers, monkeypatch):
+        """The batch size is capped and the caller must be authenticated"""
+        import config
+
+        monkeypatch.setattr(config, "BATCH_MAX_REQUESTS", 2)
+        requests = [{"path": "/api/ideas/idea-1"}] * 3
+        assert batch(client, auth_headers("user1"), *requests).status_code == 400
+        assert batch(client, {}, {"path": "/api/ideas/idea-1"}).status_code in (401, 403)
@@ -0,0 +1,68 @@
+"""
+Smoke tests for the offline benchmark suite (tiny dataset, few requests).
+"""
+from benchmarks.datagen import generate
+from benchmarks.run import main, percentile
+
+
+class TestDataGenerator:
+    """Synthetic dataset generation"""
+
+    def test_generate_is_deterministic(self):
+        """Same seed yields the same ids and org structure"""
+        first = generate(idea_count=50, employees=20, seed=7)
+        second = generate(idea_count=50, employees=20, seed=7)
+        assert [i["id"] for i in first["tables"]["ideas"]] == [i["id"] for i in second["tables"]["ideas"]]
+        assert len(first["tables"]["ideas"]) == 50
+
+    def test_ideas_reference_existing_org(self):
+        """Ideas point at generated submitters, approvers and teams"""
+        dataset = generate(idea_count=100, employees=30, seed=1)
+        profiles = {p["id"] for p in dataset["tables"]["profiles"]}
+        teams = {t["name"] for t in dataset["tables"]["teams"]}
+        idea_ids = {i["id"] for i in dataset["tables"]["ideas"]}
+        for idea in dataset["tables"]["ideas"]:
+            assert idea["submitted_by"] in profiles
+            assert idea["assigned_approver"] in profiles
+            assert idea["team"] in teams
+        assert all(c["idea_id"] in idea_ids for c in dataset["tables"]["comments"])
+
+
+class TestRunner:
+    """In-process benchmark run"""
+
+    def test_percentile(self):
+        """Nearest-rank percentiles"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+
+    def test_in_process_run_reports_all_scenarios(self, tmp_path):
+        """Every scenario runs without errors and results are saved"""
+        out = tmp_path / "result.json"
+        report = main(["--ideas", "60", "--employees", "20", "--requests", "4", "--warmup", "1",
+                       "--concurrency", "2", "--out", str(out)])
+        assert out.exists()
+        for name, stats in report["scenarios"].items():
+            assert stats["errors"] == 0, name
+            assert stats["p99_ms"] >= stats["p50_ms"]
+
+    def test_login_storm_reports_throughput(self, tmp_path):
+        """Login storm runs on local credentials without errors"""
+        from benchmarks.login_storm import main as login_storm
+
+        report = login_storm(["--duration", "0.5", "--concurrency", "2", "--rounds", "4", "--workers", "1",
+                              "--users", "5", "--out", str(tmp_path / "storm.json")])
+        assert report["logins"]["errors"] == 0
+        assert report["logins"]["rps"] > 0
+
+    def test_export_throughput_covers_every_format(self, tmp_path):
+        """Each export format downloads without errors and reports throughput"""
+        from benchmarks.export_throughput import main as export_throughput
+
+        report = export_throughput(["--ideas", "30", "--employees", "20", "--repeat", "1", "--page-size", "8",
+                                    "--out", str(tmp_path / "export.json")])
+        for fmt, stats in report["formats"].items():
+            assert stats["errors"] == 0, fmt
+            assert stats["bytes"] > 0
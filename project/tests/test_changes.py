@@ -0,0 +1,84 @@
+"""
+/ideas/changes: keyset change feed over ideas and delete tombstones.
+"""
+import pytest
+
+import changes
+
+
+@pytest.fixture(autouse=True)
+def no_lag(monkeypatch):
+    import config
+
+    monkeypatch.setattr(config, "CHANGE_FEED_LAG_SECONDS", 0)
+
+
+def sync(client, headers, cursor=None, limit=2):
+    seen, deleted = [], []
+    while True:
+        params = {"limit": limit, **({"since": cursor} if cursor else {})}
+        body = client.get("/api/ideas/changes", headers=headers, params=params).json()
+        seen += [idea["id"] for idea in body["changes"]]
+        deleted += [row["id"] for row in body["deleted"]]
+        cursor = body["next_cursor"]
+        if not body["has_more"]:
+            return seen, deleted, cursor
+
+
+class TestChangeFeed:
+    """Incremental sync"""
+
+    def test_initial_sync_pages_everything(self, backend, client, auth_headers):
+        """Without a cursor the feed pages through every idea once"""
+        _, db, _ = backend
+        template = db.tables["ideas"][0]
+        for n in range(5):
+            db.tables["ideas"].append({**template, "id": f"same-{n}", "idea_number": f"EYE-S{n}"})
+        seen, deleted, _ = sync(client, auth_headers("user1"))
+        assert sorted(seen) == sorted(i["id"] for i in db.tables["ideas"])
+        assert deleted == []
+
+    def test_resume_returns_only_deltas(self, backend, client, auth_headers):
+        """After a sync only updated ideas and deletions come back"""
+        headers = auth_headers("admin")
+        _, _, cursor = sync(client, headers)
+        client.post("/api/ideas/idea-2/approve", headers=auth_headers("approver1"), json={})
+        client.delete("/api/ideas/idea-3", headers=headers)
+        seen, deleted, cursor = sync(client, headers, cursor)
+        assert seen == ["idea-2"]
+        assert deleted == ["idea-3"]
+        assert sync(client, headers, cursor)[:2] == ([], [])
+
+    def test_unmarking_best_idea_is_a_change(self, backend, client, auth_headers):
+        """Clearing the previous best idea bumps its updated_at"""
+        _, db, _ = backend
+        db.tables["ideas"][0]["is_best_idea"] = True
+        headers = auth_headers("ci1")
+        _, _, cursor = sync(client, headers)
+        client.post("/api/ideas/idea-2/mark-best-idea", headers=headers)
+        seen, _, _ = sync(client, headers, cursor)
+        assert sorted(seen) == ["idea-1", "idea-2"]
+
+    def test_recent_writes_wait_for_lag(self, client, auth_headers, monkeypatch):
+        """Rows newer than the lag horizon are held back"""
+        import config
+
+        monkeypatch.setattr(config, "CHANGE_FEED_LAG_SECONDS", 3600)
+        seen, _, _ = sync(client, auth_headers("user1"))
+        assert seen == []
+
+    def test_invalid_cursor(self, client, auth_headers):
+        """Garbage cursors are a 400"""
+        response = client.get("/api/ideas/changes", headers=auth_headers("user1"), params={"since": "not-a-cursor"})
+        assert response.status_code == 400
+
+    def test_cursor_round_trip(self):
+        """Cursors encode the position of both streams"""
+        positions = {"ideas": ("2026-01-01T00:00:00+00:00", "idea-1"), "deleted": None}
+        assert changes.decode_cursor(changes.encode_cursor(positions)) == positions
+
+    def test_page_costs_bounded_queries(self, backend, client, auth_headers, query_budget):
+        """A resumed page reads each stream with at most two range queries"""
+        _, _, cursor = sync(client, auth_headers("user1"))
+        response = client.get("/api/ideas/changes", headers=auth_headers("user1"), params={"since": cursor})
+        query_budget(response, 5)
@@ -0,0 +1,108 @@
+"""
+/ideas/ci-evaluate: many C.I. evaluations with set-based writes and one notification batch.
+"""
+import pytest
+
+import leaderboards
+
+EVALUATIONS = [
+    {"idea_id": "idea-1", "is_quick_win": True},
+    {"idea_id": "idea-2", "is_quick_win": False, "assigned_to_tech": True, "tech_person_name": "Tess Tech",
+     "savings_type": "cost_savings", "cost_savings": 1200},
+    {"idea_id": "idea-3", "is_quick_win": False, "complexity_level": "high"},
+    {"idea_id": "missing", "is_quick_win": True},
+]
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    import config
+    import routers.workflow
+
+    sent = []
+
+    async def record(messages):
+        sent.append(messages)
+
+    monkeypatch.setattr(config, "RESEND_API_KEY", "test-key")
+    monkeypatch.setattr(routers.workflow, "send_email_batch_async", record)
+    return sent
+
+
+class TestBatchEvaluation:
+    """Bulk evaluation"""
+
+    def test_same_status_rules_as_single_evaluation(self, backend, client, auth_headers, batches):
+        """Quick wins are implemented, tech assignments go to TE, others keep their status"""
+        _, db, users = backend
+        response = client.post("/api/ideas/ci-evaluate", headers=auth_headers("ci1"), json={"evaluations": EVALUATIONS})
+        assert response.status_code == 200
+        assert response.json() == {"evaluated": ["idea-1", "idea-2", "idea-3"], "not_evaluated": [],
+                                   "not_found": ["missing"]}
+        ideas = {idea["id"]: idea for idea in db.tables["ideas"]}
+        assert [ideas[i]["status"] for i in ("idea-1", "idea-2", "idea-3")] == ["implemented", "assigned_to_te", "pending"]
+        assert ideas["idea-3"]["complexity_level"] == "high"
+        assert all(ideas[i]["evaluated_by"] == users["ci1"]["id"] for i in ("idea-1", "idea-2", "idea-3"))
+        assert len(db.tables["ideas"]) == 3
+        assert [e["idea_id"] for e in db.tables["idea_events"]] == ["idea-1", "idea-2", "idea-3"]
+
+    def test_set_based_writes(self, client, auth_headers, batches, query_budget):
+        """Ideas given the same evaluation share one UPDATE, so the query count does not grow with the batch"""
+        quick_wins = [{"idea_id": f"idea-{n}", "is_quick_win": True} for n in (1, 2, 3)]
+        response = client.post("/api/ideas/ci-evaluate", headers=auth_headers("ci1"), json={"evaluations": quick_wins})
+        trace = query_budget(response, 7)
+        assert [r.operation for r in trace.records if r.table == "ideas"] == ["select", "update"]
+
+    def test_notifications_are_one_batch(self, client, auth_headers, batches):
+        """Submitters are notified with a single batch send"""
+        client.post("/api/ideas/ci-evaluate", headers=auth_headers("ci1"), json={"evaluations": EVALUATIONS})
+        assert len(batches) == 1
+        assert [m["to"] for m in batches[0]] == ["user1@philtech.com"] * 3
+        assert "Quick Win:</strong> Yes" in batches[0][0]["html"]
+
+    def test_leaderboards_match_single_evaluations(self, backend, client, auth_headers, batches):
+        """Counters end up where a rebuild would put them"""
+        _, db, _ = backend
+        leaderboards.rebuild(db)
+        client.post("/api/ideas/ci-evaluate", headers=auth_headers("ci1"), json={"evaluations": EVALUATIONS})
+        incremental = {row["id"]: row["value"] for row in db.tables["leaderboard_counters"] if row["value"]}
+        leaderboards.rebuild(db)
+        rebuilt = {row["id"]: row["value"] for row in db.tables["leaderboard_counters"] if row["value"]}
+        assert incremental == rebuilt
+
+    def test_concurrent_changes_are_not_overwritten(self, backend, client, auth_headers, batches, monkeypatch):
+        """Ideas deleted or moved on after the read are reported, never re-inserted or clobbered"""
+        import routers.workflow
+
+        _, db, _ = backend
+        evaluation_update = routers.workflow.evaluation_update
+
+        def concurrent_edit(idea, *args):
+            if idea["id"] == "idea-1":
+                db.tables["ideas"] = [i for i in db.tables["ideas"] if i["id"] != "idea-2"]
+                next(i for i in db.tables["ideas"] if i["id"] == "idea-3").update(status="declined", title="Edited")
+            return evaluation_update(idea, *args)
+
+        monkeypatch.setattr(routers.workflow, "evaluation_update", concurrent_edit)
+        response = client.post("/api/ideas/ci-evaluate", headers=auth_headers("ci1"), json={"evaluations": EVALUATIONS})
+        assert response.json() == {"evaluated": ["idea-1"], "not_evaluated": ["idea-2", "idea-3"],
+                                   "not_found": ["missing"]}
+        ideas = {idea["id"]: idea for idea in db.tables["ideas"]}
+        assert "idea-2" not in ideas
+        assert ideas["idea-3"]["status"] == "declined"
+        assert ideas["idea-3"]["title"] == "Edited"
+        assert "evaluated_by" not in ideas["idea-3"]
+        assert [e["idea_id"] for e in db.tables["idea_events"]] == ["idea-1"]
+        assert [m["to"] for m in batches[0]] == ["user1@philtech.com"]
+
+    def test_requires_ci_excellence(self, client, auth_headers):
+        """Only C.I. Excellence and admins may evaluate"""
+        response = client.post("/api/ideas/ci-evaluate", headers=auth_headers("approver1"),
+                               json={"evaluations": EVALUATIONS})
+        assert response.status_code == 403
+
+    def test_duplicate_ids_are_rejected(self, client, auth_headers):
+        """An idea appears at most once per batch"""
+        response = client.post("/api/ideas/ci-evaluate", headers=auth_headers("ci1"),
+                               json={"evaluations": [EVALUATIONS[0], EVALUATIONS[0]]})
+        assert response.status_code == 400
@@ -0,0 +1,54 @@
+"""
+/ideas/batch: many ideas in request order with a single in() query.
+"""
+
+
+class TestIdeaBatch:
+    """Multi-id lookups"""
+
+    def test_request_order_and_not_found_markers(self, client, auth_headers):
+        """Results follow the request, including duplicates and unknown ids"""
+        response = client.get("/api/ideas/batch", headers=auth_headers("user1"),
+                              params={"ids": "idea-3,missing,idea-1,idea-3"})
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["id"] for r in results] == ["idea-3", "missing", "idea-1", "idea-3"]
+        assert [r["found"] for r in results] == [True, False, True, True]
+        assert results[1]["idea"] is None
+        assert results[0]["idea"]["idea_number"] == "EYE-00003"
+
+    def test_one_query_when_all_hot(self, client, auth_headers, query_budget):
+        """Hot ideas cost one in() query after auth"""
+        response = client.get("/api/ideas/batch", headers=auth_headers("user1"), params={"ids": "idea-1,idea-2"})
+        query_budget(response, 2)
+
+    def test_missing_ids_fall_back_to_archive(self, backend, client, auth_headers, query_budget):
+        """Ids not in the hot table are looked up in the archive with one more query"""
+        _, db, _ = backend
+        archived = {**db.tables["ideas"].pop(), "status": "declined"}
+        db.tables["ideas_archive"] = [archived]
+        response = client.post("/api/ideas/batch", headers=auth_headers("user1"),
+                               json={"ids": ["idea-1", archived["id"], "missing"]})
+        assert [r["found"] for r in response.json()["results"]] == [True, True, False]
+        query_budget(response, 3)
+
+    def test_repeated_query_params(self, client, auth_headers):
+        """ids may also be repeated"""
+        response = client.get("/api/ideas/batch?ids=idea-2&ids=idea-1", headers=auth_headers("user1"))
+        assert [r["id"] for r in response.json()["results"]] == ["idea-2", "idea-1"]
+
+    def test_too_many_ids(self, client, auth_headers, monkeypatch):
+        """Requests past IDEA_BATCH_MAX_IDS are rejected"""
+        import config
+
+        monkeypatch.setattr(config, "IDEA_BATCH_MAX_IDS", 2)
+        response = client.post("/api/ideas/batch", headers=auth_headers("user1"), json={"ids": ["a", "b", "c"]})
+        assert response.status_code == 400
+
+    def test_post_does_not_invalidate_read_cache(self, client, auth_headers):
+        """The POST form is a read"""
+        import read_cache
+
+        version = read_cache.cache.version
+        client.post("/api/ideas/batch", headers=auth_headers("user1"), json={"ids": ["idea-1"]})
+        assert read_cache.cache.version == version
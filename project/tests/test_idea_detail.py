@@ -0,0 +1,76 @@
+"""
+/ideas/{id}/detail: the idea page in one request.
+"""
+
+
+def add_comments(db, idea_id, count, table="comments"):
+    db.tables.setdefault(table, []).extend({
+        "id": f"{idea_id}-c{n}",
+        "idea_id": idea_id,
+        "user_id": "someone",
+        "username": "someone",
+        "comment_text": f"Comment {n}",
+        "created_at": f"2026-01-01T00:00:{n:02d}+00:00",
+    } for n in range(count))
+
+
+class TestIdeaDetail:
+    """Idea, comments, evaluation and allowed actions together"""
+
+    def test_bundle(self, backend, client, auth_headers):
+        """The bundle matches what the separate endpoints return"""
+        _, db, _ = backend
+        add_comments(db, "idea-1", 3)
+        headers = auth_headers("user1")
+        detail = client.get("/api/ideas/idea-1/detail", headers=headers).json()
+
+        assert detail["idea"] == client.get("/api/ideas/idea-1", headers=headers).json()
+        assert detail["comments"]["items"] == client.get("/api/ideas/idea-1/comments", headers=headers).json()
+        assert detail["comments"]["total"] == 3 and not detail["comments"]["has_more"]
+        assert detail["evaluation"]["is_evaluated"] is False
+
+    def test_two_queries_after_auth(self, client, auth_headers, query_budget):
+        """The idea and the comment page are read concurrently, one query each"""
+        response = client.get("/api/ideas/idea-1/detail", headers=auth_headers("user1"))
+        assert response.status_code == 200
+        query_budget(response, 3)
+
+    def test_comment_pagination(self, backend, client, auth_headers):
+        """Comments come in pages, oldest first"""
+        _, db, _ = backend
+        add_comments(db, "idea-1", 5)
+        page = client.get("/api/ideas/idea-1/detail", headers=auth_headers("user1"),
+                          params={"comments_offset": 2, "comments_limit": 2}).json()["comments"]
+        assert [c["comment_text"] for c in page["items"]] == ["Comment 2", "Comment 3"]
+        assert page["total"] == 5 and page["has_more"]
+
+    def test_allowed_actions_follow_role_and_status(self, backend, client, auth_headers):
+        """Each user sees the workflow actions the endpoints would accept"""
+        _, db, _ = backend
+        db.tables["ideas"][1]["status"] = "approved"
+
+        def actions(username, idea_id="idea-1"):
+            return client.get(f"/api/ideas/{idea_id}/detail", headers=auth_headers(username)).json()["allowed_actions"]
+
+        assert set(actions("user1")) == {"comment", "edit", "add_attachment"}
+        assert {"approve", "decline", "request_revision"} <= set(actions("approver1"))
+        assert "approve" not in actions("ci1")
+        assert "ci_evaluate" in actions("ci1", "idea-2")
+        assert "ci_evaluate" not in actions("approver1", "idea-2")
+        assert "delete" in actions("admin")
+
+    def test_archived_idea(self, backend, client, auth_headers):
+        """Archived ideas bring their archived comments and allow no actions"""
+        _, db, _ = backend
+        archived = {**db.tables["ideas"].pop(), "status": "declined", "archived_at": "2026-01-01T00:00:00+00:00"}
+        db.tables["ideas_archive"] = [archived]
+        add_comments(db, archived["id"], 2, table="comments_archive")
+
+        detail = client.get(f"/api/ideas/{archived['id']}/detail", headers=auth_headers("user1")).json()
+        assert detail["idea"]["is_archived"]
+        assert detail["comments"]["total"] == 2
+        assert detail["allowed_actions"] == []
+
+    def test_not_found(self, client, auth_headers):
+        """Unknown ids are a 404"""
+        assert client.get("/api/ideas/missing/detail", headers=auth_headers("user1")).status_code == 404
@@ -0,0 +1,105 @@
+"""
+Idea status event log and the cycle-time report built from it.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import events
+
+
+def hours_ago(hours):
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+
+
+def event(from_status, to_status, duration_hours, age_hours=None, **extra):
+    return {
+        "from_status": from_status, "to_status": to_status, "pillar": "GBS", "department": "Operations",
+        "approver_username": "approver1", "occurred_at": hours_ago(0),
+        "duration_seconds": duration_hours * 3600,
+        "age_seconds": (age_hours if age_hours is not None else duration_hours) * 3600,
+        **extra,
+    }
+
+
+class TestEventLog:
+    """Transitions append to idea_events"""
+
+    def test_approval_appends_event(self, backend, client, auth_headers):
+        """Approving records from/to status, actor, grouping keys and time spent pending"""
+        _, db, users = backend
+        db.tables["ideas"][0]["created_at"] = hours_ago(48)
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("approver1"), json={"comment": "Yes"})
+        [row] = db.tables["idea_events"]
+        assert (row["action"], row["from_status"], row["to_status"]) == ("approve", "pending", "approved")
+        assert row["actor_id"] == users["approver1"]["id"]
+        assert (row["pillar"], row["approver_username"]) == ("GBS", "approver1")
+        assert row["duration_seconds"] == pytest.approx(48 * 3600, abs=60)
+        assert db.tables["ideas"][0]["status_changed_at"] == row["occurred_at"]
+
+    def test_full_workflow_is_appended_in_order(self, backend, client, auth_headers):
+        """Each transition adds a row; earlier rows are never rewritten"""
+        _, db, _ = backend
+        client.post("/api/ideas/idea-1/request-revision", headers=auth_headers("approver1"), json={"comment": "More"})
+        client.post("/api/ideas/idea-1/resubmit", headers=auth_headers("user1"))
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("approver1"), json={})
+        client.post("/api/ideas/idea-1/ci-evaluate", headers=auth_headers("ci1"), json={
+            "is_quick_win": False, "complexity_level": "High", "assigned_to_tech": True, "tech_person_name": "Tess Tech",
+        })
+        client.post("/api/ideas/idea-1/ci-update-status", headers=auth_headers("ci1"), json={"new_status": "implemented"})
+        steps = [(e["action"], e["to_status"]) for e in db.tables["idea_events"]]
+        assert steps == [
+            ("request_revision", "revision_requested"), ("resubmit", "pending"), ("approve", "approved"),
+            ("ci_evaluate", "assigned_to_te"), ("ci_update_status", "implemented"),
+        ]
+        froms = [e["from_status"] for e in db.tables["idea_events"]]
+        assert froms == ["pending", "revision_requested", "pending", "approved", "assigned_to_te"]
+
+    def test_rejected_transition_records_nothing(self, backend, client, auth_headers):
+        """Failed authorization does not append an event"""
+        _, db, _ = backend
+        assert client.post("/api/ideas/idea-1/approve", headers=auth_headers("user1"), json={}).status_code == 403
+        assert not db.tables.get("idea_events")
+
+
+class TestCycleTimes:
+    """Percentiles computed from the event index"""
+
+    def test_percentiles_per_metric(self):
+        """Each metric picks the matching events and reports nearest-rank percentiles"""
+        rows = [event("pending", "approved", h) for h in (1, 2, 3, 4)]
+        rows.append(event("pending", "declined", 10))
+        rows.append(event("assigned_to_te", "implemented", 5, age_hours=100))
+        report = events.cycle_times(rows)["all"]
+        assert report["time_in_pending"] == {"count": 5, "p50_hours": 3.0, "p90_hours": 10.0, "p95_hours": 10.0}
+        assert report["approval_latency"]["count"] == 4
+        assert report["approval_latency"]["p50_hours"] == 2.0
+        assert report["time_to_implementation"]["p50_hours"] == 100.0
+        assert report["revision_turnaround"] == {"count": 0, "p50_hours": None, "p90_hours": None, "p95_hours": None}
+
+    def test_group_by(self):
+        """Rows are grouped by pillar, department or approver"""
+        rows = [event("pending", "approved", 1), event("pending", "approved", 9, pillar="Tech", approver_username=None)]
+        assert list(events.cycle_times(rows, "pillar")) == ["GBS", "Tech"]
+        assert list(events.cycle_times(rows, "approver")) == ["Unassigned", "approver1"]
+
+    def test_endpoint_window_and_grouping(self, backend, client, auth_headers, query_budget):
+        """The endpoint filters the occurred_at window in one query"""
+        _, db, _ = backend
+        db.tables["idea_events"] = [
+            {**event("pending", "approved", 2), "id": "e1", "approver_id": "a1", "occurred_at": hours_ago(1)},
+            {**event("pending", "declined", 6), "id": "e2", "approver_id": "a1", "occurred_at": hours_ago(24 * 60)},
+        ]
+        response = client.get("/api/dashboard/cycle-times", headers=auth_headers("approver1"),
+                               params={"group_by": "approver", "start_date": hours_ago(24 * 30)})
+        trace = query_budget(response, 2)
+        body = response.json()
+        assert body["event_count"] == 1
+        assert body["groups"]["approver1"]["time_in_pending"]["p50_hours"] == 2.0
+        assert "occurred_at=gte." in " ".join(trace.records[-1].filters)
+
+    def test_endpoint_validation(self, client, auth_headers):
+        """Only approvers may read it, and group_by is checked"""
+        assert client.get("/api/dashboard/cycle-times", headers=auth_headers("user1")).status_code == 403
+        response = client.get("/api/dashboard/cycle-times", headers=auth_headers("admin"), params={"group_by": "team"})
+        assert response.status_code == 400
@@ -0,0 +1,229 @@
+"""
+Idempotency-Key: retried writes replay the stored response instead of running again.
+"""
+import time
+
+import httpx
+import pytest
+
+from idempotency import MemoryIdempotencyStore, SQLiteIdempotencyStore
+from memory_storage import MemoryStorage
+
+IDEA = {
+    "pillar": "GBS", "title": "Retry me", "improvement_type": "Process", "current_process": "Manual",
+    "suggested_solution": "Automate", "benefits": "Faster", "target_completion": "2026-12-31",
+    "department": "Operations", "team": "Allowance Billing",
+}
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    import routers.ideas
+
+    emails = []
+
+    async def record(to, subject, html):
+        emails.append(to)
+
+    monkeypatch.setattr(routers.ideas, "send_email_async", record)
+    return emails
+
+
+class TestReplay:
+    """Retries under the same key"""
+
+    def test_create_idea_runs_once(self, backend, client, auth_headers, sent):
+        """A retried submission returns the same idea without a second insert or email"""
+        _, db, _ = backend
+        headers = {**auth_headers("user1"), "Idempotency-Key": "submit-1"}
+        first = client.post("/api/ideas", headers=headers, json=IDEA)
+        retry = client.post("/api/ideas", headers=headers, json=IDEA)
+        assert first.status_code == retry.status_code == 200
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert len(db.tables["ideas"]) == 4
+        assert len(sent) == 1
+
+    def test_replay_only_authenticates(self, client, auth_headers):
+        """A replay runs no queries at all"""
+        headers = {**auth_headers("approver1"), "Idempotency-Key": "approve-1"}
+        client.post("/api/ideas/idea-1/approve", headers=headers, json={})
+        retry = client.post("/api/ideas/idea-1/approve", headers=headers, json={})
+        assert retry.status_code == 200
+        assert retry.headers["X-Query-Count"] == "0"
+
+    def test_errors_are_replayed(self, client, auth_headers):
+        """Client errors are stored like successes"""
+        headers = {**auth_headers("user1"), "Idempotency-Key": "comment-1"}
+        body = {"comment_text": "hello"}
+        first = client.post("/api/ideas/missing/comments", headers=headers, json=body)
+        retry = client.post("/api/ideas/missing/comments", headers=headers, json=body)
+        assert first.status_code == retry.status_code == 404
+        assert retry.headers["Idempotent-Replayed"] == "true"
+
+    def test_keys_are_scoped_per_user(self, backend, client, auth_headers):
+        """The same key from two users is two requests"""
+        _, db, _ = backend
+        for username in ("user1", "ci1"):
+            client.post("/api/ideas/idea-1/comments", json={"comment_text": "hi"},
+                        headers={**auth_headers(username), "Idempotency-Key": "same"})
+        assert len(db.tables["comments"]) == 2
+
+    def test_without_key_every_request_runs(self, backend, client, auth_headers):
+        """Requests without the header are not deduplicated"""
+        _, db, _ = backend
+        for _ in range(2):
+            client.post("/api/ideas/idea-1/comments", headers=auth_headers("user1"), json={"comment_text": "hi"})
+        assert len(db.tables["comments"]) == 2
+
+
+class TestMisuse:
+    """Conflicting use of a key"""
+
+    def test_different_body_is_rejected(self, client, auth_headers):
+        """Reusing a key for another payload is a 422"""
+        headers = {**auth_headers("user1"), "Idempotency-Key": "k"}
+        client.post("/api/ideas/idea-1/comments", headers=headers, json={"comment_text": "a"})
+        response = client.post("/api/ideas/idea-1/comments", headers=headers, json={"comment_text": "b"})
+        assert response.status_code == 422
+
+    def test_in_flight_duplicate_conflicts(self, backend, client, auth_headers):
+        """A retry racing the original gets a 409"""
+        import idempotency
+
+        _, _, users = backend
+        headers = {**auth_headers("user1"), "Idempotency-Key": "k"}
+        body = b'{"comment_text": "a"}'
+        fingerprint = idempotency.fingerprint("POST", "/api/ideas/idea-1/comments", body)
+        idempotency.store.begin(f"{users['user1']['id']}:k", fingerprint, 60)
+        response = client.post("/api/ideas/idea-1/comments", headers={**headers, "Content-Type": "application/json"},
+                               content=body)
+        assert response.status_code == 409
+        assert response.headers["Retry-After"] == "1"
+
+    def test_server_errors_release_the_key(self, backend, client, auth_headers, monkeypatch):
+        """A 5xx lets the retry run"""
+        import routers.ideas
+
+        _, db, _ = backend
+        headers = {**auth_headers("user1"), "Idempotency-Key": "k"}
+        with monkeypatch.context() as patch, pytest.raises(TypeError):
+            patch.setattr(routers.ideas, "generate_idea_number", None)
+            client.post("/api/ideas", headers=headers, json=IDEA)
+        retry = client.post("/api/ideas", headers=headers, json=IDEA)
+        assert retry.status_code == 200
+        assert "Idempotent-Replayed" not in retry.headers
+        assert len(db.tables["ideas"]) == 4
+
+
+class SlowInserts(MemoryStorage):
+    name = "supabase"
+
+    def __init__(self, tables, delay=0.0, lose_response=False):
+        super().__init__()
+        self.tables = tables
+        self.delay = delay
+        self.lose_response = lose_response
+
+    def table(self, name):
+        query = super().table(name)
+        execute = query.execute
+
+        def slow_execute():
+            result = execute()
+            if name == "ideas" and query.operation == "insert":
+                time.sleep(self.delay)
+                if self.lose_response:
+                    raise httpx.ReadTimeout("timed out")
+            return result
+
+        query.execute = slow_execute
+        return query
+
+
+class TestUpstreamTimeouts:
+    """Slow or unconfirmed writes are never run twice"""
+
+    @pytest.fixture
+    def wrap(self, backend, monkeypatch):
+        import core
+        import resilience
+        from query_trace import TracedClient
+
+        _, db, _ = backend
+        monkeypatch.setitem(resilience.registry.timeouts, "write", 0.01)
+
+        def install(**options):
+            client = resilience.registry.wrap(SlowInserts(db.tables, **options))
+            monkeypatch.setattr(core.db, "client", TracedClient(client))
+
+        return install
+
+    def test_slow_insert_then_retry(self, backend, client, auth_headers, wrap, sent):
+        """The write completes instead of timing out, and the retry replays it"""
+        _, db, _ = backend
+        wrap(delay=0.1)
+        headers = {**auth_headers("user1"), "Idempotency-Key": "slow"}
+        first = client.post("/api/ideas", headers=headers, json=IDEA)
+        retry = client.post("/api/ideas", headers=headers, json=IDEA)
+        assert first.status_code == 200
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert len(db.tables["ideas"]) == 4
+
+    def test_unconfirmed_insert_keeps_the_key(self, backend, client, auth_headers, wrap, sent):
+        """A 504 on a write that may have committed does not free the key for a duplicate"""
+        _, db, _ = backend
+        wrap(lose_response=True)
+        headers = {**auth_headers("user1"), "Idempotency-Key": "lost"}
+        first = client.post("/api/ideas", headers=headers, json=IDEA)
+        retry = client.post("/api/ideas", headers=headers, json=IDEA)
+        assert first.status_code == 504
+        assert retry.status_code == 409
+        assert len(db.tables["ideas"]) == 4
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda now, tmp_path: MemoryIdempotencyStore(clock=lambda: now[0]),
+    lambda now, tmp_path: SQLiteIdempotencyStore(str(tmp_path / "keys.db"), clock=lambda: now[0]),
+], ids=["memory", "sqlite"])
+class TestStores:
+    """TTL semantics shared by both stores"""
+
+    def test_completed_records_expire(self, make_store, tmp_path):
+        """Stored responses are replayed until the TTL passes"""
+        now = [0.0]
+        store = make_store(now, tmp_path)
+        assert store.begin("k", "fp", 60) is None
+        store.complete("k", 201, b"{}", "application/json", 100)
+        now[0] = 99.0
+        record = store.begin("k", "fp", 60)
+        assert (record.status_code, record.body) == (201, b"{}")
+        now[0] = 101.0
+        assert store.begin("k", "fp", 60) is None
+
+    def test_prune_drops_expired_records(self, make_store, tmp_path):
+        """Expired responses and reservations are deleted, live ones stay"""
+        now = [0.0]
+        store = make_store(now, tmp_path)
+        store.begin("done", "fp", 60)
+        store.complete("done", 201, b"{}", "application/json", 10)
+        store.begin("live", "fp", 60)
+        now[0] = 30.0
+        store.prune()
+        assert store.begin("done", "fp", 60) is None
+        assert store.begin("live", "fp", 60).fingerprint == "fp"
+        now[0] = 200.0
+        store.prune()
+        if isinstance(store, SQLiteIdempotencyStore):
+            assert store._connect().execute("SELECT count(*) FROM idempotency_keys").fetchone()[0] == 0
+        else:
+            assert not store.records
+
+    def test_abandoned_reservations_expire(self, make_store, tmp_path):
+        """A reservation that never completes frees the key after the lock timeout"""
+        now = [0.0]
+        store = make_store(now, tmp_path)
+        store.begin("k", "fp", 60)
+        assert not store.begin("k", "fp", 60).completed
+        now[0] = 61.0
+        assert store.begin("k", "fp", 60) is None
@@ -0,0 +1,55 @@
+"""
+Cold-start budget: importing the app must stay cheap and must not pull in heavy SDKs.
+Set IMPORT_TIME_BUDGET_MS to tighten or loosen the budget on slower machines.
+"""
+import os
+import subprocess
+import sys
+
+from tests.conftest import BACKEND_DIR
+
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1500"))
+DEFERRED_MODULES = [
+    "supabase", "postgrest", "gotrue", "resend", "passlib", "jose", "openpyxl", "pandas", "numpy", "pyarrow", "boto3", "PIL",
+]
+
+
+def import_server():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import sys, server; print(' '.join(sorted(sys.modules)))"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "STORAGE_BACKEND": "supabase", "EAGER_CLIENTS": "false"},
+    )
+    assert result.returncode == 0, result.stderr
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative) / 1000
+    return timings, set(result.stdout.split())
+
+
+class TestImportTime:
+    """python -X importtime budget for `import server`"""
+
+    def test_server_import_within_budget(self):
+        """Cumulative import time of the server module stays under budget"""
+        timings, _ = import_server()
+        assert timings["server"] < IMPORT_TIME_BUDGET_MS, (
+            f"import server took {timings['server']:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
+        )
+
+    def test_heavy_modules_are_deferred(self):
+        """Storage SDKs, mail, crypto and spreadsheet libraries load on first use"""
+        _, modules = import_server()
+        assert [m for m in DEFERRED_MODULES if m in modules] == []
+
+    def test_all_domain_routers_mounted(self):
+        """The factory still mounts every domain"""
+        import server
+
+        paths = {route.path for route in server.app.routes}
+        for path in ["/api/health", "/api/auth/login", "/api/ideas", "/api/ideas/{idea_id}/approve",
+                     "/api/dashboard/stats", "/api/admin/users"]:
+            assert path in paths
@@ -0,0 +1,199 @@
+"""
+Leaderboards: counters maintained on create, evaluation and status changes, and top-N reads.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import leaderboards
+from storage import SQLiteStorage
+
+IDEA_PAYLOAD = {
+    "pillar": "GBS", "title": "Ranked", "improvement_type": "Process", "current_process": "Manual",
+    "suggested_solution": "Automate", "benefits": "Faster", "target_completion": "2026-12-31",
+    "department": "Operations", "team": "Allowance Billing",
+}
+
+
+def counters(db):
+    return {row["id"]: row["value"] for row in db.tables.get("leaderboard_counters", [])}
+
+
+def this_month():
+    return leaderboards.period_key("month", datetime.now(timezone.utc))
+
+
+class TestCounters:
+    """Incremental maintenance"""
+
+    def test_create_counts_submitter_in_every_period(self, backend, client, auth_headers):
+        """A new idea increments the submitter for all-time, year, month and week"""
+        _, db, users = backend
+        client.post("/api/ideas", headers=auth_headers("user1"), json=IDEA_PAYLOAD)
+        client.post("/api/ideas", headers=auth_headers("user1"), json=IDEA_PAYLOAD)
+        values = counters(db)
+        user_id = users["user1"]["id"]
+        assert values[f"submitters:all:{user_id}"] == 2
+        assert values[f"submitters:{this_month()}:{user_id}"] == 2
+        assert len([k for k in values if k.startswith("submitters:")]) == 4
+
+    def test_quick_win_counts_department_implemented(self, backend, client, auth_headers):
+        """A quick win implements the idea and credits its department"""
+        _, db, _ = backend
+        client.post("/api/ideas/idea-1/ci-evaluate", headers=auth_headers("ci1"), json={"is_quick_win": True})
+        assert counters(db)["departments:all:Operations"] == 1
+
+    def test_status_round_trip_nets_out(self, backend, client, auth_headers):
+        """Leaving implemented again removes the department credit"""
+        _, db, _ = backend
+        db.tables["ideas"][0]["status"] = "assigned_to_te"
+        client.post("/api/ideas/idea-1/ci-update-status", headers=auth_headers("ci1"), json={"new_status": "implemented"})
+        assert counters(db)["departments:all:Operations"] == 1
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("approver1"), json={})
+        assert counters(db)["departments:all:Operations"] == 0
+
+    def test_evaluation_adds_cost_savings(self, backend, client, auth_headers):
+        """Evaluated cost savings accrue to the submitter"""
+        _, db, users = backend
+        client.post("/api/ideas/idea-1/ci-evaluate", headers=auth_headers("ci1"), json={
+            "is_quick_win": False, "complexity_level": "Low", "savings_type": "cost_savings", "cost_savings": 2500,
+        })
+        assert counters(db)[f"cost_savings:all:{users['user1']['id']}"] == 2500
+
+    def test_transition_without_board_changes_is_free(self, backend, client, auth_headers, query_budget):
+        """Approving a pending idea touches no counters"""
+        response = client.post("/api/ideas/idea-1/approve", headers=auth_headers("approver1"), json={})
+        trace = query_budget(response, 6)
+        assert not {"leaderboard_counters", "increment_leaderboard_counters"} & {r.table for r in trace.records}
+
+    def test_delete_removes_contributions(self, backend, client, auth_headers):
+        """Deleting an idea takes it off the boards"""
+        _, db, users = backend
+        created = client.post("/api/ideas", headers=auth_headers("user1"), json=IDEA_PAYLOAD).json()
+        client.delete(f"/api/ideas/{created['id']}", headers=auth_headers("admin"))
+        assert counters(db)[f"submitters:all:{users['user1']['id']}"] == 0
+
+    def test_rebuild_matches_incremental(self, backend, client, auth_headers):
+        """A rebuild from ideas reproduces the incremental counters and backfills seeded ideas"""
+        _, db, users = backend
+        client.post("/api/ideas", headers=auth_headers("user1"), json=IDEA_PAYLOAD)
+        client.post("/api/ideas/idea-2/ci-evaluate", headers=auth_headers("ci1"), json={"is_quick_win": True})
+        incremental = counters(db)
+        leaderboards.rebuild(db)
+        rebuilt = counters(db)
+        assert rebuilt["departments:all:Operations"] == incremental["departments:all:Operations"] == 1
+        assert rebuilt[f"submitters:all:{users['user1']['id']}"] == 4
+
+
+class TestConcurrentTransitions:
+    """Only the request whose update matched the status it read applies side effects"""
+
+    def test_lost_race_is_a_conflict(self, backend, client, auth_headers, monkeypatch):
+        """A transition whose idea changed status after the read returns 409 and counts nothing"""
+        _, db, _ = backend
+        idea = db.tables["ideas"][0]
+        idea["status"] = "assigned_to_te"
+        table = db.table
+
+        def racing(name):
+            if name == "ideas" and idea["status"] == "assigned_to_te" and racing.reads:
+                idea.update(status="implemented")
+            racing.reads += name == "ideas"
+            return table(name)
+
+        racing.reads = 0
+        monkeypatch.setattr(db, "table", racing)
+        response = client.post("/api/ideas/idea-1/ci-update-status", headers=auth_headers("ci1"),
+                               json={"new_status": "implemented"})
+        assert response.status_code == 409
+        assert "departments:all:Operations" not in counters(db)
+        assert not db.tables.get("idea_events")
+
+    def test_counter_failure_keeps_the_committed_transition(self, backend, client, auth_headers, monkeypatch):
+        """A failed increment is logged; the response reports the write that happened"""
+        _, db, _ = backend
+
+        def unavailable(db, deltas):
+            raise ConnectionError("rpc unavailable")
+
+        monkeypatch.setattr(leaderboards, "apply", unavailable)
+        response = client.post("/api/ideas/idea-1/ci-evaluate", headers=auth_headers("ci1"), json={"is_quick_win": True})
+        assert response.status_code == 200
+        assert db.tables["ideas"][0]["status"] == "implemented"
+
+
+class SlowReads(SQLiteStorage):
+    def run(self, query):
+        result = super().run(query)
+        if query.operation == "select":
+            time.sleep(0.001)
+        return result
+
+
+class TestAtomicIncrements:
+    """Deltas are added in the database, never read-modify-written"""
+
+    def test_one_call_and_no_read(self, backend, client, auth_headers, query_budget):
+        """A new idea costs a single increment call"""
+        response = client.post("/api/ideas", headers=auth_headers("user1"), json=IDEA_PAYLOAD)
+        trace = query_budget(response, 10)
+        calls = [(r.table, r.operation) for r in trace.records if "leaderboard" in r.table]
+        assert calls == [("increment_leaderboard_counters", "rpc")]
+
+    def test_concurrent_writers_lose_nothing(self):
+        """Increments from several threads all land, even with every read followed by a pause"""
+        store = SlowReads(":memory:")
+        key = ("submitters", "all", "u1")
+
+        def submit():
+            for _ in range(50):
+                leaderboards.apply(store, {key: ("user1", 1)})
+
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        row = store.table("leaderboard_counters").select("*").eq("id", "submitters:all:u1").maybeSingle().execute()
+        assert row.data["value"] == 200
+        assert row.data["label"] == "user1"
+        store.close()
+
+
+class TestLeaderboardEndpoint:
+    """Top-N reads"""
+
+    @pytest.fixture
+    def ranked(self, backend):
+        _, db, _ = backend
+        db.tables["leaderboard_counters"] = [
+            {"id": f"submitters:all:u{n}", "board": "submitters", "period": "all", "subject": f"u{n}",
+             "label": f"user{n}", "value": n}
+            for n in range(5)
+        ]
+        return db
+
+    def test_top_n_in_order(self, client, auth_headers, ranked):
+        """Entries are ranked by value, zero rows are skipped and limit applies"""
+        response = client.get("/api/dashboard/leaderboards/submitters", headers=auth_headers("user1"),
+                              params={"limit": 3})
+        body = response.json()
+        assert body["period"] == "all"
+        assert [(e["rank"], e["label"]) for e in body["entries"]] == [(1, "user4"), (2, "user3"), (3, "user2")]
+
+    def test_period_key_from_date(self, client, auth_headers, ranked):
+        """period and at select the stored period bucket"""
+        response = client.get("/api/dashboard/leaderboards/departments", headers=auth_headers("user1"),
+                              params={"period": "week", "at": "2026-01-07"})
+        assert response.json() == {"board": "departments", "period": "2026-W02", "entries": []}
+
+    def test_validation(self, client, auth_headers):
+        """Unknown boards are 404s; bad periods and dates are 400s"""
+        headers = auth_headers("user1")
+        assert client.get("/api/dashboard/leaderboards/teams", headers=headers).status_code == 404
+        assert client.get("/api/dashboard/leaderboards/submitters", headers=headers,
+                          params={"period": "decade"}).status_code == 400
+        assert client.get("/api/dashboard/leaderboards/submitters", headers=headers,
+                          params={"at": "soon"}).status_code == 400
@@ -0,0 +1,127 @@
+"""
+Process-pool bcrypt hashing and the local-credential auth mode.
+"""
+import asyncio
+
+import pytest
+
+import config
+import passwords
+
+
+@pytest.fixture(autouse=True)
+def shutdown_pool():
+    yield
+    passwords.shutdown()
+
+
+class TestPasswordHashing:
+    """bcrypt in the process pool"""
+
+    def test_hash_and_verify_in_pool(self):
+        """Hashes made in the pool verify in the pool"""
+        async def scenario():
+            hashed = await passwords.hash_password("s3cret")
+            return hashed, await passwords.verify_password("s3cret", hashed), await passwords.verify_password("nope", hashed)
+
+        hashed, good, bad = asyncio.run(scenario())
+        assert hashed.startswith("$2b$04$")
+        assert good == (True, None)
+        assert bad == (False, None)
+
+    def test_weaker_hash_is_rehashed(self, monkeypatch):
+        """A hash below the configured rounds comes back with a replacement"""
+        weak = passwords.hash_sync("s3cret", rounds=4)
+        monkeypatch.setattr(config, "BCRYPT_ROUNDS", 5)
+        valid, new_hash = asyncio.run(passwords.verify_password("s3cret", weak))
+        assert valid
+        assert new_hash.startswith("$2b$05$")
+
+    def test_malformed_hash_is_rejected(self):
+        """Garbage hashes fail verification instead of raising"""
+        assert passwords.verify_sync("s3cret", "not-a-hash") == (False, None)
+
+
+class TestLocalCredentialMode:
+    """AUTH_MODE=local end to end"""
+
+    @pytest.fixture
+    def local_client(self, backend, client, monkeypatch):
+        monkeypatch.setattr(config, "AUTH_MODE", "local")
+        return client
+
+    def register(self, client, username="local1", password="pw-123456"):
+        response = client.post("/api/auth/register", json={
+            "username": username, "email": f"{username}@philtech.com", "password": password, "role": "user",
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def test_register_and_login_without_remote_auth(self, backend, local_client):
+        """Register and login never call the remote auth API"""
+        _, db, _ = backend
+        remote_users = dict(db.auth.users)
+        self.register(local_client)
+        assert db.auth.users == remote_users
+        assert db.tables["credentials"][0]["password_hash"].startswith("$2b$04$")
+
+        response = local_client.post("/api/auth/login", json={"username": "local1", "password": "pw-123456"})
+        assert response.status_code == 200, response.text
+        response = local_client.post("/api/auth/login", json={"username": "local1", "password": "wrong"})
+        assert response.status_code == 401
+
+    def test_sqlite_backend_implies_local_credentials(self, backend, client, monkeypatch):
+        """SQLite has no auth service, so credentials are kept locally whatever AUTH_MODE says"""
+        _, db, _ = backend
+        monkeypatch.setattr(config, "STORAGE_BACKEND", "sqlite")
+        remote_users = dict(db.auth.users)
+        self.register(client)
+        assert db.auth.users == remote_users
+        assert client.post("/api/auth/login", json={"username": "local1", "password": "pw-123456"}).status_code == 200
+
+    def test_rehash_on_login(self, backend, local_client, monkeypatch):
+        """Logging in upgrades hashes made with fewer rounds"""
+        _, db, _ = backend
+        self.register(local_client)
+        monkeypatch.setattr(config, "BCRYPT_ROUNDS", 5)
+        response = local_client.post("/api/auth/login", json={"username": "local1", "password": "pw-123456"})
+        assert response.status_code == 200, response.text
+        assert db.tables["credentials"][0]["password_hash"].startswith("$2b$05$")
+
+    def test_unknown_username_costs_a_hash(self, local_client, monkeypatch):
+        """A missing account is verified against a dummy hash, like a wrong password"""
+        verified = []
+        verify_password = passwords.verify_password
+
+        async def spy(password, hashed):
+            verified.append(hashed)
+            return await verify_password(password, hashed)
+
+        monkeypatch.setattr(passwords, "verify_password", spy)
+        self.register(local_client)
+        response = local_client.post("/api/auth/login", json={"username": "nobody", "password": "pw-123456"})
+        assert response.status_code == 401
+        response = local_client.post("/api/auth/login", json={"username": "local1", "password": "wrong"})
+        assert response.status_code == 401
+        assert len(verified) == 2
+        assert verified[0].startswith("$2b$04$")
+
+    def test_change_and_reset_password(self, backend, local_client):
+        """change-password and reset-password update the local hash"""
+        core, _, _ = backend
+        user = self.register(local_client)
+        token = core.create_access_token(data={"sub": user["id"]})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = local_client.post("/api/auth/change-password", headers=headers,
+                                     json={"current_password": "wrong", "new_password": "pw-2"})
+        assert response.status_code == 400
+        response = local_client.post("/api/auth/change-password", headers=headers,
+                                     json={"current_password": "pw-123456", "new_password": "pw-2"})
+        assert response.status_code == 200
+        assert local_client.post("/api/auth/login", json={"username": "local1", "password": "pw-2"}).status_code == 200
+
+        reset_token = core.create_reset_token("local1@philtech.com")
+        response = local_client.post("/api/auth/reset-password", json={"token": reset_token, "new_password": "pw-3"})
+        assert response.status_code == 200
+        assert local_client.post("/api/auth/login", json={"username": "local1", "password": "pw-3"}).status_code == 200
@@ -0,0 +1,97 @@
+"""
+Query budget regression tests.
+Every endpoint below runs in-process against the in-memory Supabase stand-in and
+fails if it makes more data-access round trips than its budget allows.
+"""
+import pytest
+
+IDEA_PAYLOAD = {
+    "pillar": "GBS",
+    "title": "Budgeted idea",
+    "improvement_type": "Process",
+    "current_process": "Manual",
+    "suggested_solution": "Automate",
+    "benefits": "Faster",
+    "target_completion": "2026-12-31",
+    "department": "Operations",
+    "team": "Allowance Billing",
+}
+
+# (method, path, user, json body, max queries)
+ENDPOINT_BUDGETS = [
+    ("GET", "/api/public/pillars", None, None, 1),
+    ("GET", "/api/public/departments", None, None, 1),
+    ("GET", "/api/public/teams", None, None, 1),
+    ("POST", "/api/auth/login", None, {"username": "admin", "password": "admin123"}, 2),
+    ("GET", "/api/auth/me", "user1", None, 1),
+    ("GET", "/api/ideas", "user1", None, 2),
+    ("GET", "/api/ideas/idea-1", "user1", None, 2),
+    ("GET", "/api/ideas?status=pending&include_archived=true", "user1", None, 2),
+    ("GET", "/api/ideas?include_archived=true", "user1", None, 3),
+    ("POST", "/api/ideas", "user1", IDEA_PAYLOAD, 7),
+    ("PUT", "/api/ideas/idea-1", "user1", IDEA_PAYLOAD, 3),
+    ("GET", "/api/ideas/idea-1/comments", "user1", None, 2),
+    ("POST", "/api/ideas/idea-1/comments", "user1", {"comment_text": "Looks good"}, 3),
+    ("POST", "/api/ideas/idea-1/approve", "approver1", {"comment": "Approved"}, 6),
+    ("POST", "/api/ideas/idea-1/decline", "approver1", {"comment": "No"}, 6),
+    ("POST", "/api/ideas/idea-1/request-revision", "approver1", {"comment": "Revise"}, 6),
+    ("POST", "/api/ideas/idea-1/resubmit", "user1", None, 5),
+    ("POST", "/api/ideas/idea-1/ci-evaluate", "ci1", {"is_quick_win": True}, 6),
+    ("GET", "/api/dashboard/stats", "user1", None, 9),
+    ("GET", "/api/dashboard/analytics", "ci1", None, 3),
+    ("GET", "/api/dashboard/analytics?start_date=2100-01-01", "ci1", None, 4),
+    ("GET", "/api/dashboard/cycle-times?group_by=approver", "approver1", None, 2),
+    ("GET", "/api/dashboard/leaderboards/submitters?period=month", "user1", None, 2),
+    ("GET", "/api/dashboard/export-excel", "ci1", None, 3),
+    ("GET", "/api/admin/users", "admin", None, 2),
+    ("GET", "/api/admin/users?role=user&pillar=GBS&q=us&limit=10&offset=0", "admin", None, 2),
+    ("GET", "/api/admin/departments", "admin", None, 2),
+    ("GET", "/api/admin/pillars", "admin", None, 2),
+    ("GET", "/api/admin/teams", "admin", None, 2),
+    ("GET", "/api/admin/tech-persons", "admin", None, 2),
+]
+
+
+class TestQueryBudgets:
+    """Round-trip budgets per endpoint"""
+
+    @pytest.mark.parametrize("method,path,user,body,budget", ENDPOINT_BUDGETS)
+    def test_endpoint_within_budget(self, client, auth_headers, query_budget, method, path, user, body, budget):
+        """Endpoint stays within its query budget"""
+        headers = auth_headers(user) if user else {}
+        response = client.request(method, path, json=body, headers=headers)
+        assert response.status_code == 200, response.text
+        query_budget(response, budget)
+
+    def test_list_ideas_does_not_grow_with_rows(self, backend, client, auth_headers, query_budget):
+        """Listing ideas costs the same number of queries for 3 or 300 ideas"""
+        _, db, _ = backend
+        template = db.tables["ideas"][0]
+        for n in range(300):
+            db.tables["ideas"].append({**template, "id": f"bulk-{n}", "idea_number": f"EYE-B{n}"})
+        response = client.get("/api/ideas", headers=auth_headers("user1"))
+        assert response.status_code == 200
+        assert len(response.json()) == 303
+        query_budget(response, 2)
+
+
+class TestQueryTrace:
+    """Trace recording details"""
+
+    def test_trace_records_table_filters_and_rows(self, client, auth_headers, query_budget):
+        """Recorded queries carry table, filters and row counts"""
+        response = client.get("/api/ideas?status=pending", headers=auth_headers("user1"))
+        trace = query_budget(response, 1)
+        idea_list, = trace.records
+        assert idea_list.table == "ideas"
+        assert "status=eq.pending" in idea_list.filters
+        assert "order=created_at.desc" in idea_list.filters
+        assert idea_list.rows == 3
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    def test_auth_calls_are_traced(self, client, query_budget):
+        """Remote auth round trips count against the budget"""
+        response = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+        trace = query_budget(response, 2)
+        assert [r.table for r in trace.records] == ["profiles", "auth"]
+        assert trace.records[1].operation == "sign_in_with_password"
@@ -0,0 +1,180 @@
+"""
+SQL migrations: schema parity with SQLite and EXPLAIN checks against a local Postgres.
+
+The plan checks need TEST_POSTGRES_DSN (e.g. postgresql://localhost/postgres) and
+psycopg; they are skipped otherwise. They run in a throwaway schema. Each query shape
+is checked with a selective value (about 1% of rows or less); for values matching a
+large share of the table a sequential scan is the right plan.
+"""
+import os
+import re
+import uuid
+
+import pytest
+
+import migrations
+from storage import SCHEMA
+
+DSN = os.environ.get("TEST_POSTGRES_DSN")
+
+STATEMENT = re.compile(
+    r"CREATE TABLE IF NOT EXISTS (?P<table>\w+) \((?P<body>.*?)\n\);"
+    r"|ALTER TABLE (?P<altered>\w+) ADD COLUMN IF NOT EXISTS (?P<column>\w+)",
+    re.DOTALL,
+)
+
+FIXTURES = """
+INSERT INTO profiles (id, username, email, role, department, pillar, approved_pillars)
+SELECT md5('profile' || g)::uuid, 'user' || g, 'user' || g || '@example.com',
+       CASE WHEN g % 400 = 0 THEN 'approver' ELSE 'user' END,
+       'Department ' || (g % 100), 'Pillar ' || (g % 5),
+       CASE WHEN g % 400 = 0 THEN ARRAY['Pillar ' || (g % 5), 'Pillar ' || ((g + 1) % 5)] ELSE '{}' END
+FROM generate_series(1, 20000) g;
+
+INSERT INTO ideas (idea_number, pillar, title, department, team, status, submitted_by, assigned_approver,
+                   created_at, updated_at)
+SELECT 'EYE-' || lpad(g::text, 6, '0'),
+       CASE WHEN g % 100 = 0 THEN 'Pillar R' ELSE 'Pillar ' || (g % 5) END,
+       'Idea ' || g, 'Department ' || (g % 200), 'Team ' || (g % 1000),
+       CASE WHEN g % 100 = 1 THEN 'pending' WHEN g % 2 = 0 THEN 'implemented' ELSE 'declined' END,
+       md5('profile' || (g % 20000))::uuid, md5('approver' || (g % 200))::uuid,
+       now() - g * interval '1 minute', now() - g * interval '1 minute'
+FROM generate_series(1, 100000) g;
+
+INSERT INTO comments (idea_id, user_id, username, comment_text, created_at)
+SELECT md5('idea' || (g % 50000))::uuid, md5('profile' || (g % 20000))::uuid, 'user' || (g % 20000),
+       'Comment ' || g, now() - g * interval '1 minute'
+FROM generate_series(1, 200000) g;
+
+ANALYZE;
+"""
+
+# name -> (table, SQL, params, index expected in the plan)
+SHAPES = {
+    "ideas by status": ("ideas", "SELECT * FROM ideas WHERE status = %s ORDER BY created_at DESC",
+                        ("pending",), "ideas_status_created_at_idx"),
+    "ideas by pillar": ("ideas", "SELECT * FROM ideas WHERE pillar = %s ORDER BY created_at DESC",
+                        ("Pillar R",), "ideas_pillar_created_at_idx"),
+    "ideas by department": ("ideas", "SELECT * FROM ideas WHERE department = %s ORDER BY created_at DESC",
+                            ("Department 7",), "ideas_department_created_at_idx"),
+    "ideas by team": ("ideas", "SELECT * FROM ideas WHERE team = %s ORDER BY created_at DESC",
+                      ("Team 7",), "ideas_team_created_at_idx"),
+    "ideas by submitter": ("ideas",
+                           "SELECT * FROM ideas WHERE submitted_by = md5(%s::text)::uuid ORDER BY created_at DESC",
+                           ("profile7",), "ideas_submitted_by_created_at_idx"),
+    "ideas by approver": ("ideas",
+                          "SELECT * FROM ideas WHERE assigned_approver = md5(%s::text)::uuid ORDER BY created_at DESC",
+                          ("approver7",), "ideas_assigned_approver_created_at_idx"),
+    "analytics range": ("ideas",
+                        "SELECT * FROM ideas WHERE created_at >= now() - interval '12 hours' AND created_at <= now()"
+                        " ORDER BY created_at DESC", (), "ideas_created_at_idx"),
+    "comments of an idea": ("comments",
+                            "SELECT * FROM comments WHERE idea_id = md5(%s::text)::uuid ORDER BY created_at",
+                            ("idea7",), "comments_idea_id_created_at_idx"),
+    "profile by username": ("profiles", "SELECT * FROM profiles WHERE username = %s", ("user7",),
+                            "profiles_username_idx"),
+    "profile by email": ("profiles", "SELECT * FROM profiles WHERE email = %s", ("user7@example.com",),
+                         "profiles_email_idx"),
+    "approver for pillar": ("profiles",
+                            "SELECT * FROM profiles WHERE role = 'approver'"
+                            " AND approved_pillars @> ARRAY[%s::text] LIMIT 1",
+                            ("Pillar 1",), "profiles_role_approved_pillars_idx"),
+}
+
+
+def migrated_columns():
+    tables = {}
+    for migration in migrations.discover():
+        for match in STATEMENT.finditer(migration.path.read_text()):
+            if match.group("altered"):
+                tables[match.group("altered")].add(match.group("column"))
+                continue
+            columns = set()
+            for line in match.group("body").splitlines():
+                words = line.strip().rstrip(",").split()
+                if not words or words[0] == "PRIMARY":
+                    continue
+                if words[0] == "LIKE":
+                    columns |= tables[words[1]]
+                else:
+                    columns.add(words[0])
+            tables[match.group("table")] = columns
+    return tables
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+class TestMigrationFiles:
+    """The migration set itself"""
+
+    def test_versions_are_ordered_and_unique(self):
+        """Files sort by version and every version is distinct"""
+        found = migrations.discover()
+        assert [m.version for m in found] == sorted({m.version for m in found})
+
+    def test_every_sqlite_table_and_column_is_migrated(self):
+        """Postgres gets every table and column the SQLite backend knows about"""
+        tables = migrated_columns()
+        for table, columns in SCHEMA.items():
+            assert table in tables, table
+            assert set(columns) <= tables[table], (table, set(columns) - tables[table])
+
+
+@pytest.fixture(scope="module")
+def postgres():
+    if not DSN:
+        pytest.skip("TEST_POSTGRES_DSN is not set")
+    pytest.importorskip("psycopg")
+
+    schema = f"plans_{uuid.uuid4().hex[:8]}"
+    with migrations.connect(DSN) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+        conn.execute(f"SET search_path TO {schema}, public")
+        try:
+            assert migrations.migrate(conn)
+            assert migrations.migrate(conn) == []
+            conn.execute(FIXTURES)
+            yield conn
+        finally:
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+class TestFunctions:
+    """Database functions called through db.rpc"""
+
+    def test_leaderboard_increments_add_up(self, postgres):
+        """Repeated calls add to the stored value instead of replacing it"""
+        delta = '[{"id": "submitters:all:u1", "board": "submitters", "period": "all", "subject": "u1", ' \
+                '"label": "user1", "value": 1}]'
+        for _ in range(3):
+            postgres.execute("SELECT increment_leaderboard_counters(%s::jsonb)", (delta,))
+        value = postgres.execute("SELECT value FROM leaderboard_counters WHERE id = 'submitters:all:u1'").fetchone()[0]
+        assert value == 3
+
+    def test_attachment_count_matches_the_rows(self, postgres):
+        """The refreshed count is taken from idea_attachments and stored on the idea"""
+        idea = postgres.execute("SELECT id FROM ideas WHERE idea_number = 'EYE-000001'").fetchone()[0]
+        for name in ("a.bin", "b.bin"):
+            postgres.execute(
+                "INSERT INTO idea_attachments (id, idea_id, filename, content_type, size_bytes, sha256, storage_key) "
+                "VALUES (gen_random_uuid(), %s, %s, 'application/octet-stream', 1, '', %s)", (idea, name, name))
+        assert postgres.execute("SELECT refresh_attachment_count(%s)", (idea,)).fetchone()[0] == 2
+        stored = postgres.execute("SELECT attachment_count FROM ideas WHERE id = %s", (idea,)).fetchone()[0]
+        assert stored == 2
+
+
+class TestQueryPlans:
+    """Access paths stay on their indexes"""
+
+    @pytest.mark.parametrize("shape", sorted(SHAPES))
+    def test_no_sequential_scan(self, postgres, shape):
+        """The query shape is served by its index"""
+        table, sql, params, index = SHAPES[shape]
+        plan = postgres.execute(f"EXPLAIN (FORMAT JSON) {sql}", params).fetchone()[0][0]["Plan"]
+        nodes = list(plan_nodes(plan))
+        assert not [n for n in nodes if n["Node Type"] == "Seq Scan" and n.get("Relation Name") == table], plan
+        assert index in {n.get("Index Name") for n in nodes}, plan
@@ -0,0 +1,177 @@
+"""
+Token-bucket rate limiting and load shedding on the unauthenticated auth endpoints.
+"""
+import asyncio
+
+import pytest
+
+from rate_limit import Limit, MemoryBucketStore, RateLimiter, SQLiteBucketStore, load_limits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Bucket arithmetic"""
+
+    @pytest.mark.parametrize("make_store", [
+        lambda clock, tmp_path: MemoryBucketStore(clock=clock),
+        lambda clock, tmp_path: SQLiteBucketStore(str(tmp_path / "buckets.db"), clock=clock),
+    ], ids=["memory", "sqlite"])
+    def test_burst_then_refill(self, make_store, tmp_path):
+        """Capacity is spent, then refills at capacity/period"""
+        clock = FakeClock()
+        store = make_store(clock, tmp_path)
+        limit = Limit(3, 60)
+        assert [store.take("k", limit) for _ in range(3)] == [0, 0, 0]
+        assert store.take("k", limit) == pytest.approx(20.0)
+        clock.now += 20
+        assert store.take("k", limit) == 0
+        assert store.take("other", limit) == 0
+
+    def test_sqlite_store_is_shared_between_workers(self, tmp_path):
+        """Two store instances on one file draw from the same bucket"""
+        clock = FakeClock()
+        path = str(tmp_path / "buckets.db")
+        worker_a, worker_b = SQLiteBucketStore(path, clock=clock), SQLiteBucketStore(path, clock=clock)
+        limit = Limit(2, 60)
+        assert worker_a.take("k", limit) == 0
+        assert worker_b.take("k", limit) == 0
+        assert worker_a.take("k", limit) > 0
+
+    def test_memory_store_evicts_oldest_keys(self):
+        """The in-process store stays bounded"""
+        store = MemoryBucketStore(max_keys=2)
+        for key in ("a", "b", "c"):
+            store.take(key, Limit(1, 60))
+        assert list(store.buckets) == ["b", "c"]
+
+    @pytest.mark.parametrize("make_store", [
+        lambda clock, tmp_path: MemoryBucketStore(clock=clock),
+        lambda clock, tmp_path: SQLiteBucketStore(str(tmp_path / "buckets.db"), clock=clock),
+    ], ids=["memory", "sqlite"])
+    def test_prune_drops_refilled_buckets(self, make_store, tmp_path):
+        """Buckets idle for the longest period are removed, recent ones stay"""
+        clock = FakeClock()
+        store = make_store(clock, tmp_path)
+        limiter = RateLimiter(store, {"login:username": Limit(5, 60), "register:email": Limit(5, 600)})
+        limiter.hit("login:username", "old")
+        clock.now += 601
+        limiter.hit("login:username", "recent")
+        limiter.prune()
+        if isinstance(store, SQLiteBucketStore):
+            keys = [row[0] for row in store._connect().execute("SELECT key FROM rate_limit_buckets")]
+        else:
+            keys = list(store.buckets)
+        assert keys == ["login:username:recent"]
+
+    def test_prune_runs_periodically(self):
+        """The lifespan task prunes every store on its interval"""
+        import application
+
+        class Store:
+            pruned = 0
+
+            def prune(self):
+                self.pruned += 1
+
+        async def run(store):
+            task = asyncio.create_task(application.prune_periodically([store], 0.01))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        store = Store()
+        asyncio.run(run(store))
+        assert store.pruned >= 2
+
+    def test_limits_from_environment(self):
+        """RATE_LIMIT_* overrides the defaults"""
+        limits = load_limits({"RATE_LIMIT_LOGIN_USERNAME": "2/30"})
+        assert limits["login:username"] == Limit(2, 30)
+
+    def test_keys_are_case_insensitive(self):
+        """Username and email keys are normalised"""
+        limiter = RateLimiter(MemoryBucketStore(), {"login:username": Limit(1, 60)})
+        assert limiter.hit("login:username", "Admin") == 0
+        assert limiter.hit("login:username", "admin") > 0
+
+
+class TestAuthEndpoints:
+    """429 and 503 responses before any data access"""
+
+    def test_login_username_limit(self, backend, client, monkeypatch):
+        """Repeated logins for one username are rejected with Retry-After and no queries"""
+        core, _, _ = backend
+        monkeypatch.setitem(core.rate_limiter.limits, "login:username", Limit(2, 60))
+        for n in range(2):
+            response = client.post("/api/auth/login", json={"username": "admin", "password": "wrong"},
+                                   headers={"X-Forwarded-For": f"10.0.0.{n}"})
+            assert response.status_code == 401
+        response = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"},
+                               headers={"X-Forwarded-For": "10.0.0.9"})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.headers["X-Query-Count"] == "0"
+
+    def test_ip_limit_applies_across_usernames(self, backend, client, monkeypatch):
+        """Credential stuffing from one IP is cut off"""
+        import config
+
+        core, _, _ = backend
+        monkeypatch.setattr(config, "TRUSTED_PROXY_HOPS", 1)
+        monkeypatch.setitem(core.rate_limiter.limits, "login:ip", Limit(3, 60))
+        codes = [client.post("/api/auth/login", json={"username": f"user{n}", "password": "x"},
+                             headers={"X-Forwarded-For": "203.0.113.7"}).status_code for n in range(5)]
+        assert codes == [401, 401, 401, 429, 429]
+        other_ip = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"},
+                               headers={"X-Forwarded-For": "203.0.113.8"})
+        assert other_ip.status_code == 200
+
+    def test_forgot_password_email_limit(self, backend, client, monkeypatch):
+        """Reset emails per address are limited"""
+        core, _, _ = backend
+        monkeypatch.setitem(core.rate_limiter.limits, "forgot_password:email", Limit(1, 3600))
+        body = {"email": "user1@philtech.com"}
+        assert client.post("/api/auth/forgot-password", json=body).status_code == 200
+        response = client.post("/api/auth/forgot-password", json=body)
+        assert response.status_code == 429
+        assert response.headers["X-Query-Count"] == "0"
+
+    def test_register_ip_limit(self, backend, client, monkeypatch):
+        """Registration bursts from one IP are limited"""
+        core, _, _ = backend
+        monkeypatch.setitem(core.rate_limiter.limits, "register:ip", Limit(1, 600))
+        body = {"username": "new1", "email": "new1@philtech.com", "password": "pw-123456"}
+        assert client.post("/api/auth/register", json=body).status_code == 200
+        response = client.post("/api/auth/register", json={**body, "username": "new2", "email": "new2@philtech.com"})
+        assert response.status_code == 429
+
+    def test_forwarded_for_is_ignored_without_a_proxy(self, backend, client, monkeypatch):
+        """Without TRUSTED_PROXY_HOPS a spoofed X-Forwarded-For does not open a new bucket"""
+        core, _, _ = backend
+        monkeypatch.setitem(core.rate_limiter.limits, "login:ip", Limit(2, 60))
+        codes = [client.post("/api/auth/login", json={"username": f"user{n}", "password": "x"},
+                             headers={"X-Forwarded-For": f"198.51.100.{n}"}).status_code for n in range(3)]
+        assert codes == [401, 401, 429]
+
+    def test_register_identity_limit(self, backend, client, monkeypatch):
+        """Probing one username from rotating IPs is limited"""
+        core, _, _ = backend
+        monkeypatch.setitem(core.rate_limiter.limits, "register:username", Limit(2, 600))
+        codes = [client.post("/api/auth/register", json={"username": "admin", "email": f"probe{n}@philtech.com",
+                                                         "password": "pw-123456"}).status_code for n in range(3)]
+        assert codes == [400, 400, 429]
+
+    def test_load_shedding_when_saturated(self, backend, client, monkeypatch):
+        """Auth endpoints shed load with 503 once the in-flight cap is reached"""
+        core, _, _ = backend
+        monkeypatch.setattr(core.auth_inflight, "inflight", core.auth_inflight.max_inflight)
+        response = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.headers["X-Query-Count"] == "0"
@@ -0,0 +1,129 @@
+"""
+Single-flight, version-invalidated cache for /dashboard/analytics and /dashboard/stats.
+"""
+import asyncio
+import threading
+import time
+
+from read_cache import SingleFlightCache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSingleFlightCache:
+    """Coalescing and invalidation"""
+
+    def test_concurrent_requests_share_one_computation(self):
+        """A herd of identical requests runs the computation once"""
+        cache = SingleFlightCache(ttl=5)
+        calls = []
+
+        def compute():
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return {"total": 42}
+
+        async def herd():
+            return await asyncio.gather(*(cache.get(("analytics", None), compute) for _ in range(20)))
+
+        results = run(herd())
+        assert len(calls) == 1
+        assert all(result == {"total": 42} for result in results)
+
+    def test_ttl_expiry(self):
+        """Results expire after the TTL"""
+        now = [0.0]
+        cache = SingleFlightCache(ttl=5, clock=lambda: now[0])
+        run(cache.get("k", lambda: 1))
+        assert run(cache.get("k", lambda: 2)) == 1
+        now[0] = 6.0
+        assert run(cache.get("k", lambda: 3)) == 3
+
+    def test_invalidate_bumps_version(self):
+        """A write invalidates cached results"""
+        cache = SingleFlightCache(ttl=60)
+        run(cache.get("k", lambda: "old"))
+        cache.invalidate()
+        assert run(cache.get("k", lambda: "new")) == "new"
+
+    def test_result_started_before_write_is_not_cached(self):
+        """A computation that overlaps a write serves its callers but is not stored"""
+        cache = SingleFlightCache(ttl=60)
+
+        def compute():
+            cache.invalidate()
+            return "stale"
+
+        assert run(cache.get("k", compute)) == "stale"
+        assert run(cache.get("k", lambda: "fresh")) == "fresh"
+
+    def test_failures_are_shared_not_cached(self):
+        """Waiters see the error and the next request retries"""
+        cache = SingleFlightCache(ttl=60)
+
+        def broken():
+            time.sleep(0.02)
+            raise RuntimeError("storage down")
+
+        async def herd():
+            return await asyncio.gather(*(cache.get("k", broken) for _ in range(3)), return_exceptions=True)
+
+        errors = run(herd())
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        assert cache.computations == 1
+        assert run(cache.get("k", lambda: "ok")) == "ok"
+
+    def test_bounded_entries(self):
+        """The oldest keys are evicted past max_entries"""
+        cache = SingleFlightCache(ttl=60, max_entries=2)
+        for key in "abc":
+            run(cache.get(key, lambda: key))
+        assert list(cache.entries) == ["b", "c"]
+
+
+class TestDashboardCaching:
+    """Endpoints served from the cache"""
+
+    def test_repeat_analytics_is_served_from_cache(self, client, auth_headers):
+        """A cache hit runs no queries"""
+        headers = auth_headers("ci1")
+        first = client.get("/api/dashboard/analytics", headers=headers)
+        second = client.get("/api/dashboard/analytics", headers=headers)
+        assert first.json() == second.json()
+        assert int(first.headers["X-Query-Count"]) > 0
+        assert second.headers["X-Query-Count"] == "0"
+
+    def test_params_are_part_of_the_key(self, client, auth_headers):
+        """Different date ranges are cached separately"""
+        headers = auth_headers("ci1")
+        client.get("/api/dashboard/analytics", headers=headers)
+        response = client.get("/api/dashboard/analytics", headers=headers, params={"start_date": "2100-01-01"})
+        assert response.json()["total_ideas"] == 0
+
+    def test_writes_invalidate(self, client, auth_headers):
+        """An approval is visible on the next read"""
+        headers = auth_headers("ci1")
+        assert client.get("/api/dashboard/analytics", headers=headers).json()["approved_count"] == 0
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("approver1"), json={})
+        assert client.get("/api/dashboard/analytics", headers=headers).json()["approved_count"] == 1
+
+    def test_stats_share_global_counts_but_not_my_ideas(self, client, auth_headers):
+        """Global counts are shared across users; my_ideas stays per user"""
+        user_stats = client.get("/api/dashboard/stats", headers=auth_headers("user1"))
+        admin_stats = client.get("/api/dashboard/stats", headers=auth_headers("admin"))
+        assert user_stats.json()["my_ideas"] == 3
+        assert admin_stats.json()["my_ideas"] == 0
+        assert admin_stats.json()["total_ideas"] == user_stats.json()["total_ideas"]
+        assert admin_stats.headers["X-Query-Count"] == "1"
+
+    def test_failed_writes_keep_cache(self, client, auth_headers):
+        """Rejected writes do not invalidate"""
+        import read_cache
+
+        client.get("/api/dashboard/analytics", headers=auth_headers("ci1"))
+        version = read_cache.cache.version
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("user1"), json={})
+        assert read_cache.cache.version == version
+
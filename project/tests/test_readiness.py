@@ -0,0 +1,133 @@
+"""
+Liveness/readiness: background probes, cached snapshots and the p95 threshold.
+"""
+import asyncio
+import time
+
+import pytest
+
+from readiness import HealthMonitor, percentile
+
+
+def make_monitor(probes, **kwargs):
+    options = {"interval": 60, "timeout": 0.2, "p95_threshold_ms": 50, "critical": ["storage", "auth"]}
+    options.update(kwargs)
+    return HealthMonitor(probes, **options)
+
+
+def ok():
+    return None
+
+
+def slow():
+    time.sleep(0.08)
+
+
+def broken():
+    raise ConnectionError("connection refused")
+
+
+class TestHealthMonitor:
+    """Probe bookkeeping and readiness decisions"""
+
+    def test_unready_until_first_refresh(self):
+        """A worker is not ready before its probes have run"""
+        monitor = make_monitor({"storage": ok})
+        assert monitor.readiness() == (False, ["probes have not completed yet"])
+
+    def test_ready_when_upstreams_healthy(self):
+        """Fast, successful probes report ready"""
+        monitor = make_monitor({"storage": ok, "auth": ok})
+        asyncio.run(monitor.refresh())
+        assert monitor.readiness() == (True, [])
+        assert monitor.snapshot()["upstreams"]["storage"]["samples"] == 1
+
+    def test_failing_critical_upstream(self):
+        """A failing critical upstream makes the worker unready"""
+        monitor = make_monitor({"storage": ok, "auth": broken})
+        asyncio.run(monitor.refresh())
+        ready, reasons = monitor.readiness()
+        assert not ready
+        assert reasons == ["auth failing: connection refused"]
+
+    def test_non_critical_failure_is_reported_only(self):
+        """Mail outages show in the snapshot without flipping readiness"""
+        monitor = make_monitor({"storage": ok, "mail": broken})
+        asyncio.run(monitor.refresh())
+        assert monitor.readiness() == (True, [])
+        assert monitor.snapshot()["upstreams"]["mail"]["ok"] is False
+
+    def test_p95_over_threshold(self):
+        """Slow but successful upstreams trip the p95 threshold"""
+        monitor = make_monitor({"storage": slow})
+        asyncio.run(monitor.refresh())
+        ready, reasons = monitor.readiness()
+        assert not ready
+        assert reasons[0].startswith("storage p95")
+
+    def test_hung_probe_times_out(self):
+        """A hung upstream is recorded as a failure after the probe timeout"""
+        monitor = make_monitor({"storage": lambda: time.sleep(1)}, timeout=0.05)
+        asyncio.run(monitor.refresh())
+        status = monitor.statuses["storage"]
+        assert status.ok is False
+        assert "timed out" in status.error
+
+    def test_stale_snapshot(self):
+        """A stuck refresh loop makes the snapshot stale"""
+        now = [0.0]
+        monitor = make_monitor({"storage": ok}, interval=10, clock=lambda: now[0])
+        asyncio.run(monitor.refresh())
+        now[0] = 100.0
+        assert monitor.readiness() == (False, ["probe results are stale"])
+
+    def test_percentile(self):
+        """Nearest-rank percentile"""
+        assert percentile(range(1, 101), 95) == 95
+        assert percentile([], 95) is None
+
+
+class TestHealthEndpoints:
+    """Readiness reads the cached snapshot only"""
+
+    @pytest.fixture
+    def monitor(self, monkeypatch):
+        import readiness
+
+        monitor = make_monitor({"storage": ok, "auth": broken})
+        asyncio.run(monitor.refresh())
+        monkeypatch.setattr(readiness, "monitor", monitor)
+        return monitor
+
+    def test_liveness(self, client):
+        """Liveness never depends on upstreams"""
+        response = client.get("/api/health/live")
+        assert response.status_code == 200
+        assert response.headers["X-Query-Count"] == "0"
+
+    def test_readiness_unready(self, client, monitor):
+        """Readiness returns 503 with the cached snapshot and makes no queries"""
+        response = client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["reasons"] == ["auth failing: connection refused"]
+        assert response.headers["X-Query-Count"] == "0"
+
+    def test_readiness_ready(self, client, monitor):
+        """Readiness returns 200 once upstreams recover"""
+        monitor.probes["auth"] = ok
+        asyncio.run(monitor.refresh())
+        response = client.get("/api/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_storage_and_local_auth_probes(self, backend, monkeypatch):
+        """Probes run one-row queries against the configured storage"""
+        import config
+        import readiness
+
+        _, db, _ = backend
+        monkeypatch.setattr(config, "AUTH_MODE", "local")
+        before = db.executed
+        readiness.storage_probe()
+        readiness.auth_probe()
+        assert db.executed == before + 2
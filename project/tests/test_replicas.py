@@ -0,0 +1,106 @@
+"""
+Read-replica routing: heavy reads go to the replica, writers are pinned to the primary.
+"""
+import copy
+
+import pytest
+
+import replicas
+from memory_storage import MemoryStorage
+
+
+@pytest.fixture
+def replica(backend, monkeypatch):
+    import config
+    import core
+    from query_trace import TracedClient
+
+    _, db, _ = backend
+    lagging = MemoryStorage()
+    lagging.tables = copy.deepcopy(db.tables)
+    monkeypatch.setattr(config, "SUPABASE_REPLICA_URL", "http://replica.localhost")
+    monkeypatch.setattr(core.replica_db, "client", TracedClient(lagging))
+    return lagging
+
+
+def statuses(client, headers):
+    return {idea["id"]: idea["status"] for idea in client.get("/api/ideas", headers=headers).json()}
+
+
+class TestRouting:
+    """Which store serves a read"""
+
+    def test_reads_go_to_replica(self, replica, client, auth_headers):
+        """The idea list comes from the replica"""
+        replica.tables["ideas"] = replica.tables["ideas"][:1]
+        assert list(statuses(client, auth_headers("user1"))) == ["idea-1"]
+
+    def test_reference_data_goes_to_replica(self, replica, client, auth_headers):
+        """Public and authenticated reference data both read the replica"""
+        replica.tables["pillars"] = [{"id": "p9", "name": "Replica"}]
+        assert [p["name"] for p in client.get("/api/public/pillars").json()] == ["Replica"]
+        assert [p["name"] for p in client.get("/api/admin/pillars", headers=auth_headers("user1")).json()] == ["Replica"]
+
+    def test_without_replica_everything_reads_primary(self, backend, client, auth_headers):
+        """No replica URL means no routing"""
+        assert replicas.use_primary(None)
+        assert len(statuses(client, auth_headers("user1"))) == 3
+
+
+class TestReadYourWrites:
+    """Writers are pinned to the primary"""
+
+    def test_writer_sees_own_write(self, replica, client, auth_headers):
+        """The approver reads the primary right after approving; others still read the lagging replica"""
+        approver = auth_headers("approver1")
+        assert client.post("/api/ideas/idea-1/approve", headers=approver, json={}).status_code == 200
+        assert statuses(client, approver)["idea-1"] == "approved"
+        assert statuses(client, auth_headers("user1"))["idea-1"] == "pending"
+
+    def test_failed_writes_do_not_pin(self, replica, client, auth_headers, backend):
+        """A rejected write leaves the caller on the replica"""
+        _, _, users = backend
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("user1"), json={})
+        assert not replicas.pins.pinned(users["user1"]["id"])
+
+    def test_pinned_analytics_skip_shared_cache(self, replica, client, auth_headers):
+        """A pinned user's analytics are computed on the primary"""
+        ci = auth_headers("ci1")
+        client.post("/api/ideas/idea-1/approve", headers=auth_headers("approver1"), json={})
+        assert client.get("/api/dashboard/analytics", headers=ci).json()["approved_count"] == 0
+        approver_view = client.get("/api/dashboard/analytics", headers=auth_headers("approver1")).json()
+        assert approver_view["approved_count"] == 1
+
+    def test_pin_expires(self, replica, client, auth_headers, backend, monkeypatch):
+        """After REPLICA_PIN_SECONDS reads return to the replica"""
+        now = [0.0]
+        monkeypatch.setattr(replicas, "pins", replicas.MemoryPinStore(clock=lambda: now[0]))
+        approver = auth_headers("approver1")
+        client.post("/api/ideas/idea-1/approve", headers=approver, json={})
+        assert statuses(client, approver)["idea-1"] == "approved"
+        now[0] = 11.0
+        assert statuses(client, approver)["idea-1"] == "pending"
+
+
+class TestPinStores:
+    """Pins shared across workers"""
+
+    def test_sqlite_pins_expire(self, tmp_path):
+        """A pin is visible through another connection until it expires"""
+        now = [100.0]
+        writer = replicas.SQLitePinStore(str(tmp_path / "pins.db"), clock=lambda: now[0])
+        reader = replicas.SQLitePinStore(str(tmp_path / "pins.db"), clock=lambda: now[0])
+        writer.pin("user-1", 10)
+        assert reader.pinned("user-1") and not reader.pinned("user-2")
+        now[0] = 111.0
+        assert not reader.pinned("user-1")
+
+    def test_prune_drops_expired_pins(self, tmp_path):
+        """Expired pins are deleted from the shared file"""
+        now = [100.0]
+        store = replicas.SQLitePinStore(str(tmp_path / "pins.db"), clock=lambda: now[0])
+        store.pin("user-1", 10)
+        store.pin("user-2", 60)
+        now[0] = 111.0
+        store.prune()
+        assert [row[0] for row in store._connect().execute("SELECT key FROM replica_pins")] == ["user-2"]
@@ -0,0 +1,231 @@
+"""
+Upstream timeouts, circuit breakers and hedged reads.
+"""
+import threading
+import time
+
+import pytest
+
+import resilience
+from memory_storage import MemoryStorage
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ServerError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def fail():
+    raise ConnectionError("connection refused")
+
+
+@pytest.fixture
+def registry():
+    registry = resilience.Registry({"select": 1.0, "write": 1.0, "mail": 1.0}, failure_threshold=2, reset_seconds=30,
+                                   workers=4)
+    yield registry
+    if registry.executor:
+        registry.executor.shutdown(wait=False)
+
+
+class NamedSupabase(MemoryStorage):
+    name = "supabase"
+
+
+class TestCircuitBreaker:
+    """Fail fast while an upstream is down, recover through a single trial"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Calls are rejected once the failure threshold is reached"""
+        breaker = resilience.CircuitBreaker(2, 30, clock=Clock())
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == resilience.OPEN and not breaker.allow()
+
+    def test_success_resets_the_count(self):
+        """Failures must be consecutive"""
+        breaker = resilience.CircuitBreaker(2, 30, clock=Clock())
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == resilience.CLOSED
+
+    def test_half_open_lets_one_trial_through(self):
+        """After the reset period one call probes the upstream; its outcome decides"""
+        clock = Clock()
+        breaker = resilience.CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+        clock.now = 30
+        assert breaker.allow() and not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == resilience.OPEN and breaker.times_opened == 2
+
+        clock.now = 60
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == resilience.CLOSED and breaker.allow()
+
+
+class TestUpstreamCall:
+    """Timeouts, failure classification and hedging"""
+
+    def test_open_circuit_fails_fast(self, registry):
+        """A down upstream is not called again until the reset period passes"""
+        calls = []
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                registry.call("postgrest", "select", fail)
+        with pytest.raises(resilience.UpstreamUnavailable):
+            registry.call("postgrest", "select", lambda: calls.append(1))
+        assert calls == []
+        assert registry.get("postgrest").counters[("select", "rejected")] == 1
+
+    def test_timeout(self, registry):
+        """A hung call costs the caller the operation's timeout, not more"""
+        registry.timeouts["select"] = 0.05
+        release = threading.Event()
+        started = time.monotonic()
+        with pytest.raises(resilience.UpstreamTimeout):
+            registry.call("postgrest", "select", lambda: release.wait(5))
+        release.set()
+        assert time.monotonic() - started < 1
+        assert registry.get("postgrest").breaker.consecutive_failures == 1
+
+    def test_writes_are_not_abandoned(self, registry):
+        """A write slower than the select timeout still returns its result"""
+        registry.timeouts["write"] = 0.01
+        assert registry.call("postgrest", "write", lambda: time.sleep(0.1) or "written") == "written"
+
+    def test_write_timeout_from_the_client(self, registry):
+        """An HTTP timeout on a write is reported as an upstream timeout"""
+        import httpx
+
+        def hung():
+            raise httpx.ReadTimeout("timed out")
+
+        with pytest.raises(resilience.UpstreamTimeout):
+            registry.call("postgrest", "write", hung)
+        assert registry.get("postgrest").counters[("write", "timeout")] == 1
+
+    def test_client_errors_do_not_trip_the_breaker(self, registry):
+        """A 4xx means the upstream answered"""
+        def conflict():
+            raise ServerError(409)
+
+        for _ in range(3):
+            with pytest.raises(ServerError):
+                registry.call("postgrest", "write", conflict)
+        assert registry.get("postgrest").breaker.state == resilience.CLOSED
+
+        def unavailable():
+            raise ServerError(503)
+
+        for _ in range(2):
+            with pytest.raises(ServerError):
+                registry.call("postgrest", "write", unavailable)
+        assert registry.get("postgrest").breaker.state == resilience.OPEN
+
+    def test_hedged_read_wins_over_a_slow_first_call(self):
+        """A select still running after p95 is sent again and the faster answer is used"""
+        executor = resilience.ThreadPoolExecutor(max_workers=4)
+        upstream = resilience.Upstream("postgrest", {"select": 2.0}, resilience.CircuitBreaker(5, 30), executor,
+                                       hedge=True, hedge_min_samples=1, hedge_min_delay=0.01)
+        upstream.latencies["select"].append(0.01)
+        attempts = []
+        release = threading.Event()
+
+        def query():
+            attempts.append(1)
+            if len(attempts) == 1:
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        assert upstream.call("select", query) == "fast"
+        release.set()
+        assert upstream.counters[("select", "hedged")] == 1
+        assert upstream.counters[("select", "hedge_won")] == 1
+        executor.shutdown(wait=False)
+
+    def test_writes_are_never_hedged(self):
+        """Only idempotent selects are duplicated"""
+        upstream = resilience.Upstream("postgrest", {}, resilience.CircuitBreaker(5, 30), None, hedge=True,
+                                       hedge_min_samples=1)
+        upstream.latencies["write"].append(0.01)
+        assert upstream.hedge_delay("write") is None
+
+
+class TestResilientClient:
+    """The Supabase client is wrapped, other backends are not"""
+
+    def test_queries_go_through_the_upstream(self, registry):
+        """Selects and writes are counted per kind"""
+        client = registry.wrap(NamedSupabase())
+        client.table("ideas").insert({"id": "idea-1", "title": "A"}).execute()
+        rows = client.table("ideas").select("*").eq("id", "idea-1").execute().data
+        assert rows[0]["title"] == "A"
+        counters = registry.get("postgrest").counters
+        assert counters[("write", "ok")] == 1 and counters[("select", "ok")] == 1
+
+    def test_auth_mutators_are_not_abandoned(self, registry):
+        """sign_up waits for its result, sign_in_with_password is held to the auth timeout"""
+        registry.timeouts["auth"] = 0.01
+        db = NamedSupabase()
+        sign_up, sign_in = db.auth.sign_up, db.auth.sign_in_with_password
+        db.auth.sign_up = lambda credentials: time.sleep(0.1) or sign_up(credentials)
+        db.auth.sign_in_with_password = lambda credentials: time.sleep(0.1) or sign_in(credentials)
+        client = registry.wrap(db)
+        credentials = {"email": "a@philtech.com", "password": "pw-123456"}
+        assert client.auth.sign_up(credentials).user.email == "a@philtech.com"
+        with pytest.raises(resilience.UpstreamTimeout):
+            client.auth.sign_in_with_password(credentials)
+        counters = registry.get("auth").counters
+        assert counters[("write", "ok")] == 1 and counters[("auth", "timeout")] == 1
+
+    def test_other_backends_are_untouched(self, registry):
+        """Local storage has no network hop to protect"""
+        client = MemoryStorage()
+        assert registry.wrap(client) is client
+
+
+class TestEndpoints:
+    """Surfacing upstream state over HTTP"""
+
+    def test_open_circuit_returns_503(self, backend, client, auth_headers, monkeypatch):
+        """Requests fail fast with Retry-After while PostgREST is down"""
+        import core
+        from query_trace import TracedClient
+
+        _, db, _ = backend
+        named = NamedSupabase()
+        named.tables = db.tables
+        monkeypatch.setattr(core.db, "client", TracedClient(resilience.registry.wrap(named)))
+        headers = auth_headers("user1")
+        for _ in range(resilience.registry.failure_threshold):
+            resilience.registry.get("postgrest").breaker.record_failure()
+
+        response = client.get("/api/ideas", headers=headers)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"]
+
+    def test_metrics(self, registry, client, monkeypatch):
+        """Counters and breaker state are exported in the Prometheus text format"""
+        monkeypatch.setattr(resilience, "registry", registry)
+        registry.call("postgrest", "select", lambda: None)
+        with pytest.raises(ConnectionError):
+            registry.call("mail", "mail", fail)
+
+        body = client.get("/api/health/metrics").text
+        assert 'upstream_calls_total{upstream="postgrest",kind="select",outcome="ok"} 1' in body
+        assert 'upstream_calls_total{upstream="mail",kind="mail",outcome="error"} 1' in body
+        assert 'upstream_circuit_state{upstream="mail",state="closed"} 0' in body
@@ -0,0 +1,211 @@
+"""
+SQLite storage engine tests: query builder semantics, local auth, WAL mode and indexes,
+plus an end-to-end API flow running entirely on the local engine. The Supabase adapter
+is checked against a mocked PostgREST transport.
+"""
+import httpx
+import pytest
+
+from storage import SQLiteStorage, StorageError, SupabaseStorage, create_storage
+
+
+@pytest.fixture
+def store():
+    storage = SQLiteStorage(":memory:")
+    yield storage
+    storage.close()
+
+
+def make_idea(n, **overrides):
+    idea = {
+        "idea_number": f"EYE-{str(n).zfill(5)}", "pillar": "GBS", "title": f"Idea {n}",
+        "improvement_type": "Process", "current_process": "Manual", "suggested_solution": "Automate",
+        "benefits": "Faster", "target_completion": "2026-12-31", "status": "pending",
+        "submitted_by": "u1", "submitted_by_username": "user1",
+        "created_at": f"2026-01-{str(n).zfill(2)}T00:00:00+00:00", "updated_at": "2026-01-01T00:00:00+00:00",
+    }
+    idea.update(overrides)
+    return idea
+
+
+class TestSQLiteQueryBuilder:
+    """PostgREST-compatible query builder on SQLite"""
+
+    def test_insert_generates_id_and_returns_rows(self, store):
+        """Insert returns the stored row with a generated id"""
+        result = store.table("ideas").insert(make_idea(1, is_quick_win=True, cost_savings=12.5)).execute()
+        row = result.data[0]
+        assert row["id"]
+        assert row["is_quick_win"] is True
+        assert row["cost_savings"] == 12.5
+
+    def test_filters_order_and_limit(self, store):
+        """eq/neq/gte/lte/in_ filters with ordering and paging"""
+        for n in range(1, 11):
+            store.table("ideas").insert(make_idea(n, status="approved" if n % 2 else "pending")).execute()
+        result = store.table("ideas").select("*").eq("status", "approved").order("created_at", desc=True).limit(2).execute()
+        assert [r["title"] for r in result.data] == ["Idea 9", "Idea 7"]
+        result = store.table("ideas").select("id").gte("created_at", "2026-01-03").lte("created_at", "2026-01-05").execute()
+        assert len(result.data) == 2
+        result = store.table("ideas").select("title").in_("idea_number", ["EYE-00001", "EYE-00002"]).order("title").execute()
+        assert result.data == [{"title": "Idea 1"}, {"title": "Idea 2"}]
+        result = store.table("ideas").select("*").order("created_at").range(2, 3).execute()
+        assert [r["title"] for r in result.data] == ["Idea 3", "Idea 4"]
+
+    def test_count_exact(self, store):
+        """count='exact' reports the full match count"""
+        for n in range(1, 6):
+            store.table("ideas").insert(make_idea(n)).execute()
+        result = store.table("ideas").select("id", count="exact").eq("status", "pending").execute()
+        assert result.count == 5
+
+    def test_maybe_single(self, store):
+        """maybeSingle returns a dict or None"""
+        store.table("pillars").insert({"id": "p1", "name": "GBS"}).execute()
+        assert store.table("pillars").select("*").eq("id", "p1").maybeSingle().execute().data == {"id": "p1", "name": "GBS"}
+        assert store.table("pillars").select("*").eq("id", "missing").maybeSingle().execute().data is None
+
+    def test_contains_on_json_arrays(self, store):
+        """contains matches array columns"""
+        store.table("profiles").insert({"username": "a", "email": "a@x.com", "role": "approver",
+                                        "approved_pillars": ["GBS", "Tech"]}).execute()
+        store.table("profiles").insert({"username": "b", "email": "b@x.com", "role": "approver",
+                                        "approved_pillars": ["HR"]}).execute()
+        result = store.table("profiles").select("*").eq("role", "approver").contains("approved_pillars", ["Tech"]).execute()
+        assert [r["username"] for r in result.data] == ["a"]
+        assert result.data[0]["approved_pillars"] == ["GBS", "Tech"]
+
+    def test_update_and_delete_return_affected_rows(self, store):
+        """update/delete return the affected rows"""
+        created = store.table("ideas").insert(make_idea(1)).execute().data[0]
+        updated = store.table("ideas").update({"status": "approved"}).eq("id", created["id"]).execute()
+        assert updated.data[0]["status"] == "approved"
+        assert store.table("ideas").delete().eq("id", "missing").execute().data == []
+        assert len(store.table("ideas").delete().eq("id", created["id"]).execute().data) == 1
+
+    def test_unique_username(self, store):
+        """Unique indexes surface as StorageError"""
+        store.table("profiles").insert({"username": "a", "email": "a@x.com", "role": "user"}).execute()
+        with pytest.raises(StorageError):
+            store.table("profiles").insert({"username": "a", "email": "other@x.com", "role": "user"}).execute()
+
+    def test_unknown_column_rejected(self, store):
+        """Column names are validated against the schema"""
+        with pytest.raises(StorageError):
+            store.table("ideas").select("*").eq("nope; DROP TABLE ideas", 1).execute()
+
+    def test_or_prefix_search(self, store):
+        """or_ combines PostgREST-style filters, with * as the ilike wildcard"""
+        for username, first in [("alice", "Zed"), ("bob", "Alan"), ("carol", "Carol")]:
+            store.table("profiles").insert({"username": username, "email": f"{username}@x.com", "role": "user",
+                                            "first_name": first}).execute()
+        result = store.table("profiles").select("username").or_("username.ilike.AL*,first_name.ilike.al*") \
+            .order("username").execute()
+        assert [r["username"] for r in result.data] == ["alice", "bob"]
+
+    def test_or_escaped_wildcards(self, store):
+        """A backslash makes _ and % in an or_ ilike value literal"""
+        for username in ["al_x", "alex"]:
+            store.table("profiles").insert({"username": username, "email": f"{username}@x.com", "role": "user"}).execute()
+        result = store.table("profiles").select("username").or_("username.ilike.al\\_*").execute()
+        assert [r["username"] for r in result.data] == ["al_x"]
+
+    def test_user_search_uses_indexes(self, store):
+        """Prefix search on profiles is served by case-insensitive indexes"""
+        plan = store.conn.execute(
+            r"""EXPLAIN QUERY PLAN SELECT * FROM profiles WHERE ("username" LIKE ? ESCAPE '\' OR "email" LIKE ? ESCAPE '\')""",
+            ["al%", "al%"]
+        ).fetchall()
+        details = " ".join(row[3] for row in plan)
+        assert "profiles_username_nocase_idx" in details and "profiles_email_nocase_idx" in details
+
+    def test_list_query_uses_index(self, store):
+        """Filtered idea listing is served by an index"""
+        plan = store.conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM ideas WHERE "status" = ? ORDER BY "created_at" DESC', ["pending"]
+        ).fetchall()
+        assert any("ideas_status_created_at_idx" in row[3] for row in plan)
+
+
+class TestConfiguration:
+    """Backend selection"""
+
+    def test_sqlite_file_uses_wal(self, tmp_path):
+        """File-backed SQLite runs in WAL mode"""
+        storage = create_storage("sqlite", str(tmp_path / "eyedea.db"))
+        assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        storage.close()
+
+    def test_supabase_requires_credentials(self):
+        """Supabase backend still requires credentials"""
+        with pytest.raises(ValueError):
+            create_storage("supabase")
+
+    def test_unknown_backend(self):
+        """Unknown backends are rejected"""
+        with pytest.raises(ValueError):
+            create_storage("mongo")
+
+
+class TestSupabaseAdapter:
+    """SupabaseStorage results match the SQLite engine's"""
+
+    @pytest.fixture
+    def supabase(self):
+        def respond(request):
+            if request.url.params.get("id") == "eq.missing":
+                return httpx.Response(406, json={
+                    "code": "PGRST116", "details": "The result contains 0 rows", "hint": None,
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                })
+            row = {"id": "u1", "username": "user1"}
+            single = "vnd.pgrst.object" in request.headers.get("accept", "")
+            return httpx.Response(200, json=row if single else [row])
+
+        storage = SupabaseStorage("http://localhost:54321", "local.test.key")
+        storage.client.postgrest.session._transport = httpx.MockTransport(respond)
+        return storage
+
+    def test_maybe_single_without_a_row(self, supabase):
+        """No matching row is a result with data None, as on SQLite"""
+        result = supabase.table("profiles").select("*").eq("id", "missing").maybeSingle().execute()
+        assert result.data is None
+
+    def test_maybe_single_with_a_row(self, supabase):
+        """A matching row comes back as a dict"""
+        result = supabase.table("profiles").select("*").eq("id", "u1").maybeSingle().execute()
+        assert result.data == {"id": "u1", "username": "user1"}
+
+
+class TestApiOnSQLite:
+    """API flow running on the local engine"""
+
+    def test_register_login_and_submit_idea(self, backend, monkeypatch):
+        """Register, log in, submit and list ideas without any remote service"""
+        from fastapi.testclient import TestClient
+        from query_trace import TracedClient
+        import server
+
+        import config
+
+        core, _, _ = backend
+        monkeypatch.setattr(config, "STORAGE_BACKEND", "sqlite")
+        monkeypatch.setattr(core.db, "client", TracedClient(SQLiteStorage(":memory:")))
+        client = TestClient(server.app)
+
+        response = client.post("/api/auth/register", json={
+            "username": "local1", "email": "local1@philtech.com", "password": "pw-123456", "role": "user",
+        })
+        assert response.status_code == 200, response.text
+        response = client.post("/api/auth/login", json={"username": "local1", "password": "pw-123456"})
+        assert response.status_code == 200, response.text
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        response = client.post("/api/ideas", headers=headers, json={
+            "pillar": "GBS", "title": "Local idea", "improvement_type": "Process", "current_process": "Manual",
+            "suggested_solution": "Automate", "benefits": "Faster", "target_completion": "2026-12-31",
+        })
+        assert response.status_code == 200, response.text
+        assert response.json()["idea_number"] == "EYE-00001"
+        ideas = client.get("/api/ideas", headers=headers).json()
+        assert [i["title"] for i in ideas] == ["Local idea"]
@@ -0,0 +1,96 @@
+"""
+/dashboard/timeseries: day/week/month buckets, pillar/department splits and constant query cost.
+"""
+import pytest
+
+import read_cache
+import timeseries
+
+
+def idea(n, created_at, status="pending", pillar="GBS", **extra):
+    return {"id": f"ts-{n}", "created_at": created_at, "status": status, "pillar": pillar,
+            "department": "Operations", **extra}
+
+
+IDEAS = [
+    idea(1, "2026-01-05T09:00:00+00:00", "implemented", savings_type="cost_savings", cost_savings=1000),
+    idea(2, "2026-01-07T09:00:00+00:00", "declined"),
+    idea(3, "2026-01-21T09:00:00+00:00", pillar="Tech", savings_type="time_saved",
+         time_saved_hours=2, time_saved_minutes=30),
+]
+EVENTS = [
+    {"occurred_at": "2026-01-06T12:00:00+00:00", "to_status": "approved", "pillar": "GBS", "department": "Operations"},
+    {"occurred_at": "2026-01-22T12:00:00+00:00", "to_status": "implemented", "pillar": "GBS", "department": "Operations"},
+]
+
+
+class TestBuildTimeseries:
+    """Columnar bucketing"""
+
+    def test_weekly_buckets_are_dense(self):
+        """Empty weeks between the first and last bucket are filled with zeros"""
+        result = timeseries.build_timeseries(IDEAS, EVENTS, "week")
+        assert result["buckets"] == ["2026-01-05", "2026-01-12", "2026-01-19"]
+        [series] = result["series"]
+        first, empty, last = series["points"]
+        assert first["submitted"] == 2
+        assert first["statuses"]["implemented"] == 1 and first["statuses"]["declined"] == 1
+        assert first["transitions"]["approved"] == 1
+        assert first["cost_savings"] == 1000.0
+        assert empty["submitted"] == 0 and empty["transitions"]["approved"] == 0
+        assert last["time_saved_hours"] == 2.5
+        assert last["transitions"]["implemented"] == 1
+
+    def test_split_by_pillar(self):
+        """Each pillar gets its own series over the same buckets"""
+        result = timeseries.build_timeseries(IDEAS, EVENTS, "month", "pillar")
+        assert result["buckets"] == ["2026-01-01"]
+        series = {s["key"]: s["points"][0] for s in result["series"]}
+        assert series["GBS"]["submitted"] == 2
+        assert series["Tech"]["submitted"] == 1
+        assert series["Tech"]["transitions"]["implemented"] == 0
+
+    def test_range_comes_from_requested_window(self):
+        """Requested start and end dates set the bucket range"""
+        result = timeseries.build_timeseries(IDEAS, [], "day", start_date="2026-01-04", end_date="2026-01-08")
+        assert result["buckets"] == ["2026-01-04", "2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08"]
+
+    def test_empty(self):
+        """No rows produce no buckets"""
+        assert timeseries.build_timeseries([], [], "day")["series"] == []
+
+    def test_bucket_cap(self):
+        """Very wide daily ranges are rejected"""
+        with pytest.raises(ValueError):
+            timeseries.build_timeseries(IDEAS, [], "day", start_date="2000-01-01")
+
+
+class TestTimeseriesEndpoint:
+    """HTTP surface"""
+
+    @pytest.mark.parametrize("interval", ["day", "week", "month"])
+    def test_query_count_independent_of_buckets(self, backend, client, auth_headers, query_budget, interval):
+        """Every interval costs the same few queries"""
+        _, db, _ = backend
+        db.tables["ideas"].extend(IDEAS)
+        response = client.get("/api/dashboard/timeseries", headers=auth_headers("ci1"),
+                              params={"interval": interval, "split_by": "department", "start_date": "2026-01-01",
+                                      "end_date": "2026-03-31"})
+        assert response.status_code == 200
+        query_budget(response, 4)
+        assert {s["key"] for s in response.json()["series"]} == {"Operations"}
+
+    def test_validation(self, client, auth_headers):
+        """Unknown intervals, splits and unparseable dates are 400s"""
+        headers = auth_headers("ci1")
+        assert client.get("/api/dashboard/timeseries", headers=headers, params={"interval": "hour"}).status_code == 400
+        assert client.get("/api/dashboard/timeseries", headers=headers, params={"split_by": "team"}).status_code == 400
+        response = client.get("/api/dashboard/timeseries", headers=headers, params={"start_date": "not-a-date"})
+        assert response.status_code == 400
+
+    def test_shared_read_cache(self, client, auth_headers):
+        """Repeated requests from different users are computed once, off the event loop"""
+        for username in ("ci1", "admin"):
+            response = client.get("/api/dashboard/timeseries", headers=auth_headers(username))
+            assert response.status_code == 200
+        assert read_cache.cache.computations == 1
@@ -0,0 +1,167 @@
+"""
+Stateless access tokens, refresh rotation and the revocation list.
+"""
+import pytest
+
+import revocation
+
+
+def login(client, username="user1", password="user123"):
+    response = client.post("/api/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestAccessTokens:
+    """Authorization from claims"""
+
+    def test_claims_authorize_without_profile_reads(self, client, query_budget):
+        """A request authenticated by claims reads no profile row"""
+        tokens = login(client, "approver1", "approver123")
+        assert tokens["refresh_token"] and tokens["expires_in"] == 15 * 60
+        response = client.get("/api/ideas/idea-1", headers=bearer(tokens["access_token"]))
+        assert response.status_code == 200
+        trace = query_budget(response, 1)
+        assert [r.table for r in trace.records] == ["ideas"]
+
+    def test_me_still_reads_the_profile(self, client):
+        """/auth/me returns the full profile, not just the claims"""
+        tokens = login(client)
+        me = client.get("/api/auth/me", headers=bearer(tokens["access_token"])).json()
+        assert me["email"] == "user1@philtech.com"
+        assert me["pillar"] == "GBS"
+
+    def test_legacy_subject_only_token(self, backend, client):
+        """Tokens without role claims fall back to the profile lookup"""
+        core, _, users = backend
+        token = core.create_access_token(data={"sub": users["user1"]["id"]})
+        assert client.get("/api/ideas/idea-1", headers=bearer(token)).status_code == 200
+
+    def test_refresh_token_is_not_an_access_token(self, client):
+        """A refresh token cannot authorize API calls"""
+        tokens = login(client)
+        assert client.get("/api/ideas", headers=bearer(tokens["refresh_token"])).status_code == 401
+
+
+class TestRefresh:
+    """Refresh rotation and logout"""
+
+    def test_rotation(self, client):
+        """Refreshing returns a new pair and spends the old refresh token"""
+        tokens = login(client)
+        renewed = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert renewed.status_code == 200
+        assert renewed.json()["refresh_token"] != tokens["refresh_token"]
+        assert client.get("/api/ideas", headers=bearer(renewed.json()["access_token"])).status_code == 200
+        replayed = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert replayed.status_code == 401
+
+    def test_refresh_picks_up_profile_changes(self, backend, client):
+        """Claims are rebuilt from the profile on refresh"""
+        _, _, users = backend
+        tokens = login(client)
+        users["user1"]["role"] = "admin"
+        renewed = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+        assert client.get("/api/admin/users", headers=bearer(renewed["access_token"])).status_code == 200
+
+    def test_logout_revokes_the_refresh_token(self, client):
+        """A logged out refresh token cannot be used again"""
+        tokens = login(client)
+        assert client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+        response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 401
+
+
+class TestRevocation:
+    """Role changes and deletions take effect before the token expires"""
+
+    def test_role_change_revokes_access_tokens(self, backend, client, auth_headers):
+        """An admin edit rejects the user's outstanding access tokens"""
+        _, _, users = backend
+        tokens = login(client)
+        user = users["user1"]
+        response = client.put(f"/api/admin/users/{user['id']}", headers=auth_headers("admin"), json={
+            "username": "user1", "email": user["email"], "role": "approver", "approved_pillars": ["GBS"],
+        })
+        assert response.status_code == 200
+        assert client.get("/api/ideas", headers=bearer(tokens["access_token"])).status_code == 401
+
+        renewed = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+        assert renewed["user"]["role"] == "approver"
+        assert client.get("/api/ideas", headers=bearer(renewed["access_token"])).status_code == 200
+
+    def test_sub_role_change_returns_a_fresh_token(self, client):
+        """set-sub-role revokes the old token and hands back one with the new claim"""
+        tokens = login(client, "approver1", "approver123")
+        response = client.post("/api/auth/set-sub-role", headers=bearer(tokens["access_token"]),
+                               json={"sub_role": "ci_excellence"})
+        assert response.status_code == 200
+        assert client.get("/api/ideas", headers=bearer(tokens["access_token"])).status_code == 401
+        fresh = bearer(response.json()["access_token"])
+        assert client.post("/api/ideas/idea-1/approve", headers=fresh, json={}).status_code == 403
+
+    def test_password_change_ends_other_sessions(self, client):
+        """Changing the password revokes outstanding tokens and returns a fresh pair"""
+        tokens = login(client)
+        response = client.post("/api/auth/change-password", headers=bearer(tokens["access_token"]),
+                               json={"current_password": "user123", "new_password": "user456"})
+        assert response.status_code == 200
+        fresh = response.json()
+        assert client.get("/api/ideas", headers=bearer(tokens["access_token"])).status_code == 401
+        assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+        assert client.get("/api/ideas", headers=bearer(fresh["access_token"])).status_code == 200
+        assert client.post("/api/auth/refresh", json={"refresh_token": fresh["refresh_token"]}).status_code == 200
+
+    def test_deletion_ends_every_session(self, backend, client, auth_headers):
+        """A deleted user's access and refresh tokens are both rejected"""
+        core, db, _ = backend
+        db.tables["profiles"].append({"id": "u-9", "username": "temp", "email": "temp@philtech.com", "role": "user",
+                                      "created_at": "2026-01-01T00:00:00+00:00"})
+        access = core.create_access_token(data=core.access_claims(db.tables["profiles"][-1]))
+        refresh = core.create_refresh_token("u-9")
+        assert client.delete("/api/admin/users/u-9", headers=auth_headers("admin")).status_code == 200
+        assert client.get("/api/ideas", headers=bearer(access)).status_code == 401
+        assert client.post("/api/auth/refresh", json={"refresh_token": refresh}).status_code == 401
+
+
+class TestRevocationList:
+    """The Bloom filter and the exact set"""
+
+    def test_no_false_negatives(self):
+        """Every revoked key is found, whatever the filter's fill"""
+        revoked = revocation.RevocationList(capacity=100, error_rate=0.01)
+        keys = [f"access:{n}" for n in range(500)]
+        for key in keys:
+            revoked.revoke(key, ttl=60, at=10.0)
+        assert all(revoked.is_revoked(key, 5.0) for key in keys)
+        assert not any(revoked.is_revoked(key, 15.0) for key in keys)
+        assert revoked.capacity >= 500
+
+    def test_false_positives_are_confirmed(self):
+        """Keys the filter wrongly reports are cleared by the exact set"""
+        revoked = revocation.RevocationList(capacity=1, error_rate=0.5)
+        revoked.revoke("access:a", ttl=60)
+        assert not any(revoked.is_revoked(f"access:{n}", 0) for n in range(1000))
+
+    def test_entries_expire(self):
+        """Entries are pruned once the tokens they reject have expired"""
+        now = [100.0]
+        revoked = revocation.RevocationList(clock=lambda: now[0])
+        revoked.revoke("access:a", ttl=60)
+        assert revoked.is_revoked("access:a", 50.0)
+        now[0] = 200.0
+        assert not revoked.is_revoked("access:a", 50.0)
+        assert len(revoked) == 0
+
+    @pytest.mark.parametrize("capacity", [10, 1000])
+    def test_filter_sizing(self, capacity):
+        """The observed false positive rate stays near the configured rate"""
+        bloom = revocation.BloomFilter(capacity, 0.01)
+        for n in range(capacity):
+            bloom.add(f"in:{n}")
+        misses = sum(f"out:{n}" in bloom for n in range(10000))
+        assert misses / 10000 < 0.03